@@ -1,4 +1,5 @@
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
@@ -26,9 +27,19 @@ def country_flag_emoji(country_code):
     country_code = country_code.upper()
     return chr(ord(country_code[0]) + 127397) + chr(ord(country_code[1]) + 127397)
 
+class RecordJSONProvider(DefaultJSONProvider):
+    """JSON PROVIDER THAT ALSO SERIALISES SERVICE RECORDS (app/services/records.py)"""
+
+    @staticmethod
+    def default(o):
+        if hasattr(o, 'to_dict'):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
 def create_app():
     app = Flask(__name__, static_folder='static', static_url_path='/static')
     app.config.from_object(Config)
+    app.json = RecordJSONProvider(app)
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0  # DISABLE CACHING
     app.config['MIME_TYPES'] = {'css': 'text/css'}  # ENSURE CORRECT MIME TYPES
 
@@ -49,12 +60,59 @@ def create_app():
     app.jinja_env.globals['get_country_code'] = get_country_code
 
     # REGISTER BLUEPRINTS WITH PROPER URL PREFIXES
-    from app.routes import auth, dashboard, home, standings, drivers, errors
+    from app.routes import auth, dashboard, home, standings, drivers, errors, metrics as metrics_routes
     app.register_blueprint(home.bp)
     app.register_blueprint(auth.bp, url_prefix='/auth') 
     app.register_blueprint(dashboard.bp, url_prefix='/dashboard')
     app.register_blueprint(standings.bp, url_prefix='/standings')
     app.register_blueprint(drivers.bp, url_prefix='/drivers')
     app.register_blueprint(errors.bp)  # ERROR HANDLERS - NO PREFIX
+    app.register_blueprint(metrics_routes.bp)  # /metrics - NO PREFIX
+
+    # REGISTER CLI COMMANDS
+    from app.cli import f1_cli
+    app.cli.add_command(f1_cli)
+
+    # PER-ROUTE LATENCY HISTOGRAM (ONE OBSERVATION PER REQUEST)
+    if app.config.get('METRICS_ENABLED'):
+        import time
+        from flask import g, request
+        from app.services import metrics
+
+        request_latency = metrics.histogram('f1nsight_request_duration_seconds',
+                                            'Request latency by route, method and status',
+                                            ('route', 'method', 'status'))
+
+        @app.before_request
+        def _start_request_timer():
+            g.request_started = time.perf_counter()
+
+        @app.after_request
+        def _observe_request(response):
+            started = g.pop('request_started', None)
+            if started is not None:
+                request_latency.observe(time.perf_counter() - started, request.endpoint or 'unmatched',
+                                        request.method, str(response.status_code))
+            metrics.flush()
+            return response
+
+    # REQUEST TRACING (Server-Timing, PER-ROUTE UPSTREAM CALL COUNTS, SAMPLED TRACE LOG)
+    # REGISTERED AFTER METRICS SO ITS after_request RUNS BEFORE THE SNAPSHOT FLUSH
+    if app.config.get('TRACING_ENABLED'):
+        from app.services.tracing import init_request_tracing
+        init_request_tracing(app)
+
+    # LAST-KNOWN-GOOD FALLBACKS (STALE BANNER, Warning HEADER, NO BROWSER REUSE)
+    from app.services.fallback import init_fallback_reporting
+    init_fallback_reporting(app)
+
+    # START THE CACHE WARMER WITH THE FIRST REQUEST, SO ONLY SERVING WORKERS
+    # (NOT CLI COMMANDS) RUN ONE
+    if app.config.get('CACHE_WARMER_ENABLED'):
+        from app.services.warmer import start_cache_warmer
+
+        @app.before_request
+        def _start_cache_warmer():
+            start_cache_warmer(app)
 
     return app
\ No newline at end of file
@@ -0,0 +1,54 @@
+# CLI COMMANDS FOR F1NSIGHT
+# flask f1 sync     - BULK INGEST JOLPICA HISTORY INTO THE LOCAL WAREHOUSE
+# flask f1 refresh  - FETCH ONLY THE ROUNDS COMPLETED SINCE THE LAST SYNC
+
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+
+f1_cli = AppGroup('f1', help='F1 data warehouse commands.')
+
+
+@f1_cli.command('sync')
+@click.option('--season', type=int, multiple=True, help='Season(s) to sync. Repeatable.')
+@click.option('--from', 'start', type=int, default=1950, show_default=True, help='First season of a range sync.')
+@click.option('--to', 'end', type=int, default=None, help='Last season of a range sync (default: current year).')
+@click.option('--force', is_flag=True, help='Re-ingest seasons already marked complete.')
+def sync(season, start, end, force):
+    """Ingest seasons, races, circuits, drivers, constructors, results,
+    sprint results, qualifying and standings into the warehouse.
+    Completed seasons are skipped unless --force, so the command can be
+    re-run to resume an interrupted sync."""
+    from app.services import governor
+    from app.services.warehouse import sync_seasons
+
+    years = list(season) or list(range(start, (end or datetime.now().year) + 1))
+    # BULK LANE: WAITS FOR RATE TOKENS AS LONG AS NEEDED, LEAVING THE RESERVE TO USERS
+    with governor.lane(governor.SYNC):
+        outcome = sync_seasons(years, force=force, echo=click.echo)
+    failed = [year for year, status in outcome.items() if status.startswith('failed')]
+    if failed:
+        raise click.ClickException(f"{len(failed)} season(s) failed: {', '.join(map(str, failed))}")
+
+
+@f1_cli.command('refresh')
+@click.option('--season', type=int, default=None, help='Season to top up (default: current year).')
+def refresh(season):
+    """Fetch and merge only the rounds completed since the season was last
+    synced (results, sprint, qualifying and standings after each round).
+    Safe to run repeatedly, e.g. from cron over a race weekend."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app import db
+    from app.services import governor
+    from app.services.warehouse import SyncError, refresh_season
+
+    year = season or datetime.now().year
+    db.create_all(bind_key='warehouse')
+    try:
+        with governor.lane(governor.SYNC):
+            state = refresh_season(year)
+    except (SyncError, SQLAlchemyError) as e:
+        raise click.ClickException(f"{year}: failed: {e}")
+    click.echo(f"{year}: {'complete' if state.complete else f'round {state.last_round} of {state.total_rounds}'}")
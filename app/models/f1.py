@@ -0,0 +1,162 @@
+# F1 DATA WAREHOUSE MODELS FOR F1NSIGHT
+# LOCAL, INDEXED COPY OF THE JOLPICA (ERGAST) DATASET
+# LIVES IN ITS OWN SQLITE DATABASE (BIND KEY 'warehouse')
+
+from app import db
+
+
+class Season(db.Model):
+    # ONE ROW PER CHAMPIONSHIP SEASON
+    __bind_key__ = 'warehouse'
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    url = db.Column(db.String(255))
+
+
+class Circuit(db.Model):
+    __bind_key__ = 'warehouse'
+    circuit_id = db.Column(db.String(64), primary_key=True)
+    name = db.Column(db.String(128), nullable=False)
+    locality = db.Column(db.String(64))
+    country = db.Column(db.String(64))
+    url = db.Column(db.String(255))
+
+
+class Driver(db.Model):
+    __bind_key__ = 'warehouse'
+    driver_id = db.Column(db.String(64), primary_key=True)
+    given_name = db.Column(db.String(64), nullable=False)
+    family_name = db.Column(db.String(64), nullable=False)
+    code = db.Column(db.String(3))
+    permanent_number = db.Column(db.String(4))
+    nationality = db.Column(db.String(64))
+    date_of_birth = db.Column(db.String(10))
+    url = db.Column(db.String(255))
+
+    @property
+    def full_name(self):
+        return f"{self.given_name} {self.family_name}"
+
+
+class Constructor(db.Model):
+    __bind_key__ = 'warehouse'
+    constructor_id = db.Column(db.String(64), primary_key=True)
+    name = db.Column(db.String(128), nullable=False)
+    nationality = db.Column(db.String(64))
+    url = db.Column(db.String(255))
+
+
+class Race(db.Model):
+    # ONE ROW PER ROUND OF A SEASON
+    __bind_key__ = 'warehouse'
+    __table_args__ = (db.UniqueConstraint('season', 'round'),)
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.Integer, db.ForeignKey('season.year'), nullable=False, index=True)
+    round = db.Column(db.Integer, nullable=False)
+    race_name = db.Column(db.String(128), nullable=False)
+    circuit_id = db.Column(db.String(64), db.ForeignKey('circuit.circuit_id'), nullable=False)
+    date = db.Column(db.String(10))
+    time = db.Column(db.String(16))
+    url = db.Column(db.String(255))
+
+    circuit = db.relationship('Circuit', lazy='joined')
+
+
+class Result(db.Model):
+    # GRAND PRIX CLASSIFICATION
+    __bind_key__ = 'warehouse'
+    __table_args__ = (db.Index('ix_result_season_round', 'season', 'round'),)
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.Integer, nullable=False)
+    round = db.Column(db.Integer, nullable=False)
+    driver_id = db.Column(db.String(64), db.ForeignKey('driver.driver_id'), nullable=False, index=True)
+    constructor_id = db.Column(db.String(64), db.ForeignKey('constructor.constructor_id'), index=True)
+    number = db.Column(db.String(4))
+    position = db.Column(db.String(4))
+    position_text = db.Column(db.String(4))
+    points = db.Column(db.Float, default=0)
+    grid = db.Column(db.String(4))
+    laps = db.Column(db.String(4))
+    status = db.Column(db.String(64))
+    time = db.Column(db.String(32))
+    fastest_lap_rank = db.Column(db.String(4))
+    fastest_lap_time = db.Column(db.String(16))
+
+    driver = db.relationship('Driver', lazy='joined')
+    constructor = db.relationship('Constructor', lazy='joined')
+
+
+class SprintResult(db.Model):
+    __bind_key__ = 'warehouse'
+    __table_args__ = (db.Index('ix_sprint_result_season_round', 'season', 'round'),)
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.Integer, nullable=False)
+    round = db.Column(db.Integer, nullable=False)
+    driver_id = db.Column(db.String(64), db.ForeignKey('driver.driver_id'), nullable=False, index=True)
+    constructor_id = db.Column(db.String(64), db.ForeignKey('constructor.constructor_id'))
+    position = db.Column(db.String(4))
+    points = db.Column(db.Float, default=0)
+    grid = db.Column(db.String(4))
+    laps = db.Column(db.String(4))
+    status = db.Column(db.String(64))
+    time = db.Column(db.String(32))
+
+    driver = db.relationship('Driver', lazy='joined')
+
+
+class QualifyingResult(db.Model):
+    __bind_key__ = 'warehouse'
+    __table_args__ = (db.Index('ix_qualifying_season_round', 'season', 'round'),)
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.Integer, nullable=False)
+    round = db.Column(db.Integer, nullable=False)
+    driver_id = db.Column(db.String(64), db.ForeignKey('driver.driver_id'), nullable=False, index=True)
+    constructor_id = db.Column(db.String(64), db.ForeignKey('constructor.constructor_id'))
+    position = db.Column(db.String(4))
+    q1 = db.Column(db.String(16))
+    q2 = db.Column(db.String(16))
+    q3 = db.Column(db.String(16))
+
+
+class DriverStanding(db.Model):
+    # DRIVERS CHAMPIONSHIP AFTER A GIVEN ROUND
+    __bind_key__ = 'warehouse'
+    __table_args__ = (db.Index('ix_driver_standing_season_round', 'season', 'round'),)
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.Integer, nullable=False)
+    round = db.Column(db.Integer, nullable=False)
+    driver_id = db.Column(db.String(64), db.ForeignKey('driver.driver_id'), nullable=False)
+    constructor_id = db.Column(db.String(64), db.ForeignKey('constructor.constructor_id'))
+    position = db.Column(db.String(4))
+    position_text = db.Column(db.String(4))
+    points = db.Column(db.String(8))
+    wins = db.Column(db.String(4))
+
+    driver = db.relationship('Driver', lazy='joined')
+    constructor = db.relationship('Constructor', lazy='joined')
+
+
+class ConstructorStanding(db.Model):
+    # CONSTRUCTORS CHAMPIONSHIP AFTER A GIVEN ROUND
+    __bind_key__ = 'warehouse'
+    __table_args__ = (db.Index('ix_constructor_standing_season_round', 'season', 'round'),)
+    id = db.Column(db.Integer, primary_key=True)
+    season = db.Column(db.Integer, nullable=False)
+    round = db.Column(db.Integer, nullable=False)
+    constructor_id = db.Column(db.String(64), db.ForeignKey('constructor.constructor_id'), nullable=False)
+    position = db.Column(db.String(4))
+    position_text = db.Column(db.String(4))
+    points = db.Column(db.String(8))
+    wins = db.Column(db.String(4))
+
+    constructor = db.relationship('Constructor', lazy='joined')
+
+
+class SyncState(db.Model):
+    # HOW MUCH OF A SEASON HAS BEEN INGESTED
+    # complete = SEASON IS OVER AND FULLY LOADED, SAFE TO SERVE WITHOUT UPSTREAM
+    __bind_key__ = 'warehouse'
+    season = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    last_round = db.Column(db.Integer, default=0, nullable=False)
+    total_rounds = db.Column(db.Integer, default=0, nullable=False)
+    complete = db.Column(db.Boolean, default=False, nullable=False)
+    synced_at = db.Column(db.DateTime)
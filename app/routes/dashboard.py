@@ -1,11 +1,13 @@
 # DASHBOARD ROUTES FOR F1NSIGHT
 # HANDLES MAIN APPLICATION VIEWS AND FUNCTIONALITY
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, send_from_directory, jsonify, make_response
+from flask import Blueprint, render_template, redirect, url_for, flash, request, send_from_directory, jsonify, make_response, g
 from flask_login import login_required, current_user
 from app.services.driverChamp import driverStandings
 from app.services.constructorChamp import constructorStandings
 from app.services.news import get_news_service
+from app.services.fanout import fan_out, Dependency
+from app.services.conditional import conditional, season_validator
 news_service = get_news_service()
 from datetime import datetime
 import os
@@ -17,50 +19,51 @@ from app import db
 # CREATE BLUEPRINT FOR DASHBOARD ROUTES
 bp = Blueprint('dashboard', __name__, url_prefix='/dashboard')
 
+def _selected_year():
+    try:
+        return int(request.args.get('year', datetime.now().year))
+    except ValueError:
+        return datetime.now().year
+
 @bp.route('/')
 # ENSURE USER IS AUTHENTICATED TO ACCESS DASHBOARD
 @login_required 
+# 304 WHILE THE SEASON'S STANDINGS ARE UNCHANGED
+@conditional(lambda: season_validator(_selected_year()))
 def index():
-    from flask import make_response
-    
     # GET SELECTED YEAR
-    try:
-        selected_year = int(request.args.get('year', datetime.now().year))
-    except ValueError:
-        selected_year = datetime.now().year
-    
-    # GET SEASONS (cached)
-    available_seasons = driverStandings.get_available_seasons()
+    selected_year = _selected_year()
     
-    # GET STANDINGS (cached)
-    driver_standings = driverStandings.get_driver_standings(selected_year)
-    constructor_standings = constructorStandings.get_constructor_standings(selected_year)
+    # GET SEASONS AND STANDINGS CONCURRENTLY (cached)
+    data = fan_out({
+        'available_seasons': Dependency(driverStandings.get_available_seasons, default=[]),
+        'standings': Dependency(driverStandings.get_driver_standings, selected_year, default=[]),
+        'constructor_standings': Dependency(constructorStandings.get_constructor_standings, selected_year, default=[]),
+    })
+    driver_standings = data.standings
+    unavailable = set(data.failed)
     
-    # Get a random driver profile for the fun section
+    # Get a random driver profile for the fun section, seeded by the page's
+    # ETag so a revalidated (304) page shows the driver it was rendered with
     random_driver = None
     if driver_standings:
-        random_driver = random.choice(driver_standings)
+        random_driver = dict(random.Random(g.get('page_etag')).choice(driver_standings))
         if random_driver and 'driverId' in random_driver:
             from app.services.jolpica import get_driver_profile
-            detailed_profile = get_driver_profile(random_driver['driverId'], selected_year)
-            if detailed_profile:
-                random_driver.update(detailed_profile)
+            profile = fan_out({'random_driver': Dependency(get_driver_profile, random_driver['driverId'], selected_year)})
+            unavailable |= profile.failed
+            if profile.random_driver:
+                random_driver.update(profile.random_driver)
+    g.page_degraded = bool(unavailable)
     
-    response = make_response(render_template('dashboard/index.html',
-                                          standings=driver_standings,
-                                          constructor_standings=constructor_standings,
-                                          available_seasons=available_seasons,
-                                          selected_year=selected_year,
-                                          random_driver=random_driver,
-                                          current_user=current_user))
-    
-    # Set cache-control headers for proper back/forward navigation
-    response.headers['Cache-Control'] = 'private, no-cache, no-store, must-revalidate, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '-1'
-    response.headers['Vary'] = '*'
-    
-    return response
+    return render_template('dashboard/index.html',
+                          standings=driver_standings,
+                          constructor_standings=data.constructor_standings,
+                          available_seasons=data.available_seasons,
+                          selected_year=selected_year,
+                          random_driver=random_driver,
+                          unavailable=unavailable,
+                          current_user=current_user)
 
 @bp.route('/profile')
 @login_required
@@ -81,6 +84,7 @@ def compare():
 
 @bp.route('/compare/data')
 @login_required
+@conditional(lambda: season_validator(request.args.get('year', datetime.now().year)))
 def compare_data():
     driver1 = request.args.get('driver1')
     driver2 = request.args.get('driver2')
@@ -90,11 +94,7 @@ def compare_data():
         return jsonify({'error': 'at least one driver must be specified'}), 400
     
     try:
-        # Clear cached data to get fresh results
-        from app import cache
-        cache.delete_memoized(driverStandings.get_driver_points)
-        
-        # Get fresh driver points data
+        # Points series are cached per data version (latest completed round)
         driver1_result = driverStandings.get_driver_points(driver1, year)
         driver2_result = {'points': [], 'races': []}
         
@@ -174,6 +174,7 @@ def news():
 
 @bp.route('/races')
 @login_required
+@conditional(lambda: season_validator(request.args.get('year', datetime.now().year)))
 def races():
     # Get parameters from request
     from app.services.jolpica import get_available_years, get_races_by_season, get_race_results
@@ -181,20 +182,23 @@ def races():
     selected_year = request.args.get('year', datetime.now().year)
     selected_round = request.args.get('round', None)
     
-    # Get available seasons
-    available_seasons = get_available_years()
-    
-    # Get races for the selected season
-    races = get_races_by_season(selected_year)
+    # Get available seasons, the season's races and (if a race is selected)
+    # its detailed results concurrently
+    dependencies = {
+        'available_seasons': Dependency(get_available_years, default=[]),
+        'races': Dependency(get_races_by_season, selected_year, default=[]),
+    }
+    if selected_round:
+        dependencies['race_results'] = Dependency(get_race_results, selected_year, selected_round)
+    data = fan_out(dependencies)
+    available_seasons = data.available_seasons
+    races = data.races
     
-    # Get detailed results if a race is selected
-    race_results = None
+    race_results = data.get('race_results')
     prev_race = None
     next_race = None
     
     if selected_round:
-        race_results = get_race_results(selected_year, selected_round)
-        
         # Get previous and next race information
         try:
             # Convert selected_round to int for comparison
@@ -221,6 +225,7 @@ def races():
                     next_race = sorted_races[current_race_index + 1]
         except (ValueError, TypeError) as e:
             print(f"Error determining next/previous race: {e}")
+    g.page_degraded = bool(data.failed)
     
     return render_template('dashboard/races.html',
                           available_seasons=available_seasons,
@@ -229,7 +234,8 @@ def races():
                           selected_round=selected_round,
                           race_results=race_results,
                           prev_race=prev_race,
-                          next_race=next_race)
+                          next_race=next_race,
+                          unavailable=data.failed)
 
 @bp.route('/update_profile', methods=['POST'])
 @login_required
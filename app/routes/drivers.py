@@ -1,22 +1,40 @@
-from flask import Blueprint, render_template, request, jsonify
-from app.services.jolpica import search_drivers, get_driver_profile, get_available_years
+from flask import Blueprint, render_template, request, jsonify, g
+from app.services.jolpica import search_drivers, search_all_drivers, get_driver_profile, get_available_years
+from app.services.fanout import fan_out, Dependency
+from app.services.conditional import conditional, season_validator, static_validator
+from app.services.tiered_cache import memoize
 from datetime import datetime
 
 bp = Blueprint('drivers', __name__)
 
+def _search_validator():
+    year = request.args.get('year', str(datetime.now().year))
+    if year == 'all' or not year:
+        # ALL-HISTORY DRIVER LIST ONLY GROWS WHEN A NEW DRIVER DEBUTS
+        return static_validator(year)
+    return season_validator(year)
+
+def _season_validator(driver_id=None):
+    return season_validator(request.args.get('year', str(datetime.now().year)))
+
 @bp.route('/search')
+@conditional(_search_validator)
 def search():
     year = request.args.get('year', str(datetime.now().year))
     query = request.args.get('q', '')
+    limit = request.args.get('limit', type=int)
+    
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        # TYPEAHEAD - year=all SEARCHES EVERY DRIVER IN F1 HISTORY
+        if year == 'all':
+            return jsonify(search_all_drivers(query, limit or 20))
+        return jsonify(search_drivers(year, query, limit) if year else [])
     
     years = get_available_years()
     if not years:
         years = [str(datetime.now().year)]
     
-    drivers = search_drivers(year, query) if year else []
-    
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        return jsonify(drivers)
+    drivers = search_drivers(year, query, limit) if year and year != 'all' else []
     
     return render_template('drivers/search.html', 
                          drivers=drivers,
@@ -25,23 +43,37 @@ def search():
                          query=query)
 
 @bp.route('/drivers/<driver_id>')
+@conditional(_season_validator)
 def profile(driver_id):
     year = request.args.get('year', str(datetime.now().year))
-    profile = get_driver_profile(driver_id, year, load_career_stats=False)
+    
+    # Fetch the profile and this season's race results concurrently
+    from app.services.jolpica import get_driver_results
+    data = fan_out({
+        'profile': Dependency(get_driver_profile, driver_id, year, load_career_stats=False),
+        'race_results': Dependency(get_driver_results, driver_id, year, default=[]),
+    })
+    profile = data.profile
     
     if not profile:
+        if 'profile' in data.failed:
+            return render_template('errors/error.html',
+                                 code=503,
+                                 message="Service Unavailable",
+                                 details="Driver data is taking longer than usual to load. Please try again in a moment.",
+                                 back_allowed=True), 503
         return render_template('errors/404.html'), 404
-    
-    # Get race results for this driver in the specified season
-    from app.services.jolpica import get_driver_results
-    race_results = get_driver_results(driver_id, year)
+    g.page_degraded = bool(data.failed)
     
     return render_template('drivers/profile.html', 
                           profile=profile, 
-                          race_results=race_results,
+                          race_results=data.race_results,
+                          unavailable=data.failed,
                           year=year)
 
 @bp.route('/drivers/<driver_id>/stats')
+# CAREER TOTALS CHANGE WHEN A ROUND OF THE CURRENT SEASON COMPLETES
+@conditional(lambda driver_id: season_validator(datetime.now().year))
 def driver_stats(driver_id):
     """Get driver career statistics asynchronously"""
     from app.services.jolpica import _get_driver_career_stats
@@ -51,51 +83,47 @@ def driver_stats(driver_id):
         if stats:
             return jsonify({'success': True, 'stats': stats})
         else:
+            g.page_degraded = True
             return jsonify({'success': False, 'error': 'Stats not found'})
     except Exception as e:
+        g.page_degraded = True
         return jsonify({'success': False, 'error': str(e)})
 
-@bp.route('/drivers/<driver_id>/image')
-def driver_image(driver_id):
-    """Get optimized driver image from Wikipedia"""
+@memoize('driver_images', ttl=86400)  # 24 HOURS, SHARED BY ALL WORKERS
+def _wiki_image_url(wiki_url):
+    """Best Wikipedia image for an article, resized to a 320px thumbnail (None if there isn't one)"""
     import requests
-    from urllib.parse import unquote
     import re
-    from flask import jsonify
-    import time
-    from functools import lru_cache
-    
-    # Cache for image URLs
-    image_cache = {}
-    CACHE_DURATION = 86400  # 24 hours
-    
-    @lru_cache(maxsize=100)
-    def get_wiki_image_url(wiki_url):
-        try:
-            # Extract title from Wikipedia URL
-            title = unquote(wiki_url.split('/')[-1])
-            
-            # Use Wikipedia's RESTful API for better performance
-            api_url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{title}"
-            response = requests.get(api_url, timeout=3)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # Try to get the best image version
-                if 'originalimage' in data and 'source' in data['originalimage']:
-                    image_url = data['originalimage']['source']
-                    # Convert to thumbnail for faster loading
-                    image_url = re.sub(r'/\d+px-', '/320px-', image_url)
-                    return image_url
-                elif 'thumbnail' in data and 'source' in data['thumbnail']:
-                    image_url = data['thumbnail']['source']
-                    # Increase thumbnail size for better quality
-                    image_url = re.sub(r'/\d+px-', '/320px-', image_url)
-                    return image_url
-        except Exception as e:
-            print(f"Error fetching Wiki image: {e}")
-        return None
+    from urllib.parse import unquote
 
+    try:
+        # Extract title from Wikipedia URL
+        title = unquote(wiki_url.split('/')[-1])
+        
+        # Use Wikipedia's RESTful API for better performance
+        api_url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{title}"
+        response = requests.get(api_url, timeout=3)
+        
+        if response.status_code == 200:
+            data = response.json()
+            # Try to get the best image version
+            if 'originalimage' in data and 'source' in data['originalimage']:
+                image_url = data['originalimage']['source']
+                # Convert to thumbnail for faster loading
+                image_url = re.sub(r'/\d+px-', '/320px-', image_url)
+                return image_url
+            elif 'thumbnail' in data and 'source' in data['thumbnail']:
+                image_url = data['thumbnail']['source']
+                # Increase thumbnail size for better quality
+                image_url = re.sub(r'/\d+px-', '/320px-', image_url)
+                return image_url
+    except Exception as e:
+        print(f"Error fetching Wiki image: {e}")
+    return None
+
+@bp.route('/drivers/<driver_id>/image')
+def driver_image(driver_id):
+    """Get optimized driver image from Wikipedia"""
     try:
         # Get profile to access wiki URL
         profile = get_driver_profile(driver_id, None, load_career_stats=False)
@@ -106,23 +134,12 @@ def driver_image(driver_id):
         if not wiki_url:
             return jsonify({'success': False, 'error': 'No Wikipedia URL'})
 
-        # Check cache first
-        cache_key = f"image_{driver_id}"
-        cached = image_cache.get(cache_key)
-        if cached and time.time() - cached['timestamp'] < CACHE_DURATION:
-            return jsonify({'success': True, 'image_url': cached['url']})
-
-        # Fetch image URL with timeout
-        image_url = get_wiki_image_url(wiki_url)
+        # Fetch image URL (cached) with timeout
+        image_url = _wiki_image_url(wiki_url)
         if image_url:
-            # Cache the result
-            image_cache[cache_key] = {
-                'url': image_url,
-                'timestamp': time.time()
-            }
             return jsonify({'success': True, 'image_url': image_url})
 
         return jsonify({'success': False, 'error': 'Image not found'})
 
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        return jsonify({'success': False, 'error': str(e)})
\ No newline at end of file
@@ -0,0 +1,61 @@
+import hmac
+
+from flask import Blueprint, Response, abort, request
+from config import Config
+
+# CREATE BLUEPRINT FOR THE PROMETHEUS SCRAPE ENDPOINT
+bp = Blueprint('metrics', __name__)
+
+def _scrape_allowed() -> bool:
+    """A bearer token matching METRICS_TOKEN, or a client address in METRICS_ALLOWED_IPS"""
+    if Config.METRICS_TOKEN:
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(token.strip().encode(), Config.METRICS_TOKEN.encode()):
+            return True
+    return request.remote_addr in Config.METRICS_ALLOWED_IPS
+
+@bp.route('/metrics')
+def index():
+    if not Config.METRICS_ENABLED:
+        abort(404)
+    if not _scrape_allowed():
+        abort(403)
+
+    from app.services import metrics
+    from app.services.governor import get_rate_governor
+    from app.services.http_store import get_response_store
+    from app.services.tiered_cache import get_tiered_cache
+
+    # SHARED LAYERS ARE SIZED ONCE HERE, NOT SUMMED FROM EVERY WORKER'S SNAPSHOT
+    entries = metrics.Gauge('f1nsight_cache_entries', 'Entries held per cache layer', ('layer',))
+    size = metrics.Gauge('f1nsight_cache_bytes', 'Approximate bytes held per cache layer', ('layer',))
+    shared = [('response_store', get_response_store())]
+    if get_tiered_cache().l2 is not None:
+        shared.append(('l2', get_tiered_cache().l2))
+    for layer, store in shared:
+        try:
+            count, total = store.size()
+        except Exception as e:
+            print(f"Error sizing cache layer {layer}: {e}")
+            continue
+        entries.set(count, layer)
+        size.set(total, layer)
+
+    # SAME FOR EVERY WORKER, SO NOT SUMMED EITHER
+    quota = metrics.Gauge('f1nsight_newsapi_daily_quota', 'NewsAPI requests allowed per day')
+    quota.set(Config.NEWSAPI_DAILY_QUOTA)
+    extra = [entries, size, quota]
+
+    # THE RATE GOVERNOR'S BUCKETS ARE SHARED BY ALL WORKERS TOO
+    rate_governor = get_rate_governor()
+    if rate_governor is not None:
+        tokens = metrics.Gauge('f1nsight_upstream_rate_tokens', 'Jolpica rate tokens available per bucket', ('bucket',))
+        try:
+            for bucket, level in rate_governor.levels().items():
+                tokens.set(level, bucket)
+            extra.append(tokens)
+        except OSError as e:
+            print(f"Error reading rate governor state: {e}")
+
+    return Response(metrics.exposition(extra=extra),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
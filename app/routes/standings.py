@@ -1,22 +1,33 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, g, render_template, request
 from flask_login import login_required
+from ..services.conditional import conditional, season_validator
+from ..services.fanout import Dependency, fan_out
 from ..services.driverChamp import driverStandings
 from ..services.constructorChamp import constructorStandings as constructorStandings_service
 
 bp = Blueprint('standings', __name__)
 
+def _season_validator():
+    from datetime import datetime
+    return season_validator(request.args.get('year', str(datetime.now().year)))
+
 @bp.route('/')
 @login_required
+@conditional(_season_validator)
 def index():
     from datetime import datetime
     year = request.args.get('year', str(datetime.now().year))
     
-    standings = driverStandings.get_driver_standings(year)
-    constructor_standings = constructorStandings_service.get_constructor_standings(year)
-    available_seasons = driverStandings.get_available_seasons()
+    # A FAILING TABLE RENDERS EMPTY (WITH WHATEVER STALE-DATA BANNER THE OTHERS EARNED), NOT A 500
+    data = fan_out({
+        'standings': Dependency(driverStandings.get_driver_standings, year, default=[]),
+        'constructor_standings': Dependency(constructorStandings_service.get_constructor_standings, year, default=[]),
+        'available_seasons': Dependency(driverStandings.get_available_seasons, default=[]),
+    })
+    g.page_degraded = bool(data.failed)
     
     return render_template('dashboard/standings.html',
-                         standings=standings,
-                         constructor_standings=constructor_standings,
-                         available_seasons=available_seasons,
+                         standings=data.standings,
+                         constructor_standings=data.constructor_standings,
+                         available_seasons=data.available_seasons,
                          selected_year=year)
@@ -0,0 +1,209 @@
+"""
+# ASYNCIO FETCH ENGINE
+# ONE BACKGROUND EVENT LOOP THREAD OWNING ONE LONG-LIVED, POOLED
+# aiohttp SESSION. COROUTINES ARE SUBMITTED FROM ANY (FLASK) THREAD WITH
+# run(), FETCHES ARE BOUNDED BY A SEMAPHORE AND FOLLOW jolpica._make_request's
+# CACHE POLICY (SAME CACHES, STORE, SINGLE-FLIGHT KEYS AND CONDITIONAL GETS;
+# BLOCKING STORE, LOCK AND RATE-GOVERNOR CALLS RUN ON AN IO POOL, NOT THE LOOP), AND TAKE
+# THEIR RATE TOKENS, CIRCUIT BREAKERS, NEGATIVE CACHE AND LAST-KNOWN-GOOD
+# FALLBACK WITH THE SYNCHRONOUS CLIENT.
+"""
+import asyncio
+import atexit
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import aiohttp
+
+from app.services import fallback, governor, jolpica, tracing
+from app.services.breaker import CircuitOpen, get_circuit_breakers
+from app.services.singleflight import process_lock
+from app.services.upstream import UPSTREAM_LATENCY, endpoint_family
+from config import Config
+
+
+class AsyncFetchEngine:
+    """
+    SHARED ASYNC FETCHER FOR FAN-OUT WORKLOADS (E.G. ALL ROUNDS OF A SEASON)
+    """
+
+    def __init__(self, max_concurrency: int = 8, timeout: float = 10):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._loop = None
+        self._session = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._io_pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='async-fetch-io')
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='async-fetch', daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # CREATED INSIDE THE ENGINE LOOP, REUSED FOR THE LIFE OF THE PROCESS
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency,
+                                             limit_per_host=self.max_concurrency,
+                                             keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'Accept': 'application/json', 'User-Agent': 'f1nsight'}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _blocking(self, fn, *args):
+        # STORE READS/WRITES, L2 LOOKUPS AND FILE LOCKS RUN ON THE IO POOL, NEVER ON THE LOOP;
+        # WITH THE CALLER'S CONTEXT, SO TRACE COUNTS AND FALLBACK NOTES STILL LAND
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, context.run, fn, *args)
+
+    async def fetch_json(self, url: str) -> Optional[Dict]:
+        """
+        Fetch one URL under the same policy as jolpica._make_request: fresh or
+        stale-while-revalidate answers from the shared caches, one fetch per URL
+        (coalesced with synchronous callers), conditional revalidation and the
+        last-known-good fallback
+        """
+        answered, data = await self._blocking(jolpica._cached_response, url)
+        if answered:
+            return data
+        return await jolpica._inflight.do_async(url, self._fetch_shared, url)
+
+    async def _fetch_shared(self, url: str) -> Optional[Dict]:
+        """Async twin of jolpica._fetch_shared"""
+        lock = process_lock(url)
+        await self._blocking(lock.__enter__)
+        try:
+            answered, data, stored = await self._blocking(jolpica._recheck_store, url)
+            if answered:
+                return data
+            headers = await self._blocking(jolpica._revalidation_headers, stored)
+            try:
+                status, data, etag, last_modified = await self._get(url, headers)
+                if status == 304:
+                    if stored is None:
+                        raise ValueError('304 Not Modified without a stored copy')
+                    return await self._blocking(jolpica._not_modified, url, stored)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, governor.RateLimited, CircuitOpen) as e:
+                return await self._blocking(jolpica._fetch_failed, url, stored, e)
+            return await self._blocking(jolpica._fetched, url, data, etag, last_modified)
+        finally:
+            await self._blocking(lock.__exit__, None, None, None)
+
+    async def _get(self, url: str, headers: Dict[str, str]) -> Tuple[int, Optional[Dict], Optional[str], Optional[str]]:
+        """One upstream GET -> (status, body, ETag, Last-Modified); raises for error statuses"""
+        family = endpoint_family(url)
+        session = await self._get_session()
+        rate_governor = governor.get_rate_governor()
+        breakers = get_circuit_breakers()
+        breaker = breakers.for_family(family) if breakers is not None else None
+        outcome = None
+        start = time.perf_counter()
+        try:
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpen(f"circuit for {family} is open")
+            if rate_governor is not None:
+                await rate_governor.acquire_async(self._blocking)
+            async with self._semaphore:
+                start = time.perf_counter()
+                with tracing.span(f"GET {family}", 'upstream', url=url) as span:
+                    async with session.get(url, headers=headers) as response:
+                        outcome = str(response.status)
+                        if span is not None:
+                            span.attrs['status'] = response.status
+                        if response.status == 429 and rate_governor is not None:
+                            retry_after = response.headers.get('Retry-After', '')
+                            await self._blocking(rate_governor.pause,
+                                                 float(retry_after) if retry_after.isdigit() else 1.0)
+                        if breaker is not None:
+                            if response.status >= 500:
+                                breaker.failure()
+                            elif response.status != 429:
+                                breaker.success()
+                        response.raise_for_status()
+                        data = None if response.status == 304 else await response.json(content_type=None)
+                        result = (response.status, data, response.headers.get('ETag'),
+                                  response.headers.get('Last-Modified'))
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, governor.RateLimited, CircuitOpen) as e:
+            if not isinstance(e, aiohttp.ClientResponseError):
+                outcome = type(e).__name__  # ERROR STATUSES KEEP THEIR CODE
+            if breaker is not None and isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                breaker.failure()
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, family, outcome)
+            raise
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, family, outcome)
+        return result
+
+    async def stream_json(self, urls: Dict) -> AsyncIterator[Tuple[object, Optional[Dict]]]:
+        """Yield (key, payload) for a {key: url} mapping as each fetch completes"""
+        async def tagged(key, url):
+            return key, await self.fetch_json(url)
+
+        tasks = [asyncio.ensure_future(tagged(key, url)) for key, url in urls.items()]
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+
+    def close(self):
+        """Close the shared session (registered at interpreter exit)"""
+        if self._loop is None or self._session is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result(5)
+        except Exception:
+            pass
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the engine loop from synchronous code and wait for it"""
+        future = asyncio.run_coroutine_threadsafe(
+            _in_caller_context(coro, tracing.current(), tracing.current_span(), governor.current_lane(),
+                               fallback.current()),
+            self._ensure_loop())
+        return future.result(timeout)
+
+
+async def _in_caller_context(coro, trace, parent, lane, report):
+    # THE LOOP THREAD DOESN'T SHARE THE CALLER'S CONTEXT; THIS TASK (AND THE
+    # TASKS IT SPAWNS) CARRY THE CALLER'S TRACE, RATE LANE AND FALLBACK REPORT INSTEAD
+    tracing.bind(trace, parent)
+    fallback.bind(report)
+    with governor.lane(lane):
+        return await coro
+
+
+def round_result_urls(year, rounds: Iterable[int]) -> Dict[int, str]:
+    """{round: url} for the per-round results endpoint"""
+    return {int(r): f"{jolpica.API_BASE_URL}/{year}/{r}/results.json?limit={jolpica.ERGAST_PAGE_LIMIT}"
+            for r in rounds}
+
+
+def round_sprint_urls(year, rounds: Iterable[int]) -> Dict[int, str]:
+    """{round: url} for the per-round sprint results endpoint (no races for rounds without a sprint)"""
+    return {int(r): f"{jolpica.API_BASE_URL}/{year}/{r}/sprint.json?limit={jolpica.ERGAST_PAGE_LIMIT}"
+            for r in rounds}
+
+
+_async_engine = None
+_async_engine_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncFetchEngine:
+    """Return the process wide async fetch engine, creating it on first use"""
+    global _async_engine
+    if _async_engine is None:
+        with _async_engine_lock:
+            if _async_engine is None:
+                _async_engine = AsyncFetchEngine(max_concurrency=Config.ASYNC_FETCH_CONCURRENCY,
+                                                 timeout=Config.UPSTREAM_READ_TIMEOUT)
+                atexit.register(_async_engine.close)
+    return _async_engine
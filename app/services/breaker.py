@@ -0,0 +1,137 @@
+"""
+# CIRCUIT BREAKERS FOR JOLPICA ENDPOINT FAMILIES
+# ONE BREAKER PER ENDPOINT FAMILY (results, driverstandings, ...) IN EACH
+# WORKER. AFTER failure_threshold CONSECUTIVE FAILURES (CONNECTION ERRORS,
+# TIMEOUTS, 5XX) THE CIRCUIT OPENS: CALLS FAIL AT ONCE WITH CircuitOpen
+# INSTEAD OF WAITING ON TIMEOUTS AND BACKOFF. AFTER reset_timeout ONE PROBE
+# IS LET THROUGH (HALF OPEN); ITS SUCCESS CLOSES THE CIRCUIT, ITS FAILURE
+# OPENS IT AGAIN. 4XX AND 429 SAY NOTHING ABOUT UPSTREAM HEALTH AND ARE
+# NOT COUNTED (THE RATE GOVERNOR DEALS WITH 429).
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from app.services import metrics
+from config import Config
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+CIRCUIT_OPENED = metrics.counter(
+    'f1nsight_upstream_circuit_opened_total', 'Times an endpoint family\'s circuit opened', ('family',))
+CIRCUIT_REJECTED = metrics.counter(
+    'f1nsight_upstream_circuit_rejected_total', 'Upstream calls failed fast by an open circuit', ('family',))
+
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """UPSTREAM CALL REFUSED BECAUSE THE ENDPOINT FAMILY'S CIRCUIT IS OPEN"""
+
+
+class CircuitBreaker:
+    """
+    CONSECUTIVE-FAILURE BREAKER FOR ONE ENDPOINT FAMILY
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the probe when half open)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_started = 0.0
+            if self._state == HALF_OPEN:
+                # A PROBE THAT NEVER REPORTED BACK (E.G. REFUSED A RATE TOKEN) IS REPLACED
+                if self._probe_started and now - self._probe_started < self.reset_timeout:
+                    CIRCUIT_REJECTED.inc(self.name)
+                    return False
+                self._probe_started = now
+                return True
+            if self._state == OPEN:
+                CIRCUIT_REJECTED.inc(self.name)
+                return False
+            return True
+
+    def success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                if self._state == CLOSED:
+                    print(f"Upstream circuit for {self.name} opened after {self._failures} failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                CIRCUIT_OPENED.inc(self.name)
+
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+
+class CircuitBreakers:
+    """
+    THE BREAKERS OF ONE WORKER, CREATED PER ENDPOINT FAMILY ON FIRST USE
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def for_family(self, family: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = self._breakers[family] = CircuitBreaker(family, self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Endpoint family -> circuit state"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.state for breaker in breakers}
+
+
+_circuit_breakers = None
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> Optional[CircuitBreakers]:
+    """The process wide breakers, or None when UPSTREAM_BREAKER_ENABLED is off"""
+    global _circuit_breakers
+    if not Config.UPSTREAM_BREAKER_ENABLED:
+        return None
+    if _circuit_breakers is None:
+        with _circuit_breakers_lock:
+            if _circuit_breakers is None:
+                _circuit_breakers = CircuitBreakers(Config.UPSTREAM_BREAKER_THRESHOLD, Config.UPSTREAM_BREAKER_RESET)
+    return _circuit_breakers
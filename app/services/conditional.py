@@ -0,0 +1,157 @@
+"""
+# CONDITIONAL GET FOR PAGES AND JSON ENDPOINTS
+# A VIEW'S ETAG IS DERIVED FROM THE DATA IT SHOWS (SEASON + LATEST COMPLETED
+# ROUND), THE USER AND THE DEPLOYED CODE, SO IT CAN BE CHECKED BEFORE ANY
+# DATA IS LOADED. A MATCHING If-None-Match / If-Modified-Since GETS A 304
+# WITHOUT RENDERING; OTHERWISE THE RESPONSE IS SENT WITH ETag,
+# Last-Modified AND A private, max-age POLICY FOR THE ROUTE.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from flask import g, make_response, request, session
+from flask_login import current_user
+from werkzeug.http import is_resource_modified
+
+from app.services import fallback
+from config import Config
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CODE_SUFFIXES = ('.py', '.html', '.js', '.css')
+
+
+def _code_fingerprint() -> Tuple[str, datetime]:
+    """
+    Hash and newest mtime of the app's code, templates and assets. Identical
+    in every worker of a deploy; changes when any of them does, so pages
+    cached by browsers are not kept across a deploy.
+    """
+    digest = hashlib.sha1()
+    newest = 0.0
+    for root, dirs, files in os.walk(_APP_DIR):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for name in sorted(files):
+            if not name.endswith(_CODE_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(path, _APP_DIR)}:{stat.st_size}:{int(stat.st_mtime)}".encode())
+            newest = max(newest, stat.st_mtime)
+    return digest.hexdigest()[:12], datetime.fromtimestamp(int(newest), timezone.utc)
+
+
+_CODE_VERSION, _CODE_MODIFIED = _code_fingerprint()
+
+
+class Validator(NamedTuple):
+    """WHAT A RESPONSE DEPENDS ON, WHEN THAT LAST CHANGED, AND HOW LONG BROWSERS MAY REUSE IT"""
+    parts: tuple
+    last_modified: Optional[datetime]
+    max_age: int
+
+
+def _race_start(race) -> Optional[datetime]:
+    try:
+        start = datetime.fromisoformat(f"{race['date']}T{(race.get('time') or '00:00:00Z').rstrip('Z')}")
+    except (KeyError, ValueError, TypeError):
+        return None
+    return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+
+
+def season_validator(year, *parts) -> Validator:
+    """
+    Validator for a view of one season's data. The version is the latest
+    completed round; Last-Modified is that race's start (or the deploy, if
+    later). Past seasons get the long max-age, the current one the short.
+    """
+    from app.services.jolpica import get_latest_completed_round, get_races_by_season
+
+    year = str(year)
+    version = get_latest_completed_round(year)
+    modified = _CODE_MODIFIED
+    if version:
+        for race in get_races_by_season(year):
+            if str(race['round']) == str(version):
+                start = _race_start(race)
+                if start is not None:
+                    modified = max(modified, start)
+                break
+    try:
+        past = int(year) < datetime.now().year
+    except ValueError:
+        past = False
+    max_age = Config.CONDITIONAL_MAX_AGE_PAST if past else Config.CONDITIONAL_MAX_AGE_CURRENT
+    return Validator((year, version) + parts, modified, max_age)
+
+
+def static_validator(*parts) -> Validator:
+    """Validator for data that only changes with a deploy (or rarely, e.g. all-history lists)"""
+    return Validator(parts, _CODE_MODIFIED, Config.CONDITIONAL_MAX_AGE_PAST)
+
+
+def _user_key() -> str:
+    # LOGGED-IN PAGES DIFFER PER USER (NAV BAR, PROFILE LINKS)
+    try:
+        if current_user.is_authenticated:
+            return str(current_user.get_id())
+    except Exception:
+        pass
+    return 'anon'
+
+
+def make_etag(validator: Validator) -> str:
+    key = repr((request.endpoint, request.full_path, _user_key(), _CODE_VERSION, validator.parts))
+    return hashlib.sha1(key.encode()).hexdigest()[:24]
+
+
+def conditional(get_validator: Callable[..., Validator]):
+    """
+    Decorator for GET views. get_validator receives the view's arguments
+    and returns a Validator without loading the page's data. Unchanged
+    responses are answered with 304 before the view runs; fresh 200s get
+    ETag, Last-Modified and Cache-Control: private, max-age. The ETag is
+    available to the view as g.page_etag (e.g. to seed anything random so
+    a revalidated page matches what was rendered). A view that rendered
+    with placeholders sets g.page_degraded so the response isn't reused;
+    neither is one built from last-known-good upstream data (fallback.py).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # PENDING FLASH MESSAGES ARE PART OF THE PAGE, SO RENDER IT FRESH
+            if not Config.CONDITIONAL_GET_ENABLED or request.method != 'GET' or session.get('_flashes'):
+                return view(*args, **kwargs)
+            try:
+                validator = get_validator(*args, **kwargs)
+                etag = make_etag(validator)
+            except Exception as e:
+                print(f"Conditional GET validator failed for {request.endpoint}: {e}")
+                return view(*args, **kwargs)
+
+            cache_control = f"private, max-age={validator.max_age}"
+            if not is_resource_modified(request.environ, etag=etag, last_modified=validator.last_modified):
+                response = make_response('', 304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = cache_control
+                response.headers['Vary'] = 'Cookie'
+                return response
+
+            g.page_etag = etag
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or g.get('page_degraded') or fallback.degraded():
+                response.headers['Cache-Control'] = 'private, no-cache'
+                return response
+            response.set_etag(etag)
+            if validator.last_modified is not None:
+                response.last_modified = validator.last_modified
+            response.headers['Cache-Control'] = cache_control
+            response.vary.add('Cookie')
+            return response
+        return wrapper
+    return decorator
@@ -1,11 +1,13 @@
-import requests
 from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+from app.services import fallback
+from app.services.jolpica import API_BASE_URL, _make_paginated_request
 
 class constructorStandings:
     """
     SERVICE FOR FETCHING F1 CONSTRUCTOR DATA FROM JOLPICA-F1 API
     """
-    BASE_URL = "https://api.jolpi.ca/ergast/f1"
+    BASE_URL = API_BASE_URL
     
     # Mapping of constructor names from API to folder names
     CONSTRUCTOR_MAPPING = {
@@ -84,63 +86,76 @@ class constructorStandings:
     def get_constructor_standings(year=None):
         if not year:
             year = datetime.now().year
-        url = f"{constructorStandings.BASE_URL}/{year}/constructorStandings/"
-        
+
+        # COMPLETED SEASONS COME FROM THE LOCAL WAREHOUSE
+        # (A WAREHOUSE ERROR FALLS THROUGH TO UPSTREAM AND ITS LAST GOOD COPY)
+        from app.services import warehouse
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            if not all(key in data for key in ['MRData']):
-                print(f"Invalid data structure for year {year}")
-                return []
-                
-            standings_table = data['MRData'].get('StandingsTable', {})
-            lists = standings_table.get('StandingsLists', [])
-            
-            if not lists:
-                print(f"No constructor standings found for year {year}")
-                return []
-                
-            constructors = lists[0].get('ConstructorStandings', [])
-            
-            formatted_standings = []
-            for c in constructors:
-                try:
-                    # Check if we have at least the Constructor and basic stats
-                    if 'Constructor' not in c or not any(key in c for key in ['position', 'positionText']):
-                        continue
-                        
-                    constructor_name = c['Constructor'].get('name', 'Unknown')
-                    normalized_name = constructorStandings.normalize_constructor_name(constructor_name)
-                    
-                    # Handle position: prefer numeric position, fall back to positionText
-                    position = c.get('position')
-                    if not position:
-                        position_text = c.get('positionText', 'N/A')
-                        # Convert positionText to number if possible, otherwise keep as is
-                        position = position_text if position_text == '-' else position_text
-                    
-                    formatted_standings.append({
-                        'position': position,
-                        'points': c.get('points', '0'),
-                        'constructor': normalized_name,
-                        'wins': c.get('wins', '0')
-                    })
-                except Exception as e:
-                    print(f"Error processing constructor entry: {e}")
-                    continue
-                    
-            # Sort standings by points if positions are not numeric
-            if any(s['position'] == '-' for s in formatted_standings):
-                formatted_standings.sort(key=lambda x: float(x['points']), reverse=True)
-                # Update positions after sorting
-                for idx, standing in enumerate(formatted_standings, 1):
-                    if standing['position'] == '-':
-                        standing['position'] = str(idx)
-            
-            return formatted_standings
-            
-        except Exception as e:
-            print(f"Error fetching constructor standings: {e}")
+            if warehouse.is_available(year):
+                return [{
+                    'position': s.position or s.position_text or 'N/A',
+                    'points': s.points or '0',
+                    'constructor': constructorStandings.normalize_constructor_name(s.constructor.name),
+                    'wins': s.wins or '0'
+                } for s in warehouse.final_constructor_standings(year)]
+        except SQLAlchemyError as e:
+            print(f"Warehouse constructor standings for {year} unavailable, asking upstream: {e}")
+
+        # UPSTREAM FAILURES ARE ANSWERED WITH THE LAST GOOD STANDINGS BY _make_request;
+        # NONE MEANS THERE NEVER WERE ANY
+        url = f"{constructorStandings.BASE_URL}/{year}/constructorStandings/"
+        data = _make_paginated_request(url, 'StandingsTable', 'StandingsLists', 'ConstructorStandings')
+
+        if not data or not all(key in data for key in ['MRData']):
+            print(f"No constructor standings available for {year}")
+            fallback.note_missing(url)
+            return []
+
+        standings_table = data['MRData'].get('StandingsTable', {})
+        lists = standings_table.get('StandingsLists', [])
+
+        if not lists:
+            print(f"No constructor standings found for year {year}")
             return []
+
+        constructors = lists[0].get('ConstructorStandings', [])
+
+        formatted_standings = []
+        for c in constructors:
+            # Check if we have at least the Constructor and basic stats
+            if 'Constructor' not in c or not any(key in c for key in ['position', 'positionText']):
+                continue
+
+            try:
+                constructor_name = c['Constructor'].get('name', 'Unknown')
+                normalized_name = constructorStandings.normalize_constructor_name(constructor_name)
+            except (AttributeError, TypeError) as e:
+                print(f"Skipping malformed constructor standing for {year}: {e}")
+                continue
+
+            # Handle position: prefer numeric position, fall back to positionText
+            position = c.get('position')
+            if not position:
+                position = c.get('positionText', 'N/A')
+
+            formatted_standings.append({
+                'position': position,
+                'points': c.get('points', '0'),
+                'constructor': normalized_name,
+                'wins': c.get('wins', '0')
+            })
+
+        # Sort standings by points if positions are not numeric
+        if any(s['position'] == '-' for s in formatted_standings):
+            def points(standing):
+                try:
+                    return float(standing['points'])
+                except (ValueError, TypeError):
+                    return 0.0
+            formatted_standings.sort(key=points, reverse=True)
+            # Update positions after sorting
+            for idx, standing in enumerate(formatted_standings, 1):
+                if standing['position'] == '-':
+                    standing['position'] = str(idx)
+
+        return formatted_standings
@@ -1,44 +1,17 @@
-import requests
 from datetime import datetime
 import asyncio
-import aiohttp
-from functools import lru_cache
+from sqlalchemy.exc import SQLAlchemyError
 from app import cache
-from app.services.jolpica import get_races_by_season
+from app.services import fallback
+from app.services.jolpica import API_BASE_URL, get_races_by_season, get_latest_completed_round, _make_paginated_request
+from app.services.points_matrix import build_season_points_matrix
+from app.services.async_fetch import get_async_engine, round_result_urls, round_sprint_urls
 
 class driverStandings:
     """
     # SERVICE FOR FETCHING F1 DATA FROM JOLPICA-F1 API
     """
-    BASE_URL = "https://api.jolpi.ca/ergast/f1"
-
-    # 2025 F1 RACE CALENDAR - Used as fallback if API fails
-    RACE_CALENDAR_2025 = {
-        1: "Bahrain",
-        2: "Saudi Arabia",
-        3: "Australia", 
-        4: "Japan",
-        5: "China",
-        6: "Miami",
-        7: "Imola",
-        8: "Monaco",
-        9: "Spain",
-        10: "Canada",
-        11: "Austria",
-        12: "Great Britain",
-        13: "Hungary",
-        14: "Belgium",
-        15: "Netherlands",
-        16: "Italy",
-        17: "Azerbaijan",
-        18: "Singapore",
-        19: "USA",  # Austin
-        20: "Mexico",
-        21: "Brazil",
-        22: "Las Vegas",
-        23: "Qatar",
-        24: "Abu Dhabi"
-    }
+    BASE_URL = API_BASE_URL
 
     @staticmethod
     @cache.memoize(timeout=300)  # Cache for 5 minutes
@@ -53,65 +26,79 @@ class driverStandings:
         except (ValueError, TypeError):
             year = datetime.now().year
 
-        url = f"{driverStandings.BASE_URL}/{year}/driverstandings/"
+        # COMPLETED SEASONS COME FROM THE LOCAL WAREHOUSE
+        # (A WAREHOUSE ERROR FALLS THROUGH TO UPSTREAM AND ITS LAST GOOD COPY)
+        from app.services import warehouse
         try:
-            response = requests.get(url, timeout=5)  # Add timeout
-            response.raise_for_status()
-            data = response.json()
-            
-            # DATA STRUCTURE VALIDATIE
-            if not all(key in data for key in ['MRData']):
-                return []
-                
-            standings_table = data['MRData'].get('StandingsTable', {})
-            lists = standings_table.get('StandingsLists', [])
-            
-            if not lists:
-                return []
-                
-            drivers = lists[0].get('DriverStandings', [])
-            
-            formatted_standings = []
-            for d in drivers:
-                try:
-                    # VALIDATE
-                    if not all(key in d for key in ['position', 'points', 'Driver', 'Constructors']):
-                        continue
-                        
-                    driver = d['Driver']
-                    constructor = d['Constructors'][0] if d['Constructors'] else {'name': 'Unknown'}
-                    
-                    formatted_standings.append({
-                        'position': d.get('position', 'N/A'),
-                        'points': d.get('points', '0'),
-                        'driver': f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip(),
-                        'constructor': constructor.get('name', 'Unknown'),
-                        'driverId': driver.get('driverId', '')
-                    })
-                except Exception:
-                    continue
-            
-            return formatted_standings
-            
-        except requests.exceptions.RequestException:
+            if warehouse.is_available(year):
+                return [{
+                    'position': s.position or 'N/A',
+                    'points': s.points or '0',
+                    'driver': s.driver.full_name,
+                    'constructor': s.constructor.name if s.constructor else 'Unknown',
+                    'driverId': s.driver_id
+                } for s in warehouse.final_driver_standings(year)]
+        except SQLAlchemyError as e:
+            print(f"Warehouse driver standings for {year} unavailable, asking upstream: {e}")
+
+        # UPSTREAM FAILURES ARE ANSWERED WITH THE LAST GOOD STANDINGS BY _make_request;
+        # NONE MEANS THERE NEVER WERE ANY
+        url = f"{driverStandings.BASE_URL}/{year}/driverstandings/"
+        data = _make_paginated_request(url, 'StandingsTable', 'StandingsLists', 'DriverStandings')
+
+        # DATA STRUCTURE VALIDATIE
+        if not data or not all(key in data for key in ['MRData']):
+            print(f"No driver standings available for {year}")
+            fallback.note_missing(url)
             return []
-        except Exception:
+
+        standings_table = data['MRData'].get('StandingsTable', {})
+        lists = standings_table.get('StandingsLists', [])
+
+        if not lists:
             return []
 
+        drivers = lists[0].get('DriverStandings', [])
+
+        formatted_standings = []
+        for d in drivers:
+            # VALIDATE
+            if not all(key in d for key in ['position', 'points', 'Driver', 'Constructors']):
+                continue
+
+            try:
+                driver = d['Driver']
+                constructor = d['Constructors'][0] if d['Constructors'] else {'name': 'Unknown'}
+
+                formatted_standings.append({
+                    'position': d.get('position', 'N/A'),
+                    'points': d.get('points', '0'),
+                    'driver': f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip(),
+                    'constructor': constructor.get('name', 'Unknown'),
+                    'driverId': driver.get('driverId', '')
+                })
+            except (AttributeError, KeyError, TypeError) as e:
+                print(f"Skipping malformed driver standing for {year}: {e}")
+
+        return formatted_standings
+
     @staticmethod
     @cache.memoize(timeout=3600)  # Cache for 1 hour
     def get_available_seasons():
         """
         # FETCH ALL AVAILABLE SEASONS FOR DROPDOWN
         """
+        url = f"{driverStandings.BASE_URL}/seasons/"
+        data = _make_paginated_request(url, 'SeasonTable', 'Seasons')
+        if not data:
+            print("No season list available")
+            fallback.note_missing(url)
+            return []
         try:
-            url = f"{driverStandings.BASE_URL}/seasons/?limit=100"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
             seasons = data['MRData']['SeasonTable']['Seasons']
             return sorted([int(season['season']) for season in seasons], reverse=True)
-        except Exception:
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"Malformed season list: {e}")
             return []
 
     @staticmethod
@@ -125,13 +112,16 @@ class driverStandings:
         except (ValueError, TypeError):
             year = datetime.now().year
 
+        from app.services import warehouse
+        if warehouse.is_available(year):
+            return [driver.full_name for driver in warehouse.season_drivers(year)]
+
         url = f"{driverStandings.BASE_URL}/{year}/drivers"
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()
+            data = _make_paginated_request(url, 'DriverTable', 'Drivers')
             
-            if 'MRData' not in data or 'DriverTable' not in data['MRData']:
+            if not data or 'MRData' not in data or 'DriverTable' not in data['MRData']:
+                fallback.note_missing(url)
                 return []
                 
             drivers = data['MRData']['DriverTable']['Drivers']
@@ -153,129 +143,61 @@ class driverStandings:
             year = datetime.now().year
             
         # Use the jolpica service to get race information
-        races = get_races_by_season(str(year))
-        if not races:
-            # Fall back to our static calendar if API fails
-            return [{"round": str(r), "raceName": n} for r, n in driverStandings.RACE_CALENDAR_2025.items()]
-            
-        return races
+        # (LAST GOOD CALENDAR IF THE API IS DOWN, EMPTY IF THERE NEVER WAS ONE)
+        return get_races_by_season(str(year))
+
+    @staticmethod
+    def get_points_matrix(year=None):
+        """
+        # DRIVERS x ROUNDS POINTS MATRIX FOR A SEASON
+        # BUILT FROM ONE PAGINATED SEASON-WIDE RESULTS + SPRINT FETCH
+        """
+        try:
+            year = int(year) if year is not None else datetime.now().year
+        except (ValueError, TypeError):
+            year = datetime.now().year
+
+        return driverStandings._get_points_matrix(year, get_latest_completed_round(year))
+
+    @staticmethod
+    @cache.memoize(timeout=86400)  # Keyed on data version, so only replaced when a new round lands
+    def _get_points_matrix(year, data_version):
+        return build_season_points_matrix(year)
 
     @staticmethod
-    @cache.memoize(timeout=300)  # Cache for 5 minutes
     def get_driver_points(driver_name, year=None):
         """
         # GET POINTS PROGRESSION FOR A DRIVER THROUGHOUT THE SEASON
+        # CACHED PER DATA VERSION (LATEST COMPLETED ROUND OF THE SEASON)
         """
         try:
             year = int(year) if year is not None else datetime.now().year
         except (ValueError, TypeError):
             year = datetime.now().year
 
-        # First get all races for the season to ensure we have proper order
-        all_races = driverStandings.get_races_for_year(year)
-        
-        # Sort races by round number
-        all_races.sort(key=lambda r: int(r['round']))
-            
-        # Directly fetch individual race results to ensure we get complete data
-        points = []
-        race_names = []
-        cumulative_points = 0
-        
-        # Clear cache to ensure fresh data
-        cache.delete_memoized(driverStandings.get_driver_points)
-        
-        # Process each race individually to avoid data inconsistencies
-        for race in all_races:
-            race_round = race['round']
-            
-            # Skip future races (if race date is in the future)
-            race_date = race.get('date')
-            if race_date:
-                try:
-                    race_datetime = datetime.fromisoformat(race_date)
-                    if race_datetime > datetime.now():
-                        continue
-                except (ValueError, TypeError):
-                    pass  # If date parsing fails, include the race
-            
-            # Fetch this specific race result
-            race_url = f"{driverStandings.BASE_URL}/{year}/{race_round}/results.json"
-            try:
-                race_response = requests.get(race_url, timeout=5)
-                race_response.raise_for_status()
-                race_data = race_response.json()
-                
-                if 'MRData' in race_data and 'RaceTable' in race_data['MRData']:
-                    race_results = race_data['MRData']['RaceTable'].get('Races', [])
-                    
-                    points_earned = 0
-                    if race_results:
-                        # Look for the driver in this race's results
-                        for result in race_results[0].get('Results', []):
-                            driver = result['Driver']
-                            full_name = f"{driver['givenName']} {driver['familyName']}"
-                            if full_name.strip() == driver_name.strip():
-                                try:
-                                    points_earned = float(result.get('points', 0))
-                                    print(f"Found {driver_name} in race {race_round} with {points_earned} points")
-                                except (ValueError, TypeError):
-                                    points_earned = 0
-                                break
-                    
-                    # Add points to cumulative total
-                    cumulative_points += points_earned
-                    points.append(cumulative_points)
-                    
-                    # Add race name (use circuit locality or race name for shorter display)
-                    race_display_name = race.get('locality', race.get('raceName', f"Race {race_round}"))
-                    race_names.append(race_display_name)
-                    
-                    print(f"Race {race_round} ({race_display_name}): {points_earned} points, cumulative: {cumulative_points}")
-                
-            except Exception as e:
-                print(f"Error fetching results for race {race_round}: {e}")
-                # Still add the race but with 0 points for this driver
-                race_display_name = race.get('locality', race.get('raceName', f"Race {race_round}"))
-                race_names.append(race_display_name)
-                points.append(cumulative_points)  # Keep previous total
-        
-        print(f"Final data for {driver_name}: {len(race_names)} races, {len(points)} points entries")
-        print(f"Races: {race_names}")
-        print(f"Points: {points}")
-        
-        return {
-            'points': points,
-            'races': race_names
-        }
+        points = driverStandings._get_driver_points(driver_name, year, get_latest_completed_round(year))
+        return points or {'points': [], 'races': []}
 
     @staticmethod
-    async def _fetch_race_result(session, year, round_num):
-        """Helper method to fetch a single race result asynchronously"""
-        url = f"{driverStandings.BASE_URL}/{year}/{round_num}/results"
-        cache_key = f"race_{year}_{round_num}"
-        
-        # CHECK CACHE
-        if cache_key in driverStandings._cache:
-            return driverStandings._cache[cache_key]
+    @cache.memoize(timeout=86400)  # Keyed on data version, so only replaced when a new round lands
+    def _get_driver_points(driver_name, year, data_version):
+        # Slice the driver's row out of the season matrix
+        matrix = driverStandings._get_points_matrix(year, data_version)
+        if matrix is None:
+            # SEASON-WIDE ENDPOINTS FAILED - FALL BACK TO CONCURRENT PER-ROUND FETCHES
+            print(f"No season results for {year}, falling back to per-round fetch")
+            points = driverStandings.get_driver_points_concurrent(driver_name, year)
+            return points if points['points'] else None  # EMPTY IS NOT MEMOIZED, RETRIED NEXT CALL
 
-        try:
-            async with session.get(url) as response:
-                data = await response.json()
-                if 'MRData' in data and 'RaceTable' in data['MRData']:
-                    race = data['MRData']['RaceTable'].get('Races', [])
-                    if race:
-                        # CACHE RESULT
-                        driverStandings._cache[cache_key] = race[0]
-                        return race[0]
-        except Exception as e:
-            print(f"Error fetching round {round_num}: {e}")
-        return None
+        return matrix.progression(driver_name)
 
     @staticmethod
     async def get_driver_points_async(driver_name, year=None):
         """
         # Asynchronous version of get_driver_points
+        # ROUNDS COME FROM THE SEASON CALENDAR, ALL COMPLETED ROUNDS' RESULTS AND
+        # SPRINTS ARE FETCHED CONCURRENTLY ON THE SHARED ASYNC ENGINE AND FOLDED
+        # IN AS THEY ARRIVE (SAME POINTS AS THE SEASON MATRIX)
         # Returns a dictionary with points array and race names
         """
         try:
@@ -283,62 +205,57 @@ class driverStandings:
         except (ValueError, TypeError):
             year = datetime.now().year
 
-        # FETCH RACE RESULTS
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for round_num in range(1, 10):  # 9 SO FAR.. NEED TO EDIT
-                task = driverStandings._fetch_race_result(session, year, round_num)
-                tasks.append(task)
-            
-            races = []
-            results = await asyncio.gather(*tasks)
-            for result in results:
-                if result:
-                    races.append(result)
+        # CALENDAR LOOKUP IS BLOCKING (AND CACHED) - KEEP IT OFF THE EVENT LOOP
+        loop = asyncio.get_running_loop()
+        calendar = await loop.run_in_executor(None, get_races_by_season, str(year))
+
+        now = datetime.now()
+        rounds = {}
+        for race in calendar:
+            try:
+                if datetime.fromisoformat(race['date']) > now:
+                    continue  # Skip future races
+            except (ValueError, TypeError, KeyError):
+                pass  # If date parsing fails, include the race
+            rounds[int(race['round'])] = race.get('locality', race.get('raceName', f"Race {race['round']}"))
 
-        if not races:
+        if not rounds:
             print("No race data found")
             return {'points': [], 'races': []}
 
-        points_by_race = []
-        race_names = []
-        running_total = 0
-        
-        # KNOWN RACES
-        expected_races = [
-            "Australia",
-            "China",
-            "Japan",  
-            "Bahrain",  
-            "Saudi Arabia",  
-            "Miami", 
-            "Imola",
-            "Monaco",
-            "Spain"
-        ]
-        
-        for race in races:
-            circuit_name = expected_races[len(race_names)]
-            race_names.append(circuit_name)
-            
+        urls = {(round_num, 'Results'): url for round_num, url in round_result_urls(year, rounds).items()}
+        urls.update({(round_num, 'SprintResults'): url for round_num, url in round_sprint_urls(year, rounds).items()})
+
+        points_by_round = {}
+        engine = get_async_engine()
+        async for (round_num, child_key), data in engine.stream_json(urls):
             points_earned = 0
-            results = race.get('Results', [])
-            
-            for result in results:
+            races = data['MRData'].get('RaceTable', {}).get('Races', []) if data and 'MRData' in data else []
+            for result in races[0].get(child_key, []) if races else []:
                 driver = result.get('Driver', {})
                 full_name = f"{driver.get('givenName', '')} {driver.get('familyName', '')}"
-                if full_name.strip() == driver_name.strip():
+                if full_name.strip() == driver_name.strip() or driver.get('driverId') == driver_name:
                     try:
                         points_earned = float(result.get('points', 0))
                     except (ValueError, TypeError):
                         points_earned = 0
                     break
-            
-            running_total += points_earned
-            points_by_race.append(running_total)
-        
+            points_by_round[round_num] = points_by_round.get(round_num, 0) + points_earned
+
+        points = []
+        running_total = 0
+        for round_num in sorted(rounds):
+            running_total += points_by_round.get(round_num, 0)
+            points.append(running_total)
+
         return {
-            'points': points_by_race,
-            'races': race_names
+            'points': points,
+            'races': [rounds[round_num] for round_num in sorted(rounds)]
         }
 
+    @staticmethod
+    def get_driver_points_concurrent(driver_name, year=None, timeout=30):
+        """
+        # SYNC ENTRY POINT FOR FLASK VIEWS - RUNS get_driver_points_async ON THE ENGINE LOOP
+        """
+        return get_async_engine().run(driverStandings.get_driver_points_async(driver_name, year), timeout)
@@ -0,0 +1,197 @@
+"""
+# DRIVER NAME SEARCH INDEX
+# PER-SEASON ROSTERS AND AN ALL-HISTORY DRIVER LIST, EACH LOADED ONCE AND
+# INDEXED BY NAME-TOKEN PREFIX AND CHARACTER TRIGRAM. NAMES ARE FOLDED
+# (ACCENTS STRIPPED, CASE FOLDED) SO "hulkenberg" FINDS "Hülkenberg".
+# A TYPEAHEAD QUERY IS A FEW DICT LOOKUPS, NO UPSTREAM OR CACHE TRAFFIC.
+"""
+import time
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import current_app, has_app_context
+
+from app.services.singleflight import SingleFlight
+
+# LETTERS UNICODE DOESN'T DECOMPOSE INTO BASE + ACCENT
+_FOLD_EXTRA = str.maketrans({'ø': 'o', 'đ': 'd', 'ł': 'l', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ı': 'i', 'þ': 'th'})
+
+# MINIMUM TRIGRAM OVERLAP FOR A FUZZY (MISSPELT) MATCH
+_FUZZY_THRESHOLD = 0.4
+
+# CURRENT-SEASON ROSTERS CARRY STANDINGS, SO THEY ARE REBUILT THIS OFTEN
+_SEASON_TTL = 300
+_HISTORY_TTL = 86400
+
+
+def fold(text: str) -> str:
+    """Accent- and case-insensitive form of a name"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.translate(_FOLD_EXTRA).replace('-', ' ').split())
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class DriverIndex:
+    """
+    IMMUTABLE ONCE BUILT: ENTRIES (IN THEIR ORIGINAL ORDER) PLUS PREFIX AND
+    TRIGRAM POSTINGS OVER THE FOLDED NAMES
+    """
+    __slots__ = ('entries', 'built_at', '_names', '_prefixes', '_grams', '_gram_counts')
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self.built_at = time.time()
+        self._names = [fold(entry.get('name', '')) for entry in entries]
+        self._prefixes = {}
+        self._grams = {}
+        self._gram_counts = []
+        for i, name in enumerate(self._names):
+            for token in name.split():
+                for end in range(1, len(token) + 1):
+                    self._prefixes.setdefault(token[:end], set()).add(i)
+            grams = _trigrams(name)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._grams.setdefault(gram, set()).add(i)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _score(self, i: int, query: str, tokens: List[str]) -> float:
+        name = self._names[i]
+        if name == query:
+            return 4.0
+        if name.startswith(query):
+            return 3.0
+        name_tokens = name.split()
+        if all(any(t.startswith(q) for t in name_tokens) for q in tokens):
+            return 2.0
+        if query in name:
+            return 1.0
+        return 0.0
+
+    def search(self, query: str = '', limit: Optional[int] = None) -> List[Dict]:
+        """
+        Ranked matches: exact name, then name prefix, then every query word
+        prefixing a name word, then substring, then fuzzy trigram matches.
+        Ties keep the original (e.g. championship) order. Empty query = all.
+        """
+        query = fold(query or '')
+        if not query:
+            return self.entries[:limit] if limit else list(self.entries)
+
+        tokens = query.split()
+        candidates = set(self._prefixes.get(tokens[0], ()))
+        query_grams = _trigrams(query)
+        overlap = {}
+        for gram in query_grams:
+            for i in self._grams.get(gram, ()):
+                overlap[i] = overlap.get(i, 0) + 1
+
+        ranked = []
+        for i in candidates | set(overlap):
+            score = self._score(i, query, tokens)
+            if not score:
+                # DICE COEFFICIENT OF THE TRIGRAM SETS, BELOW 1.0 SO EXACT-ISH MATCHES WIN
+                similarity = 2 * overlap.get(i, 0) / (len(query_grams) + self._gram_counts[i])
+                if similarity < _FUZZY_THRESHOLD:
+                    continue
+                score = similarity * 0.99
+            ranked.append((-score, i))
+        ranked.sort()
+        if limit:
+            ranked = ranked[:limit]
+        return [self.entries[i] for _, i in ranked]
+
+
+_indexes = {}  # KEY ('season', year) OR ('history',) -> DriverIndex
+_builds = SingleFlight()
+
+
+def _ttl_for(key) -> Optional[float]:
+    if key[0] == 'history':
+        return _HISTORY_TTL
+    # PAST SEASONS NEVER CHANGE
+    return _SEASON_TTL if int(key[1]) >= datetime.now().year else None
+
+
+def _load(key) -> List[Dict]:
+    from app.services import jolpica, warehouse
+
+    if key[0] == 'history':
+        return jolpica._fetch_all_drivers()
+    year = key[1]
+    if warehouse.is_available(year):
+        return warehouse.season_roster(year)
+    return jolpica._fetch_season_roster(year)
+
+
+def _build(key) -> Optional[DriverIndex]:
+    entries = _load(key)
+    if not entries:
+        # NOTHING LOADED (UPSTREAM DOWN?) - DON'T PIN AN EMPTY INDEX
+        return None
+    if key[0] == 'season':
+        entries = sorted(entries, key=_standing_order)
+    index = DriverIndex(entries)
+    _indexes[key] = index
+    return index
+
+
+def _standing_order(driver: Dict):
+    # CHAMPIONSHIP ORDER, UNCLASSIFIED (POSITION 0 / MISSING) LAST, THEN NAME
+    try:
+        position = int(driver.get('position', '0')) or float('inf')
+    except (ValueError, TypeError):
+        position = float('inf')
+    return (position, driver['name'])
+
+
+def _refresh_in_background(key):
+    from app.services.jolpica import _schedule_refresh
+
+    app = current_app._get_current_object() if has_app_context() else None
+
+    def run():
+        if app is None:
+            _builds.do(key, _build, key)
+            return
+        with app.app_context():
+            _builds.do(key, _build, key)
+
+    _schedule_refresh(f"driver-index:{key}", run)
+
+
+def _get_index(key) -> Optional[DriverIndex]:
+    index = _indexes.get(key)
+    if index is None:
+        return _builds.do(key, _build, key)
+    ttl = _ttl_for(key)
+    if ttl is not None and time.time() - index.built_at > ttl:
+        # SERVE THE OLD ONE WHILE A FRESH ROSTER LOADS
+        _refresh_in_background(key)
+    return index
+
+
+def season_index(year: str) -> Optional[DriverIndex]:
+    """Index over one season's roster (with standings), loaded on first use"""
+    return _get_index(('season', str(year)))
+
+
+def history_index() -> Optional[DriverIndex]:
+    """Index over every driver in the championship's history"""
+    return _get_index(('history',))
+
+
+def invalidate(year: Optional[str] = None):
+    """Drop a season's index (or every index) so the next search reloads it"""
+    if year is None:
+        _indexes.clear()
+    else:
+        _indexes.pop(('season', str(year)), None)
@@ -0,0 +1,132 @@
+"""
+# LAST-KNOWN-GOOD FALLBACK BOOKKEEPING
+# WHEN AN UPSTREAM READ FAILS (OR ITS URL FAILED MOMENTS AGO, OR ITS CIRCUIT
+# IS OPEN) THE SERVICES ANSWER WITH THE LAST PAYLOAD FETCHED SUCCESSFULLY,
+# HOWEVER OLD, OR WITH NOTHING IF THERE NEVER WAS ONE. EVERY SUCH FALLBACK
+# IS NOTED IN A REPORT BOUND TO THE CURRENT CONTEXT - CARRIED INTO FAN-OUT,
+# PAGE AND ASYNC WORKERS LIKE THE REQUEST TRACE - SO THAT:
+#   - THE PAGE SAYS HOW OLD ITS DATA IS (stale_data_since IN TEMPLATES,
+#     A Warning: 110 HEADER ON EVERY RESPONSE)
+#   - CONDITIONAL GET DOESN'T LET BROWSERS KEEP THE RESPONSE
+#   - DERIVED CACHES HOLD WHAT WAS BUILT FROM IT ONLY FOR UPSTREAM_NEGATIVE_TTL
+"""
+import contextvars
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+
+from config import Config
+
+
+class FallbackReport:
+    """STALE SOURCES (URL -> FETCHED AT) AND MISSING ONES SEEN IN ONE CONTEXT"""
+    __slots__ = ('stale', 'missing', 'parent', '_lock')
+
+    def __init__(self, parent: Optional['FallbackReport'] = None):
+        self.stale: Dict[str, float] = {}
+        self.missing: Set[str] = set()
+        self.parent = parent
+        self._lock = threading.Lock()
+
+    def add_stale(self, url: str, fetched_at: float):
+        with self._lock:
+            self.stale[url] = min(fetched_at, self.stale.get(url, fetched_at))
+        if self.parent is not None:
+            self.parent.add_stale(url, fetched_at)
+
+    def add_missing(self, url: str):
+        with self._lock:
+            self.missing.add(url)
+        if self.parent is not None:
+            self.parent.add_missing(url)
+
+    def since(self) -> Optional[float]:
+        """Fetch time of the oldest stale source"""
+        with self._lock:
+            return min(self.stale.values()) if self.stale else None
+
+    def __bool__(self) -> bool:
+        return bool(self.stale or self.missing)
+
+
+_current_report = contextvars.ContextVar('fallback_report', default=None)
+
+
+def current() -> Optional[FallbackReport]:
+    return _current_report.get()
+
+
+def bind(report: Optional[FallbackReport]):
+    """Adopt a report in a context that doesn't inherit the caller's (e.g. the async engine loop)"""
+    _current_report.set(report)
+
+
+def degraded() -> bool:
+    """Whether anything served in this context so far came from a fallback"""
+    report = _current_report.get()
+    return bool(report)
+
+
+def note_stale(url: str, fetched_at: float):
+    """A failed read of url was answered with the payload fetched at fetched_at"""
+    report = _current_report.get()
+    if report is not None:
+        report.add_stale(url, fetched_at)
+
+
+def note_missing(url: str):
+    """A failed read of url had nothing to fall back to"""
+    report = _current_report.get()
+    if report is not None:
+        report.add_missing(url)
+
+
+@contextmanager
+def watching():
+    """Collect the fallbacks of a block (they still reach the enclosing report too)"""
+    report = FallbackReport(parent=_current_report.get())
+    token = _current_report.set(report)
+    try:
+        yield report
+    finally:
+        _current_report.reset(token)
+
+
+def cache_ttl(ttl: Optional[float]) -> Optional[float]:
+    """Cap a derived cache entry's TTL while this context has served fallbacks"""
+    if not degraded():
+        return ttl
+    return Config.UPSTREAM_NEGATIVE_TTL if ttl is None else min(ttl, Config.UPSTREAM_NEGATIVE_TTL)
+
+
+# ---------------------------------------------------------------------------
+# REQUEST LIFECYCLE
+# ---------------------------------------------------------------------------
+
+def init_fallback_reporting(app):
+    """Give every request of app a fallback report and surface it to templates and clients"""
+    from flask import g
+
+    @app.before_request
+    def _start_fallback_report():
+        g.fallback_token = _current_report.set(FallbackReport())
+
+    @app.context_processor
+    def _stale_data_context():
+        report = _current_report.get()
+        since = report.since() if report is not None else None
+        return {'stale_data_since': datetime.fromtimestamp(since, timezone.utc) if since else None}
+
+    @app.after_request
+    def _report_fallbacks(response):
+        report = _current_report.get()
+        if report is not None and report.stale:
+            response.headers['Warning'] = '110 f1nsight "Response is Stale"'
+        return response
+
+    @app.teardown_request
+    def _finish_fallback_report(exc):
+        token = g.pop('fallback_token', None)
+        if token is not None:
+            _current_report.reset(token)
@@ -0,0 +1,86 @@
+"""
+# FAN-OUT EXECUTOR FOR MULTI-SOURCE VIEWS
+# RUNS A VIEW'S INDEPENDENT DATA DEPENDENCIES CONCURRENTLY ON ONE BOUNDED,
+# SHARED THREAD POOL, EACH WITH ITS OWN TIMEOUT. A DEPENDENCY THAT FAILS OR
+# TIMES OUT YIELDS ITS DEFAULT AND IS LISTED IN .failed SO THE TEMPLATE CAN
+# RENDER A PLACEHOLDER. PAGE LATENCY ~= THE SLOWEST CALL, NOT THE SUM.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app, has_app_context
+
+from app.services import tracing
+from config import Config
+
+_fanout_pool = ThreadPoolExecutor(max_workers=Config.FANOUT_MAX_WORKERS, thread_name_prefix='fanout')
+
+
+class Dependency:
+    """ONE DATA DEPENDENCY OF A VIEW: fn(*args, **kwargs), ITS FALLBACK AND TIME BUDGET"""
+    __slots__ = ('fn', 'args', 'kwargs', 'default', 'timeout')
+
+    def __init__(self, fn: Callable, *args, default: Any = None, timeout: Optional[float] = None, **kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.default = default
+        self.timeout = Config.FANOUT_TIMEOUT if timeout is None else timeout
+
+
+class FanOutResults(dict):
+    """NAME -> VALUE, PLUS THE NAMES THAT FELL BACK TO THEIR DEFAULT"""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = set()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def _run(app, name, fn, args, kwargs):
+    # EACH WORKER GETS ITS OWN APP CONTEXT (AND DB SESSION)
+    with tracing.span(f"fanout {name}"):
+        if app is None:
+            return fn(*args, **kwargs)
+        with app.app_context():
+            return fn(*args, **kwargs)
+
+
+def fan_out(dependencies: Dict[str, Dependency]) -> FanOutResults:
+    """
+    Run every dependency concurrently and wait for each up to its own
+    timeout (counted from submission, so time queued for a pool thread
+    counts too). Never raises for a dependency: errors and timeouts give
+    the dependency's default and add its name to results.failed. Timed
+    out calls keep running and still fill their caches for the next view.
+    """
+    app = current_app._get_current_object() if has_app_context() else None
+    started = time.monotonic()
+    futures = {}
+    for name, dep in dependencies.items():
+        # CARRY THE CALLER'S CONTEXT VARIABLES (E.G. REQUEST PRIORITY, TRACE) INTO THE WORKER
+        context = contextvars.copy_context()
+        futures[name] = _fanout_pool.submit(context.run, _run, app, name, dep.fn, dep.args, dep.kwargs)
+
+    results = FanOutResults()
+    for name, future in futures.items():
+        dep = dependencies[name]
+        remaining = max(0.0, started + dep.timeout - time.monotonic())
+        try:
+            results[name] = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            print(f"Fan-out dependency '{name}' timed out after {dep.timeout}s")
+            results[name] = dep.default
+            results.failed.add(name)
+        except Exception as e:
+            print(f"Fan-out dependency '{name}' failed: {e}")
+            results[name] = dep.default
+            results.failed.add(name)
+    return results
@@ -0,0 +1,278 @@
+"""
+# OUTBOUND RATE GOVERNOR FOR JOLPICA
+# TOKEN BUCKETS FOR JOLPICA'S LIMITS (A PER-SECOND BURST RATE AND AN HOURLY
+# QUOTA), SHARED BY EVERY THREAD AND - THROUGH A FILE-LOCKED STATE FILE -
+# EVERY GUNICORN WORKER ON THE BOX. EACH UPSTREAM ATTEMPT TAKES ONE TOKEN
+# FROM EVERY BUCKET BEFORE IT IS SENT.
+#
+# PRIORITY LANES (A CONTEXT VARIABLE, SO A LANE FOLLOWS ITS WORK INTO
+# FAN-OUT, PAGE AND ASYNC WORKERS):
+#   interactive - A USER IS WAITING (THE DEFAULT)
+#   background  - CACHE WARMER AND STALE-WHILE-REVALIDATE REFRESHES
+#   sync        - WAREHOUSE BULK SYNC; WAITS AS LONG AS IT TAKES
+# NON-INTERACTIVE LANES ONLY SPEND TOKENS ABOVE A RESERVE KEPT FOR USERS,
+# AND STAND ASIDE WHILE AN INTERACTIVE CALLER IN THE SAME WORKER IS QUEUED.
+# A 429 FROM UPSTREAM PAUSES EVERY LANE IN EVERY WORKER FOR ITS Retry-After.
+#
+# TIME SPENT QUEUED IS RETURNED TO THE CALLER, ADDED TO THE REQUEST TRACE
+# (queue IN Server-Timing) AND EXPORTED TO /metrics. A CALLER THAT WOULD
+# WAIT LONGER THAN ITS LANE ALLOWS GETS RateLimited (A RequestException,
+# SO EXISTING UPSTREAM ERROR HANDLING APPLIES) INSTEAD OF STALLING.
+"""
+import asyncio
+import contextvars
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional
+
+import requests
+
+try:
+    import fcntl
+except ImportError:  # WINDOWS - BUCKETS ARE PER PROCESS
+    fcntl = None
+
+from app.services import metrics, tracing
+from config import Config
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+SYNC = 'sync'
+LANES = (INTERACTIVE, BACKGROUND, SYNC)
+
+_lane = contextvars.ContextVar('upstream_lane', default=INTERACTIVE)
+
+# LONGEST SINGLE SLEEP WHILE QUEUED; OTHER WORKERS AND LANES CHANGE THE STATE MEANWHILE
+_POLL = 0.25
+
+QUEUE_SECONDS = metrics.histogram(
+    'f1nsight_upstream_queue_seconds', 'Time upstream calls waited for a rate token, by lane', ('lane',),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+RATE_LIMITED = metrics.counter(
+    'f1nsight_upstream_rate_limited_total', 'Upstream calls refused because no token came within the lane\'s wait',
+    ('lane',))
+
+
+class RateLimited(requests.exceptions.RequestException):
+    """NO RATE TOKEN WITHIN THE LANE'S MAXIMUM WAIT"""
+
+
+class Bucket(NamedTuple):
+    name: str
+    rate: float      # TOKENS PER SECOND
+    capacity: float  # LARGEST BURST
+
+
+@contextmanager
+def lane(name: str):
+    """Run the block's upstream calls in a priority lane"""
+    token = _lane.set(name)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> str:
+    return _lane.get()
+
+
+def _max_wait(name: str) -> Optional[float]:
+    return {
+        INTERACTIVE: Config.UPSTREAM_INTERACTIVE_MAX_WAIT,
+        BACKGROUND: Config.UPSTREAM_BACKGROUND_MAX_WAIT,
+    }.get(name)  # SYNC: NO LIMIT
+
+
+class RateGovernor:
+    """
+    SHARED STATE (PACKED DOUBLES): PAUSED-UNTIL, THEN TOKENS AND LAST REFILL
+    TIME PER BUCKET. A THREAD LOCK GUARDS IT WITHIN THE WORKER, flock ACROSS
+    WORKERS; EVERY TAKE IS ONE SMALL LOCKED READ-MODIFY-WRITE.
+    """
+
+    def __init__(self, buckets: List[Bucket], reserve: float = 0.25, state_path: Optional[str] = None):
+        self.buckets = buckets
+        self.reserve = reserve
+        self.state_path = state_path if fcntl is not None else None
+        self._format = f"{1 + 2 * len(buckets)}d"
+        self._lock = threading.Lock()
+        self._fd = None
+        self._fd_pid = None
+        self._local = None
+        self._interactive_waiting = 0
+
+    # SHARED STATE ------------------------------------------------------------
+
+    def _full(self, now: float) -> List[float]:
+        state = [0.0]
+        for bucket in self.buckets:
+            state += [bucket.capacity, now]
+        return state
+
+    def _open(self) -> int:
+        # A FORKED WORKER MUST NOT SHARE ITS PARENT'S OPEN FILE (flock IS PER OPEN FILE)
+        if self._fd is None or self._fd_pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+            self._fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._fd_pid = os.getpid()
+        return self._fd
+
+    def _update(self, change):
+        """Apply change(state, now) -> result to the shared state under both locks"""
+        with self._lock:
+            if self.state_path is None:
+                return self._update_local(change)
+            now = time.time()
+            try:
+                fd = self._open()
+            except OSError as e:
+                print(f"Rate governor state {self.state_path} unusable, using per-worker buckets: {e}")
+                self.state_path = None
+                return self._update_local(change)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(fd, struct.calcsize(self._format), 0)
+                if len(raw) == struct.calcsize(self._format):
+                    state = list(struct.unpack(self._format, raw))
+                else:
+                    state = self._full(now)  # NEW FILE, OR THE BUCKETS WERE RECONFIGURED
+                result = change(state, now)
+                os.pwrite(fd, struct.pack(self._format, *state), 0)
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _update_local(self, change):
+        now = time.time()
+        if self._local is None:
+            self._local = self._full(now)
+        return change(self._local, now)
+
+    # TOKENS ------------------------------------------------------------------
+
+    def _take(self, name: str) -> float:
+        """Take one token from every bucket; 0 if taken, else seconds until it might be"""
+        def change(state, now):
+            if now < state[0]:
+                return state[0] - now
+            levels = []
+            for i, bucket in enumerate(self.buckets):
+                tokens, refilled = state[1 + 2 * i], state[2 + 2 * i]
+                tokens = min(bucket.capacity, tokens + max(0.0, now - refilled) * bucket.rate)
+                state[1 + 2 * i], state[2 + 2 * i] = tokens, now
+                levels.append(tokens)
+            wait = 0.0
+            for bucket, tokens in zip(self.buckets, levels):
+                need = 1.0 + (0.0 if name == INTERACTIVE else bucket.capacity * self.reserve)
+                if tokens < need:
+                    wait = max(wait, (need - tokens) / bucket.rate)
+            if wait:
+                return wait
+            for i in range(len(self.buckets)):
+                state[1 + 2 * i] -= 1.0
+            return 0.0
+        return self._update(change)
+
+    def _next_wait(self, name: str) -> float:
+        if name != INTERACTIVE and self._interactive_waiting:
+            return _POLL  # USERS FIRST
+        return self._take(name)
+
+    def _done(self, name: str, started: float) -> float:
+        waited = time.monotonic() - started
+        QUEUE_SECONDS.observe(waited, name)
+        if waited >= 0.001:
+            tracing.record('queue', waited)
+        return waited
+
+    def _refuse(self, name: str, wait: float):
+        RATE_LIMITED.inc(name)
+        raise RateLimited(f"no upstream rate token for the {name} lane within {_max_wait(name)}s "
+                          f"(next in {wait:.1f}s)")
+
+    def acquire(self, name: Optional[str] = None) -> float:
+        """Block until the lane may send one upstream call; returns seconds queued"""
+        name = name or _lane.get()
+        started = time.monotonic()
+        limit = _max_wait(name)
+        if name == INTERACTIVE:
+            with self._lock:
+                self._interactive_waiting += 1
+        try:
+            while True:
+                wait = self._next_wait(name)
+                if wait <= 0:
+                    return self._done(name, started)
+                if limit is not None and time.monotonic() - started + wait > limit:
+                    self._refuse(name, wait)
+                time.sleep(min(wait, _POLL))
+        finally:
+            if name == INTERACTIVE:
+                with self._lock:
+                    self._interactive_waiting -= 1
+
+    async def acquire_async(self, run_blocking, name: Optional[str] = None) -> float:
+        """
+        acquire() for the async fetch engine's event loop. Token takes lock the
+        shared state file, so they go through run_blocking(fn, *args) (an
+        awaitable running fn off the loop); only the waits between them stay on it.
+        """
+        name = name or _lane.get()
+        started = time.monotonic()
+        limit = _max_wait(name)
+        if name == INTERACTIVE:
+            with self._lock:
+                self._interactive_waiting += 1
+        try:
+            while True:
+                wait = await run_blocking(self._next_wait, name)
+                if wait <= 0:
+                    return self._done(name, started)
+                if limit is not None and time.monotonic() - started + wait > limit:
+                    self._refuse(name, wait)
+                await asyncio.sleep(min(wait, _POLL))
+        finally:
+            if name == INTERACTIVE:
+                with self._lock:
+                    self._interactive_waiting -= 1
+
+    def pause(self, seconds: float):
+        """Stop every lane in every worker for seconds (upstream answered 429)"""
+        def change(state, now):
+            state[0] = max(state[0], now + seconds)
+        self._update(change)
+
+    def levels(self) -> Dict[str, float]:
+        """Tokens currently available per bucket"""
+        def change(state, now):
+            return {bucket.name: min(bucket.capacity, state[1 + 2 * i] + max(0.0, now - state[2 + 2 * i]) * bucket.rate)
+                    for i, bucket in enumerate(self.buckets)}
+        return self._update(change)
+
+
+_rate_governor = None
+_rate_governor_lock = threading.Lock()
+
+
+def get_rate_governor() -> Optional[RateGovernor]:
+    """The process wide governor, or None when UPSTREAM_GOVERNOR_ENABLED is off"""
+    global _rate_governor
+    if not Config.UPSTREAM_GOVERNOR_ENABLED:
+        return None
+    if _rate_governor is None:
+        with _rate_governor_lock:
+            if _rate_governor is None:
+                buckets = []
+                if Config.UPSTREAM_RATE_PER_SECOND > 0:
+                    buckets.append(Bucket('second', Config.UPSTREAM_RATE_PER_SECOND,
+                                          max(1.0, Config.UPSTREAM_RATE_PER_SECOND)))
+                if Config.UPSTREAM_RATE_PER_HOUR > 0:
+                    buckets.append(Bucket('hour', Config.UPSTREAM_RATE_PER_HOUR / 3600,
+                                          Config.UPSTREAM_RATE_PER_HOUR))
+                _rate_governor = RateGovernor(buckets, Config.UPSTREAM_GOVERNOR_RESERVE,
+                                              Config.UPSTREAM_GOVERNOR_PATH)
+    return _rate_governor
@@ -0,0 +1,187 @@
+"""
+# PERSISTENT ON-DISK STORE FOR UPSTREAM API RESPONSES
+# KEEPS RAW JOLPICA JSON KEYED BY URL IN SQLITE SO EVERY WORKER (AND EVERY
+# RESTART) CAN SHARE IT. EACH ROW ALSO HOLDS THE ETAG / LAST-MODIFIED
+# VALIDATORS SO EXPIRED ENTRIES CAN BE REVALIDATED WITH A CONDITIONAL GET.
+#
+# MODES (UPSTREAM_STORE_MODE):
+#   live   - USE THE STORE AS A CACHE, REVALIDATE WHEN EXPIRED (DEFAULT)
+#   record - ALWAYS HIT THE NETWORK AND WRITE EVERY RESPONSE TO THE STORE
+#   replay - NEVER TOUCH THE NETWORK, ONLY SERVE WHAT WAS RECORDED
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from config import Config
+
+MODE_LIVE = 'live'
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+MODES = (MODE_LIVE, MODE_RECORD, MODE_REPLAY)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+)
+"""
+
+# VALUES COMPUTED FROM RESPONSES (E.G. CAREER STATS) THAT ARE WORTH KEEPING ACROSS RESTARTS
+_DERIVED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS derived (
+    key TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+class StoredResponse(NamedTuple):
+    data: Dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def age(self) -> float:
+        """Seconds since this response was last fetched or revalidated"""
+        return time.time() - self.fetched_at
+
+
+class ResponseStore:
+    """
+    SQLITE BACKED URL -> RESPONSE STORE
+    ONE CONNECTION PER THREAD, WAL JOURNAL SO SEVERAL GUNICORN WORKERS CAN
+    READ WHILE ANOTHER ONE WRITES.
+    """
+
+    def __init__(self, path: str, mode: str = MODE_LIVE):
+        if mode not in MODES:
+            raise ValueError(f"Unknown upstream store mode '{mode}', expected one of {MODES}")
+        self.path = path
+        self.mode = mode
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_DERIVED_SCHEMA)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, url: str) -> Optional[StoredResponse]:
+        """Return the stored response for a URL, or None if never fetched"""
+        try:
+            row = self._connection().execute(
+                'SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?',
+                (url,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading upstream store for {url}: {e}")
+            return None
+
+        if not row:
+            return None
+        body, etag, last_modified, fetched_at = row
+        try:
+            return StoredResponse(json.loads(body), etag, last_modified, fetched_at)
+        except ValueError:
+            return None
+
+    def put(self, url: str, data: Dict, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Insert or replace the stored response for a URL"""
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses (url, body, etag, last_modified, fetched_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (url, json.dumps(data, separators=(',', ':')), etag, last_modified, time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing upstream store for {url}: {e}")
+
+    def touch(self, url: str):
+        """Mark a stored response as freshly revalidated (after a 304)"""
+        try:
+            with self._connection() as conn:
+                conn.execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (time.time(), url))
+        except sqlite3.Error as e:
+            print(f"Error touching upstream store for {url}: {e}")
+
+    def get_value(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, stored_at) for a persisted derived value, or None"""
+        try:
+            row = self._connection().execute(
+                'SELECT body, stored_at FROM derived WHERE key = ?', (key,)
+            ).fetchone()
+            return (json.loads(row[0]), row[1]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error reading derived value {key}: {e}")
+            return None
+
+    def put_value(self, key: str, value: Any):
+        """Persist a derived value"""
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO derived (key, body, stored_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(value, separators=(',', ':')), time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing derived value {key}: {e}")
+
+    def size(self) -> Tuple[int, int]:
+        """(responses, bytes) currently stored"""
+        try:
+            return tuple(self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM responses').fetchone())
+        except sqlite3.Error as e:
+            print(f"Error sizing upstream store: {e}")
+            return 0, 0
+
+    def conditional_headers(self, stored: Optional[StoredResponse]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a stored response"""
+        headers = {}
+        if stored is None:
+            return headers
+        if stored.etag:
+            headers['If-None-Match'] = stored.etag
+        if stored.last_modified:
+            headers['If-Modified-Since'] = stored.last_modified
+        return headers
+
+
+_response_store = None
+_response_store_lock = threading.Lock()
+
+
+def get_response_store() -> ResponseStore:
+    """Return the process wide response store, creating it on first use"""
+    global _response_store
+    if _response_store is None:
+        with _response_store_lock:
+            if _response_store is None:
+                _response_store = ResponseStore(Config.UPSTREAM_STORE_PATH, Config.UPSTREAM_STORE_MODE)
+    return _response_store
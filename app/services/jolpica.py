@@ -1,67 +1,393 @@
+import contextvars
 import requests
+import threading
 import time
-from typing import Dict, List, Optional
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 from datetime import datetime
+from app.services.http_store import get_response_store
+from app.services.upstream import get_upstream_client, endpoint_family
+from app.services.singleflight import SingleFlight, process_lock
+from app.services.tiered_cache import CacheNamespace, get_tiered_cache, memoize
+from app.services import fallback, governor, metrics, tracing
+from app.services.records import (RaceInfo, RaceDetail, RaceResult, DriverRaceResult, DriverEntry,
+                                  driver_ref, constructor_ref, circuit_ref, _generate_driver_code)
+from config import Config
 
-API_BASE_URL = "https://api.jolpi.ca/ergast/f1"
+API_BASE_URL = Config.JOLPICA_BASE_URL
 
 # CACHE SETTINGS
-_cache = {}
 _cache_duration = 3600  # CACHE DURATION IN SECONDS
 _long_cache_duration = 86400  # 24 HOURS FOR RARELY CHANGING DATA LIKE CAREER STATS
+# RAW RESPONSES ARE KEPT PER WORKER ONLY - THE RESPONSE STORE IS THEIR SHARED TIER
+_cache = CacheNamespace('upstream', shared=False)
 
-def _get_cache(key: str, long_term: bool = False) -> Optional[Dict]:
-    """Get a value from cache if it exists and is not expired"""
-    if key in _cache:
-        timestamp, data = _cache[key]
-        duration = _long_cache_duration if long_term else _cache_duration
-        if time.time() - timestamp < duration:
-            return data
-        else:
-            del _cache[key]
-    return None
+class CachePolicy(NamedTuple):
+    ttl: float        # SERVED AS FRESH UNTIL THIS AGE
+    max_stale: float  # THEN SERVED STALE (AND REFRESHED IN THE BACKGROUND) FOR THIS MUCH LONGER
+
+# STALE-WHILE-REVALIDATE POLICY PER KEY CLASS
+CACHE_POLICIES = {
+    'seasons': CachePolicy(ttl=_long_cache_duration, max_stale=7 * 86400),
+    'standings': CachePolicy(ttl=300, max_stale=6 * 3600),
+    'latest': CachePolicy(ttl=120, max_stale=3600),
+    'results': CachePolicy(ttl=_cache_duration, max_stale=86400),
+    'career': CachePolicy(ttl=_long_cache_duration, max_stale=7 * 86400),
+    'default': CachePolicy(ttl=_cache_duration, max_stale=86400),
+}
+
+# ENDPOINT FAMILY -> KEY CLASS
+_POLICY_CLASSES = {
+    'seasons': 'seasons',
+    'driverstandings': 'standings',
+    'constructorstandings': 'standings',
+    'results': 'results',
+    'sprint': 'results',
+    'qualifying': 'results',
+}
+
+# FRESH / STALE / MISS COUNTS PER POLICY CLASS - THE NUMBERS TO TUNE CACHE_POLICIES WITH
+_LOOKUPS = metrics.counter('f1nsight_upstream_cache_lookups_total',
+                           'Upstream response cache lookups by policy class and freshness', ('policy', 'state'))
+
+# FAILED READS THAT FELL BACK TO THE LAST GOOD PAYLOAD (OR TO NOTHING), PER POLICY CLASS
+_FALLBACKS = metrics.counter('f1nsight_upstream_fallbacks_total',
+                             'Failed upstream reads answered from the last good payload or with nothing',
+                             ('policy', 'source'))
+
+# URLS THAT FAILED RECENTLY (NEGATIVE CACHE) - SHARED, SO NO WORKER REPEATS A FAILURE
+# ANOTHER ONE JUST WAITED THROUGH
+_failures = CacheNamespace('upstream-failures', ttl=Config.UPSTREAM_NEGATIVE_TTL)
+
+# ONE IN-FLIGHT UPSTREAM FETCH PER URL
+_inflight = SingleFlight()
+
+# BACKGROUND REVALIDATION OF STALE ENTRIES
+_refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='jolpica-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _policy_class(key: str) -> str:
+    if '/last/' in key:
+        return 'latest'
+    if '://' in key:
+        return _POLICY_CLASSES.get(endpoint_family(key), 'default')
+    return 'default'
+
+def _policy_for(key: str) -> CachePolicy:
+    """Pick the stale-while-revalidate policy for a cache key or URL"""
+    return CACHE_POLICIES[_policy_class(key)]
+
+def _lookup_cache(key: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Look a key up and classify it against its policy.
+    Returns (data, 'fresh'), (data, 'stale') or (None, None) once past max staleness.
+    """
+    entry = _cache.get_entry(key)  # ENTRIES PAST MAX STALENESS HAVE ALREADY EXPIRED
+    policy_class = _policy_class(key)
+    if entry is None:
+        _LOOKUPS.inc(policy_class, 'miss')
+        tracing.count('jolpica', 'miss')
+        return None, None
+    state = 'fresh' if time.time() - entry.stored_at < CACHE_POLICIES[policy_class].ttl else 'stale'
+    _LOOKUPS.inc(policy_class, state)
+    tracing.count('jolpica', state)
+    return entry.value, state
+
+def _get_cache(key: str) -> Optional[Dict]:
+    """Get a value from cache if it exists and is still fresh"""
+    data, state = _lookup_cache(key)
+    return data if state == 'fresh' else None
+
+def _set_cache(key: str, value: Dict, timestamp: Optional[float] = None):
+    """Set a value in cache with current (or the given fetch) timestamp"""
+    policy = _policy_for(key)
+    _cache.set(key, value, ttl=policy.ttl + policy.max_stale, stored_at=timestamp)
+
+def _note_failure(url: str, error: Exception):
+    """Remember a failed read so it isn't retried (by any worker) for UPSTREAM_NEGATIVE_TTL"""
+    _failures.set(url, f"{type(error).__name__}: {error}")
+
+def _failed_recently(url: str) -> bool:
+    return _failures.get_entry(url) is not None
+
+def _fall_back(url: str, stored) -> Optional[Dict]:
+    """
+    Answer a failed read with the last payload fetched successfully, however
+    old (noted as stale for the current request), or None if there never was one
+    """
+    policy_class = _policy_class(url)
+    tracing.count('jolpica', 'fallback')
+    if stored is None:
+        _FALLBACKS.inc(policy_class, 'none')
+        fallback.note_missing(url)
+        return None
+    _FALLBACKS.inc(policy_class, 'last_known_good')
+    fallback.note_stale(url, stored.fetched_at)
+    return stored.data
+
+def get_cache_stats() -> Dict:
+    """Hit/miss/eviction counters and byte usage of the tiered cache, per namespace"""
+    return get_tiered_cache().stats()
+
+def _schedule_refresh(key: str, fn, *args):
+    """Refresh a stale entry on the background pool (background rate lane), at most once per key at a time"""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
 
-def _set_cache(key: str, value: Dict, long_term: bool = False):
-    """Set a value in cache with current timestamp"""
-    _cache[key] = (time.time(), value)
+    def run():
+        try:
+            with governor.lane(governor.BACKGROUND):
+                fn(*args)
+        except Exception as e:
+            print(f"Background refresh of {key} failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresher.submit(run)
+
+# SET BY revalidating(): BYPASS FRESHNESS CHECKS AND ASK UPSTREAM (CONDITIONALLY)
+_force_revalidate = contextvars.ContextVar('force_revalidate', default=False)
+
+@contextmanager
+def revalidating():
+    """
+    Within this block every upstream read is revalidated against Jolpica
+    (a conditional GET) instead of trusting fresh cached copies. Used by the
+    cache warmer right after a race, when cached entries are known to be old.
+    """
+    token = _force_revalidate.set(True)
+    try:
+        yield
+    finally:
+        _force_revalidate.reset(token)
+
+def _make_request(url: str) -> Optional[Dict]:
+    """
+    Make an API request through the shared upstream client (pooled
+    connections, timeouts and jittered backoff live there) with caching.
+    Responses are persisted in the on-disk response store; expired entries
+    are revalidated with a conditional GET instead of a full re-download.
+    Stale entries are served immediately and refreshed in the background;
+    only a true miss (or one past max staleness) blocks on upstream, and
+    concurrent misses for the same URL are coalesced into one fetch.
+    A failed fetch falls back to the last good payload (see _fall_back) and
+    the URL isn't asked for again until its negative cache entry expires.
+    """
+    if _force_revalidate.get() and not get_response_store().replaying:
+        return _inflight.do(url, _fetch_shared, url, True)
+
+    answered, data = _cached_response(url)
+    if answered:
+        return data
+    return _inflight.do(url, _fetch_shared, url)
 
-def _make_request(url: str, max_retries: int = 3, delay: float = 0.5) -> Optional[Dict]:
+def _cached_response(url: str) -> Tuple[bool, Optional[Dict]]:
     """
-    Make an API request with retry logic, rate limiting, and caching.
+    The cache policy of _make_request (also followed by the async fetch engine):
+    (True, data) if the URL is answered without an upstream fetch - fresh or
+    stale-while-revalidate from the caches, replayed, or the fallback for a URL
+    that failed moments ago - otherwise (False, None) and the caller fetches it
+    under the single-flight key url.
     """
     # Check cache first
-    cache_key = url
-    cached_data = _get_cache(cache_key)
-    if cached_data:
-        return cached_data
+    cached_data, state = _lookup_cache(url)
+    if state == 'fresh':
+        return True, cached_data
+    if state == 'stale':
+        _schedule_refresh(url, _inflight.do, url, _fetch_shared, url)
+        return True, cached_data
+
+    # Then the persistent store shared by every worker
+    store = get_response_store()
+    stored = store.get(url)
+    if store.replaying:
+        if stored is None:
+            print(f"No recorded response for {url} (replay mode)")
+            return True, None
+        _set_cache(url, stored.data)
+        return True, stored.data
+
+    if stored and not store.recording:
+        policy = _policy_for(url)
+        if stored.age() < policy.ttl + policy.max_stale:
+            _set_cache(url, stored.data, stored.fetched_at)
+            if stored.age() >= policy.ttl:
+                _schedule_refresh(url, _inflight.do, url, _fetch_shared, url)
+            return True, stored.data
+
+    if _failed_recently(url):
+        return True, _fall_back(url, stored)
+    return False, None
+
+def _fetch_shared(url: str, force: bool = False) -> Optional[Dict]:
+    """
+    Single-flight body of _make_request: take the cross-worker lock, re-check
+    the persistent store and otherwise (re)fetch from upstream. force skips
+    the freshness re-check. If upstream fails (or failed for another worker
+    while we waited for the lock) the stored copy is the fallback.
+    """
+    with process_lock(url):
+        answered, data, stored = _recheck_store(url, force)
+        if answered:
+            return data
 
-    for attempt in range(max_retries):
         try:
-            # Only delay after first attempt
-            if attempt > 0:
-                time.sleep(delay * attempt)
-            response = requests.get(url)
+            response = get_upstream_client().get(url, headers=_revalidation_headers(stored))
+
+            # NOT MODIFIED - KEEP THE STORED BODY, JUST RESET ITS AGE
+            if response.status_code == 304 and stored:
+                return _not_modified(url, stored)
+
             response.raise_for_status()
-            data = response.json()
-            _set_cache(cache_key, data)  # Cache the response
-            return data
-        except requests.exceptions.RequestException as e:
-            if attempt == max_retries - 1:
-                print(f"Error making request to {url}: {e}")
-                return None
-            time.sleep(delay * (attempt + 1))  # Longer delay between retries
-    return None
-
-@lru_cache(maxsize=1)  # CACHE LATEST YEAR LIST
+            return _fetched(url, response.json(), response.headers.get('ETag'),
+                            response.headers.get('Last-Modified'))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return _fetch_failed(url, stored, e)
+
+# STEPS OF A SHARED FETCH, ALSO USED BY THE ASYNC FETCH ENGINE (WHICH RUNS THEM OFF ITS EVENT LOOP)
+
+def _recheck_store(url: str, force: bool = False):
+    """
+    Under the cross-worker lock: (True, data, stored) if another worker refreshed
+    the URL, or failed to, while we waited; otherwise (False, None, stored)
+    """
+    store = get_response_store()
+    stored = store.get(url)
+    if stored and not store.recording and not force and stored.age() < _policy_for(url).ttl:
+        _set_cache(url, stored.data, stored.fetched_at)
+        return True, stored.data, stored
+    if _failed_recently(url):
+        return True, _fall_back(url, stored), stored
+    return False, None, stored
+
+def _revalidation_headers(stored) -> Dict[str, str]:
+    """Conditional GET headers - only in live mode, record mode always captures a full body"""
+    store = get_response_store()
+    return {} if store.recording else store.conditional_headers(stored)
+
+def _not_modified(url: str, stored) -> Dict:
+    get_response_store().touch(url)
+    _set_cache(url, stored.data)
+    return stored.data
+
+def _fetched(url: str, data: Dict, etag: Optional[str], last_modified: Optional[str]) -> Dict:
+    get_response_store().put(url, data, etag, last_modified)
+    _set_cache(url, data)  # Cache the response
+    return data
+
+def _fetch_failed(url: str, stored, error: Exception) -> Optional[Dict]:
+    print(f"Error making request to {url}: {error}")
+    _note_failure(url, error)
+    return _fall_back(url, stored)
+
+# LARGEST PAGE JOLPICA WILL SERVE
+ERGAST_PAGE_LIMIT = 100
+
+# FETCHES THE REMAINING PAGES OF A PAGINATED RESOURCE CONCURRENTLY
+_page_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='jolpica-pages')
+
+def _page_url(url: str, limit: int, offset: int) -> str:
+    """Add limit/offset paging parameters to an Ergast URL"""
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}limit={limit}&offset={offset}"
+
+def _make_paginated_request(url: str, table_key: str, list_key: str, child_key: Optional[str] = None) -> Optional[Dict]:
+    """
+    Fetch every page of a paginated Ergast resource and merge them into one
+    payload shaped like a single MRData response (so existing parsing works).
+    Reads MRData total/limit from the first page, then requests the remaining
+    offsets concurrently at the largest page size the server allows; each
+    page is cached independently by _make_request.
+    child_key names a nested list (e.g. 'Results', 'DriverStandings') whose
+    parent rows can be split across a page boundary - split parents are
+    stitched back together.
+    Returns None if any page could not be fetched rather than truncated data.
+    """
+    first = _make_request(_page_url(url, ERGAST_PAGE_LIMIT, 0))
+    if not first or 'MRData' not in first:
+        return None
+
+    try:
+        total = int(first['MRData'].get('total', 0))
+        limit = int(first['MRData'].get('limit', ERGAST_PAGE_LIMIT)) or ERGAST_PAGE_LIMIT
+    except (ValueError, TypeError):
+        total, limit = 0, ERGAST_PAGE_LIMIT
+
+    pages = [first]
+    offsets = list(range(limit, total, limit))
+    if offsets:
+        # CARRY THE CALLER'S CONTEXT (E.G. revalidating()) INTO THE PAGE WORKERS
+        context = contextvars.copy_context()
+        pages.extend(_page_pool.map(
+            lambda offset: context.copy().run(_make_request, _page_url(url, limit, offset)), offsets))
+
+    rows = []
+    for page in pages:
+        if not page or 'MRData' not in page:
+            print(f"Incomplete paginated fetch for {url}")
+            return None
+        rows.extend(page['MRData'].get(table_key, {}).get(list_key, []))
+
+    if child_key:
+        # STITCH PARENTS (E.G. A RACE WHOSE RESULTS SPAN TWO PAGES) BACK TOGETHER
+        # WITHOUT MUTATING THE CACHED PAGE PAYLOADS
+        merged = {}
+        for row in rows:
+            key = (row.get('season'), row.get('round'))
+            if key not in merged:
+                merged[key] = dict(row, **{child_key: list(row.get(child_key, []))})
+            else:
+                merged[key][child_key].extend(row.get(child_key, []))
+        rows = list(merged.values())
+
+    mr_data = dict(first['MRData'], limit=str(max(total, len(rows))), offset='0')
+    mr_data[table_key] = dict(first['MRData'].get(table_key, {}), **{list_key: rows})
+    return {'MRData': mr_data}
+
+def _fetch_paginated(url: str, table_key: str, list_key: str, child_key: Optional[str] = None) -> Optional[List[Dict]]:
+    """Like _make_paginated_request but returns just the merged rows"""
+    data = _make_paginated_request(url, table_key, list_key, child_key)
+    if data is None:
+        return None
+    return data['MRData'][table_key][list_key]
+
+def get_latest_completed_round(year) -> int:
+    """
+    Round number of the most recent race with results in a season (0 if none).
+    Cheap, short-TTL probe used as the data version for derived caches:
+    anything keyed on it stays valid until a new result actually lands.
+    """
+    from app.services import warehouse
+
+    if warehouse.is_available(year):
+        return warehouse.latest_round(year)
+    return _fetch_latest_round(year)
+
+def _fetch_latest_round(year) -> int:
+    """Ask the API (not the warehouse) for the latest round with results"""
+    data = _make_request(f"{API_BASE_URL}/{year}/last/results.json?limit=1")
+    if not data or 'MRData' not in data:
+        return 0
+    races = data['MRData'].get('RaceTable', {}).get('Races', [])
+    try:
+        return int(races[0]['round']) if races else 0
+    except (KeyError, ValueError, TypeError):
+        return 0
+
+@memoize('available_years', ttl=_long_cache_duration)  # CACHE LATEST YEAR LIST
 def get_available_years() -> List[str]:
     """
     Get a list of available F1 seasons.
     Returns a list of years in descending order.
     """
     try:
-        url = f"{API_BASE_URL}/seasons.json?limit=100"
-        data = _make_request(url)
+        url = f"{API_BASE_URL}/seasons.json"
+        data = _make_paginated_request(url, 'SeasonTable', 'Seasons')
         
         if data and 'MRData' in data and 'SeasonTable' in data['MRData']:
             seasons = data['MRData']['SeasonTable'].get('Seasons', [])
@@ -72,126 +398,107 @@ def get_available_years() -> List[str]:
         print(f"Error getting available years: {e}")
         return []
 
-@lru_cache(maxsize=100)
-def _generate_driver_code(given_name: str, family_name: str) -> str:
+def _fetch_season_roster(year: str) -> List[DriverEntry]:
     """
-    Generate a driver code from their name when not provided by the API.
-    For historical drivers where code is not available.
+    Every driver of a season with their championship standing, from the API.
     """
-    # FOR SINGLE WORD NAMES, USE FIRST 3 LETTERS
-    if not given_name or not family_name:
-        full_name = (given_name or '') + (family_name or '')
-        return full_name[:3].upper() if full_name else ''
-    
-    # Try to create a 3-letter code from initials and surname
-    if len(family_name) >= 2:
-        return family_name[:3].upper()
-    
-    # Fallback: combine initials
-    return (given_name[0] + family_name[0]).upper()
+    url = f"{API_BASE_URL}/{year}/drivers.json"
+    data = _make_paginated_request(url, 'DriverTable', 'Drivers')
+
+    if not data or 'MRData' not in data:
+        return []
 
-@lru_cache(maxsize=100)
-def search_drivers(year: str, query: str = "") -> List[Dict]:
+    drivers = data['MRData']['DriverTable'].get('Drivers', [])
+    if not drivers:
+        return []
+
+    # Get standings for this year to include current position/points
+    standings_url = f"{API_BASE_URL}/{year}/driverStandings.json"
+    standings_data = _make_paginated_request(standings_url, 'StandingsTable', 'StandingsLists', 'DriverStandings')
+
+    # Create a map of driver standings
+    driver_standings = {}
+    if standings_data and 'MRData' in standings_data:
+        standings_list = standings_data['MRData']['StandingsTable'].get('StandingsLists', [])
+        if standings_list:
+            for standing in standings_list[0].get('DriverStandings', []):
+                driver_id = standing['Driver']['driverId']
+                try:
+                    driver_standings[driver_id] = {
+                        'position': standing.get('position', '0'),
+                        'points': standing.get('points', '0'),
+                        'wins': standing.get('wins', '0'),
+                        'constructor': standing['Constructors'][0]['name'] if standing.get('Constructors') else None
+                    }
+                except (KeyError, IndexError):
+                    # Skip this standing if data is incomplete
+                    continue
+
+    roster = []
+    for driver in drivers:
+        # Add standings information if available (defaults otherwise)
+        standing = driver_standings.get(driver['driverId'], {})
+        roster.append(DriverEntry(driver_ref(driver), **standing))
+    return roster
+
+def _fetch_all_drivers() -> List[DriverEntry]:
+    """
+    Every driver in the championship's history (no standings), from the API.
+    """
+    drivers = _fetch_paginated(f"{API_BASE_URL}/drivers.json", 'DriverTable', 'Drivers')
+    return [DriverEntry(driver_ref(driver), standing=False) for driver in drivers or []]
+
+def search_drivers(year: str, query: str = "", limit: Optional[int] = None) -> List[Dict]:
     """
     Search for F1 drivers in a specific year.
+    The season's roster is loaded once into a name index (see driver_index),
+    so each keystroke is an in-memory lookup.
     Args:
         year: The F1 season year to search in
-        query: Optional search string to filter drivers
+        query: Optional search string, accent- and case-insensitive,
+               matched on name prefixes with a fuzzy fallback
+        limit: Optional maximum number of results
     Returns:
-        list: A list of matching drivers with their basic information
+        list: Matching drivers with their basic information, best match
+              first (championship order when there is no query)
     """
+    from app.services import driver_index
+
     try:
-        url = f"{API_BASE_URL}/{year}/drivers.json"
-        data = _make_request(url)
-        
-        if not data or 'MRData' not in data:
-            return []
-            
-        drivers = data['MRData']['DriverTable'].get('Drivers', [])
-        if not drivers:
-            return []
-        
-        # Get standings for this year to include current position/points
-        standings_url = f"{API_BASE_URL}/{year}/driverStandings.json"
-        standings_data = _make_request(standings_url)
-        
-        # Create a map of driver standings
-        driver_standings = {}
-        if standings_data and 'MRData' in standings_data:
-            standings_list = standings_data['MRData']['StandingsTable'].get('StandingsLists', [])
-            if standings_list:
-                for standing in standings_list[0].get('DriverStandings', []):
-                    driver_id = standing['Driver']['driverId']
-                    try:
-                        driver_standings[driver_id] = {
-                            'position': standing.get('position', '0'),
-                            'points': standing.get('points', '0'),
-                            'wins': standing.get('wins', '0'),
-                            'constructor': standing['Constructors'][0]['name'] if standing.get('Constructors') else None
-                        }
-                    except (KeyError, IndexError):
-                        # Skip this standing if data is incomplete
-                        continue
-        
-        matching_drivers = []
-        query = query.lower()
-        
-        for driver in drivers:
-            if (not query or
-                query in driver['givenName'].lower() or 
-                query in driver['familyName'].lower() or 
-                query in f"{driver['givenName']} {driver['familyName']}".lower()):
-                
-                driver_id = driver['driverId']
-                driver_info = {
-                    'id': driver_id,
-                    'name': f"{driver['givenName']} {driver['familyName']}",
-                    'nationality': driver['nationality'],
-                    'dateOfBirth': driver['dateOfBirth'],
-                    'wikiUrl': driver.get('url', ''),
-                    'code': driver.get('code') or _generate_driver_code(driver['givenName'], driver['familyName']),
-                    'number': driver.get('permanentNumber', '')
-                }
-                
-                # Add standings information if available
-                if driver_id in driver_standings:
-                    driver_info.update(driver_standings[driver_id])
-                else:
-                    # Add default values if standings not available
-                    driver_info.update({
-                        'position': '0',
-                        'points': '0',
-                        'wins': '0',
-                        'constructor': None
-                    })
-                
-                matching_drivers.append(driver_info)
-        
-        # Sort by position if available, otherwise by name
-        # Use a safer sorting approach that handles missing or invalid values
-        def sort_key(x):
-            try:
-                pos = int(x.get('position', '0'))
-                # Move position 0 to the end by treating it as infinity
-                if pos == 0:
-                    pos = float('inf')
-            except (ValueError, TypeError):
-                pos = float('inf')
-            return (pos, x['name'])
-            
-        return sorted(matching_drivers, key=sort_key)
-        
+        index = driver_index.season_index(year)
+        return index.search(query, limit) if index else []
+    except Exception as e:
+        print(f"Error searching drivers: {e}")
+        return []
+
+def search_all_drivers(query: str = "", limit: Optional[int] = 20) -> List[Dict]:
+    """
+    Search every driver in the championship's history (typeahead).
+    Same matching as search_drivers, without season standings.
+    """
+    from app.services import driver_index
+
+    try:
+        index = driver_index.history_index()
+        return index.search(query, limit) if index else []
     except Exception as e:
         print(f"Error searching drivers: {e}")
         return []
 
-@lru_cache(maxsize=128)
 def get_driver_profile(driver_id: str, year: Optional[str] = None, load_career_stats: bool = True) -> Optional[Dict]:
     """
     Get detailed profile information for a specific driver.
     Uses caching to minimize API calls.
     If year is provided, includes statistics for that specific season.
     """
+    # SEASON STATS AND NEIGHBOURS MOVE WITH EVERY ROUND: KEY THE CACHED
+    # PROFILE ON THE SEASON'S DATA VERSION, LIKE THE STANDINGS INDEX
+    version = get_latest_completed_round(year) if year else 0
+    return _get_driver_profile(driver_id, year, load_career_stats, version)
+
+@memoize('driver_profile', ttl=_cache_duration)
+def _get_driver_profile(driver_id: str, year: Optional[str], load_career_stats: bool, version: int) -> Optional[Dict]:
+    """get_driver_profile for one data version of the season"""
     try:
         # Get basic driver info
         url = f"{API_BASE_URL}/drivers/{driver_id}.json"
@@ -221,66 +528,37 @@ def get_driver_profile(driver_id: str, year: Optional[str] = None, load_career_s
         
         # Get seasons statistics if year is provided
         if year:
-            standings_url = f"{API_BASE_URL}/{year}/drivers/{driver_id}/driverStandings.json"
-            standings_data = _make_request(standings_url)
-            
-            if standings_data and 'MRData' in standings_data:
-                standings_lists = standings_data['MRData']['StandingsTable'].get('StandingsLists', [])
-                if standings_lists:
-                    standings = standings_lists[0].get('DriverStandings', [])
-                    if standings:
-                        season_stats = standings[0]
-                        profile['seasons'][year] = {
-                            'position': season_stats['position'],
-                            'points': season_stats['points'],
-                            'wins': season_stats['wins'],
-                            'constructor': season_stats['Constructors'][0]['name'] if season_stats.get('Constructors') else None
-                        }
-            
-            # Get next and previous drivers in standings
-            all_drivers = search_drivers(year)
-            if all_drivers:
-                # Sort drivers by position
-                sorted_drivers = sorted(all_drivers, key=lambda x: int(x.get('position', '999')))
-                
-                # Find the current driver in the list
-                current_index = next((i for i, d in enumerate(sorted_drivers) if d['id'] == driver_id), -1)
-                
-                if current_index != -1:
-                    # Get previous driver
-                    if current_index > 0:
-                        profile['prev_driver'] = {
-                            'id': sorted_drivers[current_index - 1]['id'],
-                            'name': sorted_drivers[current_index - 1]['name'],
-                            'position': sorted_drivers[current_index - 1]['position']
-                        }
-                    
-                    # Get next driver
-                    if current_index < len(sorted_drivers) - 1:
-                        profile['next_driver'] = {
-                            'id': sorted_drivers[current_index + 1]['id'],
-                            'name': sorted_drivers[current_index + 1]['name'],
-                            'position': sorted_drivers[current_index + 1]['position']
-                        }
+            # ONE STANDINGS INDEX PER SEASON AND DATA VERSION GIVES BOTH THE
+            # SEASON STATS AND THE PREV/NEXT DRIVERS WITHOUT A ROSTER FETCH
+            from app.services.standings_index import get_standings_index
+
+            standings = get_standings_index(year)
+            season_stats = standings.entry(driver_id) if standings else None
+            if season_stats:
+                profile['seasons'][year] = {
+                    'position': season_stats['position'],
+                    'points': season_stats['points'],
+                    'wins': season_stats['wins'],
+                    'constructor': season_stats['constructor']
+                }
+
+                # Get next and previous drivers in standings
+                ahead, behind = standings.neighbours(driver_id)
+                if ahead:
+                    profile['prev_driver'] = {'id': ahead['id'], 'name': ahead['name'], 'position': ahead['position']}
+                if behind:
+                    profile['next_driver'] = {'id': behind['id'], 'name': behind['name'], 'position': behind['position']}
         
         # Get career statistics only if requested
         if load_career_stats:
             # Check cache first for quick loading
-            cache_key = f"career_stats_{driver_id}"
-            cached_stats = _get_cache(cache_key, long_term=True)
+            cached_stats, _ = _cached_career_stats(driver_id)
             
             if cached_stats:
                 profile['careerStats'] = cached_stats
             else:
                 # Load basic stats if not all available yet
-                profile['careerStats'] = {
-                    'totalRaces': 0,
-                    'totalWins': 0,
-                    'totalPodiums': 0,
-                    'bestFinish': 'N/A',
-                    'firstRace': 'N/A',
-                    'lastRace': 'N/A'
-                }
+                profile['careerStats'] = _empty_career_stats()
             
         return profile
         
@@ -288,75 +566,86 @@ def get_driver_profile(driver_id: str, year: Optional[str] = None, load_career_s
         print(f"Error getting driver profile: {e}")
         return None
 
+# CAREER STATS ARE SHARED BY EVERY WORKER (AND SURVIVE RESTARTS) VIA THE TIERED CACHE
+_career_cache = CacheNamespace('career_stats',
+                               ttl=CACHE_POLICIES['career'].ttl + CACHE_POLICIES['career'].max_stale)
+
+def _cached_career_stats(driver_id: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """Career stats from the tiered cache, with their freshness"""
+    entry = _career_cache.get_entry(driver_id)
+    if entry is None:
+        return None, None
+    age = time.time() - entry.stored_at
+    return entry.value, 'fresh' if age < CACHE_POLICIES['career'].ttl else 'stale'
+
 def _get_driver_career_stats(driver_id: str) -> Dict:
     """
     # GET COMPLETE DRIVER CAREER STATISTICS
-    # FETCHES ALL SEASONS DATA FOR MORE ACCURATE RESULTS
+    # SERVES CACHED STATS (EVEN STALE ONES, REFRESHED IN THE BACKGROUND)
+    # FROM MEMORY, THEN FROM THE PERSISTENT STORE, AND ONLY COMPUTES THEM
+    # INLINE ON A TRUE MISS
+    """
+    cache_key = f"career_stats_{driver_id}"
+    cached_stats, state = _cached_career_stats(driver_id)
+    if state == 'stale':
+        _schedule_refresh(cache_key, _compute_driver_career_stats, driver_id)
+    if cached_stats:
+        return cached_stats
+    return _compute_driver_career_stats(driver_id)
+
+def _empty_career_stats() -> Dict:
+    """Career stats of a driver with no (known) results - the same keys as a computed set"""
+    return {
+        'totalRaces': 0,
+        'totalWins': 0,
+        'totalPodiums': 0,
+        'bestFinish': 'N/A',
+        'firstRace': 'N/A',
+        'lastRace': 'N/A'
+    }
+
+def _compute_driver_career_stats(driver_id: str) -> Dict:
+    """
+    # FETCH EVERY RESULT OF THE DRIVER'S CAREER IN ONE PAGINATED SWEEP
+    # (REMAINING PAGES CONCURRENTLY) AND AGGREGATE IN A SINGLE PASS
     """
     try:
-        # Check cache first for career stats (using long-term cache)
-        cache_key = f"career_stats_{driver_id}"
-        cached_stats = _get_cache(cache_key, long_term=True)
-        if cached_stats:
-            return cached_stats
-            
-        # First get all seasons the driver participated in
-        seasons_url = f"{API_BASE_URL}/drivers/{driver_id}/seasons.json"
-        seasons_data = _make_request(seasons_url)
-        
-        if not seasons_data or 'MRData' not in seasons_data:
-            return None
-            
-        seasons = seasons_data['MRData']['SeasonTable'].get('Seasons', [])
-        if not seasons:
-            return None
-            
+        races = _fetch_paginated(f"{API_BASE_URL}/drivers/{driver_id}/results.json", 'RaceTable', 'Races', 'Results')
+        if not races:
+            return _empty_career_stats()  # NOT CACHED, RETRIED NEXT TIME
+
         # Variables to track career stats
-        total_races = 0
+        total_races = len(races)
         total_wins = 0
         total_podiums = 0
         best_finish = 999
         first_race = None
         last_race = None
-        
-        # Get results for each season separately
-        for season in seasons:
-            season_year = season['season']
-            season_url = f"{API_BASE_URL}/{season_year}/drivers/{driver_id}/results.json"
-            season_data = _make_request(season_url)
-            
-            if not season_data or 'MRData' not in season_data:
-                continue
-                
-            races = season_data['MRData']['RaceTable'].get('Races', [])
-            if not races:
-                continue
-                
-            # Update stats for this season
-            total_races += len(races)
-            
-            for race in races:
-                for result in race.get('Results', []):
-                    position = result.get('position')
-                    if position == '1':
-                        total_wins += 1
-                    if position in ['1', '2', '3']:
-                        total_podiums += 1
-                    try:
-                        pos_int = int(position)
-                        best_finish = min(best_finish, pos_int)
-                    except (ValueError, TypeError):
-                        pass
-            
+
+        for race in races:
+            season_year = race.get('season')
+            for result in race.get('Results', []):
+                position = result.get('position')
+                if position == '1':
+                    total_wins += 1
+                if position in ['1', '2', '3']:
+                    total_podiums += 1
+                try:
+                    pos_int = int(position)
+                    best_finish = min(best_finish, pos_int)
+                except (ValueError, TypeError):
+                    pass
+
             # Track first and last season
-            if first_race is None or season_year < first_race:
-                first_race = season_year
-            if last_race is None or season_year > last_race:
-                last_race = season_year
-        
+            if season_year:
+                if first_race is None or season_year < first_race:
+                    first_race = season_year
+                if last_race is None or season_year > last_race:
+                    last_race = season_year
+
         # Format best finish (convert 999 to N/A if no valid positions were found)
         best_finish_str = str(best_finish) if best_finish < 999 else 'N/A'
-        
+
         career_stats = {
             'totalRaces': total_races,
             'totalWins': total_wins,
@@ -365,31 +654,39 @@ def _get_driver_career_stats(driver_id: str) -> Dict:
             'firstRace': first_race if first_race else 'N/A',
             'lastRace': last_race if last_race else 'N/A'
         }
-        
-        # Cache the results (long-term)
-        _set_cache(cache_key, career_stats, long_term=True)
-        
+
+        # Cache the results (long-term, shared with every worker)
+        _career_cache.set(driver_id, career_stats)
+
         return career_stats
-        
+
     except Exception as e:
         print(f"Error getting career statistics: {e}")
-        return {
-            'totalRaces': 0,
-            'totalWins': 0,
-            'totalPodiums': 0,
-            'bestFinish': 'N/A',
-            'firstRace': 'N/A',
-            'lastRace': 'N/A'
-        }
+        return _empty_career_stats()
+
+def _circuit(circuit: Dict):
+    """Shared circuit reference (with flag country code) for an API Circuit object"""
+    return circuit_ref(circuit, get_country_code(circuit.get('Location', {}).get('country', '')))
+
+def _race_record(race: Dict, record_type=RaceInfo) -> RaceInfo:
+    """Calendar fields of an API Race object as a RaceInfo (or subclass)"""
+    return record_type(race['season'], race['round'], race['raceName'], _circuit(race['Circuit']),
+                       race['date'], race.get('time'), race.get('url'))
 
-@lru_cache(maxsize=100)
-def get_driver_results(driver_id: str, year: str) -> List[Dict]:
+@memoize('driver_results', ttl=_cache_duration)
+def get_driver_results(driver_id: str, year: str) -> List[DriverRaceResult]:
     """
     Get race results for a specific driver in a specific season
+    Completed seasons are served from the local warehouse.
     """
+    from app.services import warehouse
+
     try:
+        if warehouse.is_available(year):
+            return warehouse.driver_results(driver_id, year)
+
         url = f"{API_BASE_URL}/{year}/drivers/{driver_id}/results.json"
-        data = _make_request(url)
+        data = _make_paginated_request(url, 'RaceTable', 'Races', 'Results')
         
         if not data or 'MRData' not in data:
             return []
@@ -406,25 +703,11 @@ def get_driver_results(driver_id: str, year: str) -> List[Dict]:
             
             result = race_results[0]  # There should be only one result per race for this driver
             
-            # Get country code
-            country = race['Circuit']['Location']['country']
-            country_code = get_country_code(country)
-            
-            result_info = {
-                'round': race['round'],
-                'raceName': race['raceName'],
-                'circuitName': race['Circuit']['circuitName'],
-                'date': race['date'],
-                'country': country,
-                'countryCode': country_code,
-                'grid': result.get('grid', 'N/A'),
-                'position': result.get('position', 'N/A'),
-                'points': result.get('points', '0'),
-                'status': result.get('status', 'Unknown'),
-                'constructor': result['Constructor']['name'] if 'Constructor' in result else 'Unknown'
-            }
-            
-            results.append(result_info)
+            results.append(DriverRaceResult(
+                race['round'], race['raceName'], _circuit(race['Circuit']), race['date'],
+                result.get('grid'), result.get('position'), result.get('points'), result.get('status'),
+                result['Constructor']['name'] if 'Constructor' in result else None
+            ))
         
         return results
     
@@ -436,19 +719,26 @@ def get_driver_results(driver_id: str, year: str) -> List[Dict]:
         print(f"Error getting races for season {year}: {e}")
         return []
 
-@lru_cache(maxsize=100)
-def get_race_results(year: str, round_number: str) -> Dict:
+@memoize('race_results', ttl=_cache_duration)
+def get_race_results(year: str, round_number: str) -> Union[RaceDetail, Dict]:
     """
     Get detailed results for a specific race.
     Args:
         year: The F1 season year
         round_number: The round number of the race
     Returns:
-        dict: Race details including results
+        RaceDetail: Race details including results ({} if unknown)
     """
+    from app.services import warehouse
+
     try:
+        if warehouse.is_available(year):
+            local = warehouse.race_results(year, round_number)
+            if local:
+                return local
+
         url = f"{API_BASE_URL}/{year}/{round_number}/results.json"
-        data = _make_request(url)
+        data = _make_paginated_request(url, 'RaceTable', 'Races', 'Results')
         
         if not data or 'MRData' not in data:
             return {}
@@ -457,7 +747,7 @@ def get_race_results(year: str, round_number: str) -> Dict:
         if not races:
             # Get race info from season if no results exist
             season_url = f"{API_BASE_URL}/{year}.json"
-            season_data = _make_request(season_url)
+            season_data = _make_paginated_request(season_url, 'RaceTable', 'Races')
             
             if season_data and 'MRData' in season_data:
                 all_races = season_data['MRData']['RaceTable'].get('Races', [])
@@ -465,6 +755,7 @@ def get_race_results(year: str, round_number: str) -> Dict:
                 
                 if future_races:
                     race = future_races[0]
+                    race_info = _race_record(race, RaceDetail)
                     # Format date for comparison
                     race_date = race['date']
                     race_time = race.get('time', '00:00:00Z')
@@ -474,81 +765,28 @@ def get_race_results(year: str, round_number: str) -> Dict:
                     try:
                         race_datetime = datetime.fromisoformat(race_datetime_str)
                         current_time = datetime.now()
-                        
-                        race_info = {
-                            'round': race['round'],
-                            'raceName': race['raceName'],
-                            'circuitName': race['Circuit']['circuitName'],
-                            'circuitId': race['Circuit']['circuitId'],
-                            'country': race['Circuit']['Location']['country'],
-                            'countryCode': get_country_code(race['Circuit']['Location']['country']),
-                            'locality': race['Circuit']['Location']['locality'],
-                            'date': race['date'],
-                            'time': race.get('time', ''),
-                            'url': race.get('url', ''),
-                            'season': race['season'],
-                            'isFutureRace': race_datetime > current_time,
-                            'raceDateTime': race_datetime.strftime('%Y-%m-%d %H:%M:%S UTC')
-                        }
-                        return race_info
+                        race_info.isFutureRace = race_datetime > current_time
+                        race_info.raceDateTime = race_datetime.strftime('%Y-%m-%d %H:%M:%S UTC')
                     except (ValueError, TypeError):
                         # If date parsing fails, just mark as future race
-                        race_info = {
-                            'round': race['round'],
-                            'raceName': race['raceName'],
-                            'circuitName': race['Circuit']['circuitName'],
-                            'circuitId': race['Circuit']['circuitId'],
-                            'country': race['Circuit']['Location']['country'],
-                            'countryCode': get_country_code(race['Circuit']['Location']['country']),
-                            'locality': race['Circuit']['Location']['locality'],
-                            'date': race['date'],
-                            'time': race.get('time', ''),
-                            'url': race.get('url', ''),
-                            'season': race['season'],
-                            'isFutureRace': True
-                        }
-                        return race_info
+                        race_info.isFutureRace = True
+                    return race_info
             
             return {}
         
         race = races[0]
-        race_info = {
-            'round': race['round'],
-            'raceName': race['raceName'],
-            'circuitName': race['Circuit']['circuitName'],
-            'circuitId': race['Circuit']['circuitId'],
-            'country': race['Circuit']['Location']['country'],
-            'countryCode': get_country_code(race['Circuit']['Location']['country']),
-            'locality': race['Circuit']['Location']['locality'],
-            'date': race['date'],
-            'time': race.get('time', ''),
-            'url': race.get('url', ''),
-            'season': race['season'],
-            'results': [],
-            'isFutureRace': False
-        }
+        race_info = _race_record(race, RaceDetail)
+        race_info.isFutureRace = False
+        race_info.results = []
         
         for result in race.get('Results', []):
-            driver = result['Driver']
-            constructor = result['Constructor']
-            
-            result_info = {
-                'position': result['position'],
-                'driverName': f"{driver['givenName']} {driver['familyName']}",
-                'driverId': driver['driverId'],
-                'driverCode': driver.get('code', ''),
-                'driverNumber': driver.get('permanentNumber', ''),
-                'constructorName': constructor['name'],
-                'constructorId': constructor['constructorId'],
-                'grid': result.get('grid', ''),
-                'laps': result.get('laps', ''),
-                'status': result.get('status', ''),
-                'points': result.get('points', '0'),
-                'time': result.get('Time', {}).get('time', '') if 'Time' in result else '',
-                'fastestLap': result.get('FastestLap', {}).get('rank', '') if 'FastestLap' in result else '',
-                'fastestLapTime': result.get('FastestLap', {}).get('Time', {}).get('time', '') if 'FastestLap' in result else ''
-            }
-            race_info['results'].append(result_info)
+            fastest_lap = result.get('FastestLap', {})
+            race_info.results.append(RaceResult(
+                result['position'], driver_ref(result['Driver']), constructor_ref(result['Constructor']),
+                result.get('grid'), result.get('laps'), result.get('status'), result.get('points'),
+                result.get('Time', {}).get('time', ''),
+                fastest_lap.get('rank', ''), fastest_lap.get('Time', {}).get('time', '')
+            ))
         
         return race_info
         
@@ -633,8 +871,8 @@ def get_country_code(country_name: str) -> str:
     
     return country_map.get(country_name, '')
 
-@lru_cache(maxsize=100)
-def get_races_by_season(year: str) -> List[Dict]:
+@memoize('races_by_season', ttl=_cache_duration)
+def get_races_by_season(year: str) -> List[RaceInfo]:
     """
     Get all races for a specific F1 season.
     Args:
@@ -642,9 +880,14 @@ def get_races_by_season(year: str) -> List[Dict]:
     Returns:
         list: A list of races with their basic information
     """
+    from app.services import warehouse
+
     try:
+        if warehouse.is_available(year):
+            return warehouse.races_for_season(year)
+
         url = f"{API_BASE_URL}/{year}.json"
-        data = _make_request(url)
+        data = _make_paginated_request(url, 'RaceTable', 'Races')
         
         if not data or 'MRData' not in data:
             return []
@@ -653,27 +896,7 @@ def get_races_by_season(year: str) -> List[Dict]:
         if not races:
             return []
         
-        race_list = []
-        for race in races:
-            country = race['Circuit']['Location']['country']
-            country_code = get_country_code(country)
-            
-            race_info = {
-                'round': race['round'],
-                'raceName': race['raceName'],
-                'circuitName': race['Circuit']['circuitName'],
-                'circuitId': race['Circuit']['circuitId'],
-                'country': country,
-                'countryCode': country_code,
-                'locality': race['Circuit']['Location']['locality'],
-                'date': race['date'],
-                'time': race.get('time', ''),
-                'url': race.get('url', ''),
-                'season': race['season']
-            }
-            race_list.append(race_info)
-        
-        return race_list
+        return [_race_record(race) for race in races]
     
     except Exception as e:
         print(f"Error getting races for season {year}: {e}")
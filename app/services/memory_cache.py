@@ -0,0 +1,171 @@
+"""
+# BOUNDED IN-PROCESS CACHE
+# TTL + LRU EVICTION WITH BYTE-SIZE ACCOUNTING. KEYS ARE SPREAD OVER
+# SEVERAL LOCK STRIPES SO REQUEST THREADS DON'T ALL QUEUE ON ONE LOCK;
+# EACH STRIPE OWNS AN EQUAL SHARE OF THE ENTRY AND BYTE BUDGETS.
+"""
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+    expires_at: float
+    size: int
+
+
+# CONTAINERS LONGER THAN THIS ARE SIZED FROM THEIR FIRST ITEMS, SCALED UP
+_SAMPLE = 8
+_MAX_DEPTH = 8
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Rough footprint of a cached value in serialised bytes, from its structure
+    alone (no encoding): strings count their length, scalars a few bytes, long
+    containers a sample of their items. Objects count their public attributes.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return 8
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value) + 2
+    if _depth >= _MAX_DEPTH:
+        return 64
+    if isinstance(value, dict):
+        items = len(value)
+        sample = sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+                     for k, v in islice(value.items(), _SAMPLE))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = len(value)
+        sample = sum(estimate_size(v, _depth + 1) for v in islice(value, _SAMPLE))
+    elif hasattr(value, '__dict__'):
+        attrs = {k: v for k, v in vars(value).items() if not k.startswith('_')}
+        return 16 + estimate_size(attrs, _depth + 1)
+    else:
+        return 64
+    if items > _SAMPLE:
+        sample = sample * items // _SAMPLE
+    return 2 + sample + items
+
+
+class _Stripe:
+    __slots__ = ('lock', 'entries', 'bytes', 'hits', 'misses', 'evictions', 'expirations')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class BoundedTTLCache:
+    """
+    THREAD-SAFE TTL + LRU CACHE BOUNDED BY ENTRY COUNT AND BYTES
+    TWO TTL TIERS: default_ttl FOR NORMAL DATA, long_ttl FOR RARELY CHANGING DATA
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, default_ttl: float,
+                 long_ttl: float, stripes: int = 16):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.long_ttl = long_ttl
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        self._stripe_bytes = max(1, max_bytes // stripes)
+        self._stripe_entries = max(1, max_entries // stripes)
+
+    def _stripe(self, key: str) -> _Stripe:
+        # CRC32 RATHER THAN hash() SO STRIPE PLACEMENT IS STABLE ACROSS WORKERS
+        return self._stripes[zlib.crc32(key.encode('utf-8')) % len(self._stripes)]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the live entry for a key (marking it recently used), or None"""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None:
+                stripe.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                del stripe.entries[key]
+                stripe.bytes -= entry.size
+                stripe.expirations += 1
+                stripe.misses += 1
+                return None
+            stripe.entries.move_to_end(key)
+            stripe.hits += 1
+            return entry
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            long_term: bool = False, stored_at: Optional[float] = None, size: Optional[int] = None):
+        """
+        Store a value. ttl overrides the tier picked by long_term; stored_at lets
+        callers keep the original fetch time of data loaded from elsewhere; size
+        skips the estimate when the caller already knows the encoded size.
+        """
+        stored_at = stored_at or time.time()
+        ttl = ttl if ttl is not None else (self.long_ttl if long_term else self.default_ttl)
+        size = size if size is not None else estimate_size(value)
+        entry = CacheEntry(value, stored_at, stored_at + ttl, size)
+
+        stripe = self._stripe(key)
+        with stripe.lock:
+            old = stripe.entries.pop(key, None)
+            if old is not None:
+                stripe.bytes -= old.size
+            if size > self._stripe_bytes:
+                # NEVER LET ONE HUGE PAYLOAD FLUSH A WHOLE STRIPE (NOR KEEP SERVING THE VALUE IT REPLACES)
+                return
+            stripe.entries[key] = entry
+            stripe.bytes += size
+            while stripe.entries and (stripe.bytes > self._stripe_bytes or
+                                      len(stripe.entries) > self._stripe_entries):
+                _, evicted = stripe.entries.popitem(last=False)
+                stripe.bytes -= evicted.size
+                stripe.evictions += 1
+
+    def pop(self, key: str):
+        """Remove a key if present"""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.pop(key, None)
+            if entry is not None:
+                stripe.bytes -= entry.size
+
+    def pop_prefix(self, prefix: str):
+        """Remove every key starting with prefix"""
+        for stripe in self._stripes:
+            with stripe.lock:
+                for key in [key for key in stripe.entries if key.startswith(prefix)]:
+                    stripe.bytes -= stripe.entries.pop(key).size
+
+    def clear(self):
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.bytes = 0
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def stats(self) -> Dict[str, int]:
+        """Aggregate hit/miss/eviction counters and current size"""
+        totals = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'entries': 0, 'bytes': 0}
+        for stripe in self._stripes:
+            with stripe.lock:
+                totals['hits'] += stripe.hits
+                totals['misses'] += stripe.misses
+                totals['evictions'] += stripe.evictions
+                totals['expirations'] += stripe.expirations
+                totals['entries'] += len(stripe.entries)
+                totals['bytes'] += stripe.bytes
+        totals['max_bytes'] = self.max_bytes
+        return totals
@@ -0,0 +1,257 @@
+"""
+# PROMETHEUS-STYLE METRICS
+# COUNTERS, GAUGES AND HISTOGRAMS KEPT IN PLAIN DICTS PER WORKER (ONE LOCK
+# ACQUIRE PER OBSERVATION ON THE HOT PATH). COUNTERS THAT OTHER MODULES
+# ALREADY KEEP (E.G. CACHE STATS) ARE READ BY COLLECTORS ONLY
+# WHEN A SNAPSHOT IS TAKEN.
+#
+# EACH WORKER WRITES A SNAPSHOT TO METRICS_DIR/<pid>.json AT MOST EVERY
+# METRICS_FLUSH_INTERVAL SECONDS; /metrics MERGES ALL OF THEM, SO A SCRAPE
+# SEES THE WHOLE GUNICORN POOL WHICHEVER WORKER ANSWERS IT. COUNTERS AND
+# HISTOGRAMS OF EXITED WORKERS ARE KEPT (THEY ARE MONOTONIC), THEIR GAUGES
+# ARE DROPPED.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+# SECONDS - COVERS CACHED PAGES (MS) UP TO UPSTREAM RETRIES WITH BACKOFF
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Metric:
+    type = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def samples(self) -> List[Tuple[tuple, object]]:
+        with self._lock:
+            return [(labels, list(value) if isinstance(value, list) else value)
+                    for labels, value in self._values.items()]
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """PER LABEL SET: [COUNT PER BUCKET ..., COUNT ABOVE THE LAST BUCKET, SUM]"""
+    type = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[slot] += 1
+            counts[-1] += value
+
+
+_registry = {}
+_collectors = []
+_registry_lock = threading.Lock()
+
+
+def _register(metric: _Metric) -> _Metric:
+    with _registry_lock:
+        return _registry.setdefault(metric.name, metric)
+
+
+def counter(name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    return _register(Counter(name, help_text, labelnames))
+
+
+def gauge(name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    return _register(Gauge(name, help_text, labelnames))
+
+
+def histogram(name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+              buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help_text, labelnames, buckets))
+
+
+def register_collector(fn: Callable[[], Iterable[_Metric]]):
+    """fn() returns metrics built from another module's own counters, read at snapshot time"""
+    with _registry_lock:
+        if fn not in _collectors:
+            _collectors.append(fn)
+
+
+# ---------------------------------------------------------------------------
+# SNAPSHOTS (ONE FILE PER WORKER)
+# ---------------------------------------------------------------------------
+
+def snapshot() -> Dict:
+    """This worker's metrics as a JSON-serialisable dict"""
+    metrics = list(_registry.values())
+    for collect in list(_collectors):
+        try:
+            metrics.extend(collect())
+        except Exception as e:
+            print(f"Metrics collector {getattr(collect, '__name__', collect)} failed: {e}")
+    out = {}
+    for metric in metrics:
+        entry = out.setdefault(metric.name, {
+            'type': metric.type, 'help': metric.help, 'labels': list(metric.labelnames), 'samples': []
+        })
+        if isinstance(metric, Histogram):
+            entry['buckets'] = list(metric.buckets)
+        entry['samples'].extend([list(labels), value] for labels, value in metric.samples())
+    return {'pid': os.getpid(), 'written_at': time.time(), 'metrics': out}
+
+
+_flushed_at = 0.0
+_flush_lock = threading.Lock()
+_flush_disabled = False
+
+
+def flush(force: bool = False):
+    """Write this worker's snapshot (at most every METRICS_FLUSH_INTERVAL unless forced)"""
+    global _flushed_at, _flush_disabled
+    if _flush_disabled or (not force and time.time() - _flushed_at < Config.METRICS_FLUSH_INTERVAL):
+        return
+    if not _flush_lock.acquire(blocking=force):
+        return  # ANOTHER THREAD IS ALREADY WRITING IT
+    try:
+        _flushed_at = time.time()
+        os.makedirs(Config.METRICS_DIR, exist_ok=True)
+        path = os.path.join(Config.METRICS_DIR, f"{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(snapshot(), f, separators=(',', ':'))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Metrics snapshots disabled, {Config.METRICS_DIR} not writable: {e}")
+        _flush_disabled = True
+    finally:
+        _flush_lock.release()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # EXISTS BUT NOT OURS
+    return True
+
+
+def _load_snapshots() -> List[Dict]:
+    if _flush_disabled:
+        return [snapshot()]
+    snapshots = []
+    try:
+        names = os.listdir(Config.METRICS_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(Config.METRICS_DIR, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # BEING REPLACED OR HALF WRITTEN - NEXT SCRAPE GETS IT
+    return snapshots or [snapshot()]
+
+
+def merge(snapshots: List[Dict]) -> Dict:
+    """Sum counters and histograms across workers; gauges only from live ones"""
+    merged = {}
+    for snap in snapshots:
+        live = snap.get('pid') == os.getpid() or _alive(snap.get('pid', 0))
+        for name, entry in snap['metrics'].items():
+            if entry['type'] == 'gauge' and not live:
+                continue
+            target = merged.setdefault(name, dict(entry, samples={}))
+            for labels, value in entry['samples']:
+                key = tuple(labels)
+                current = target['samples'].get(key)
+                if current is None:
+                    target['samples'][key] = value
+                elif isinstance(value, list):
+                    target['samples'][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target['samples'][key] = current + value
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# TEXT EXPOSITION FORMAT
+# ---------------------------------------------------------------------------
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: List[str], values: Iterable, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(merged: Dict) -> str:
+    lines = []
+    for name in sorted(merged):
+        entry = merged[name]
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        for labels, value in sorted(entry['samples'].items()):
+            if entry['type'] == 'histogram':
+                cumulative = 0
+                for bound, count in zip(entry['buckets'] + [float('inf')], value[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(entry['labels'], labels, ('le', _number(bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(entry['labels'], labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(entry['labels'], labels)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(entry['labels'], labels)} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def exposition(extra: Iterable[_Metric] = ()) -> str:
+    """Whole-pool metrics in Prometheus text format (extra = process-independent gauges)"""
+    flush(force=True)
+    extra_snapshot = {'pid': os.getpid(), 'metrics': {}}
+    for metric in extra:
+        extra_snapshot['metrics'][metric.name] = {
+            'type': metric.type, 'help': metric.help, 'labels': list(metric.labelnames),
+            'samples': [[list(labels), value] for labels, value in metric.samples()]
+        }
+    return render(merge(_load_snapshots() + [extra_snapshot]))
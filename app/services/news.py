@@ -1,10 +1,46 @@
 from newsapi import NewsApiClient
+from newsapi.newsapi_exception import NewsAPIException
 from datetime import datetime, timedelta
 import os
-from functools import lru_cache
+import threading
+from app.services.tiered_cache import memoize
+from app.services import metrics
 
 _news_service = None
 
+# NEWSAPI PLANS ARE METERED PER DAY - COUNT EVERY CALL WE MAKE AGAINST THE QUOTA
+NEWSAPI_REQUESTS = metrics.counter('f1nsight_newsapi_requests_total', 'NewsAPI calls by endpoint and outcome',
+                                   ('endpoint', 'outcome'))
+NEWSAPI_CALLS = metrics.counter('f1nsight_newsapi_calls_total', 'NewsAPI calls made, whatever their outcome')
+_today = {'day': None, 'calls': 0}
+_today_lock = threading.Lock()
+
+
+def _calls_today(count=0):
+    """Add count to this worker's calls for the current UTC day (starting over when the day changes)"""
+    day = datetime.utcnow().date()
+    with _today_lock:
+        if _today['day'] != day:
+            _today['day'], _today['calls'] = day, 0
+        _today['calls'] += count
+        return _today['calls']
+
+
+def _count_call():
+    _calls_today(1)
+    NEWSAPI_CALLS.inc()
+
+
+def _collect_metrics():
+    # ONE SERIES READ AT SNAPSHOT TIME, SO IT DROPS TO 0 AT MIDNIGHT EVEN IN AN IDLE WORKER;
+    # SUMMED OVER LIVE WORKERS IT'S TODAY'S SPEND OF f1nsight_newsapi_daily_quota
+    today = metrics.Gauge('f1nsight_newsapi_calls_today', 'NewsAPI calls made by this worker so far today (UTC)')
+    today.set(_calls_today())
+    return [today]
+
+
+metrics.register_collector(_collect_metrics)
+
 def get_news_service():
     global _news_service
     if _news_service is None:
@@ -29,7 +65,7 @@ class NewsService:
             raise ValueError("NEWS_API_KEY not found in environment variables")
         self.api = NewsApiClient(api_key=api_key)
 
-    @lru_cache(maxsize=32)
+    @memoize('news', ttl=CACHE_TTL, method=True)
     def get_f1_news(self, sources=None, page_size=30, page=1):
         """Get F1 news from specified sources with caching."""
         try:
@@ -59,7 +95,7 @@ class NewsService:
 
             # Try to get news using domains parameter
             try:
-                news_response = self.api.get_everything(
+                news_response = self._call('everything', self.api.get_everything,
                     q=query,
                     domains=domains,
                     from_param=from_date,
@@ -71,7 +107,7 @@ class NewsService:
             except Exception as api_error:
                 # FALLBACK SEARCH IF DOMAIN-SPECIFIC SEARCH FAILS
                 print(f"Domain-based search failed, trying general search: {api_error}")
-                news_response = self.api.get_top_headlines(
+                news_response = self._call('top_headlines', self.api.get_top_headlines,
                     q='Formula 1',
                     category='sports',
                     language='en',
@@ -96,6 +132,22 @@ class NewsService:
                 'message': str(e)
             }
     
+    def _call(self, endpoint, fn, **kwargs):
+        """Make one NewsAPI call, counting it (and its outcome) against the daily quota"""
+        _count_call()
+        try:
+            response = fn(**kwargs)
+        except NewsAPIException as e:
+            # E.G. rateLimited ONCE THE QUOTA IS GONE
+            error = e.get_exception()
+            NEWSAPI_REQUESTS.inc(endpoint, (error.get('code') if isinstance(error, dict) else None) or 'error')
+            raise
+        except Exception:
+            NEWSAPI_REQUESTS.inc(endpoint, 'error')
+            raise
+        NEWSAPI_REQUESTS.inc(endpoint, response.get('status', 'ok'))
+        return response
+
     def _filter_articles(self, articles, max_results=30):
         """
         Filter articles to remove irrelevant content and duplicates
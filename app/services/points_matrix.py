@@ -0,0 +1,134 @@
+"""
+# SEASON POINTS MATRIX
+# ONE DRIVERS x ROUNDS TABLE OF POINTS (GRAND PRIX + SPRINT) PER SEASON,
+# BUILT FROM THE PAGINATED SEASON-WIDE RESULTS AND SPRINT ENDPOINTS.
+# POINTS PROGRESSION FOR ANY DRIVER IS THEN A ROW SLICE, NO UPSTREAM CALLS.
+"""
+from array import array
+from datetime import datetime
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+from app.services.jolpica import API_BASE_URL, _fetch_paginated, get_races_by_season
+
+
+class SeasonPointsMatrix:
+    """
+    ROW-MAJOR POINTS TABLE: ONE ROW PER DRIVER, ONE COLUMN PER ROUND
+    """
+    __slots__ = ('year', 'rounds', 'race_names', 'driver_rows', 'driver_ids', 'points')
+
+    def __init__(self, year: int, rounds: List[int], race_names: List[str]):
+        self.year = year
+        self.rounds = rounds
+        self.race_names = race_names
+        self.driver_rows = {}   # FULL NAME -> ROW
+        self.driver_ids = {}    # DRIVER ID -> ROW
+        self.points = array('d')
+
+    @property
+    def latest_round(self) -> int:
+        return self.rounds[-1] if self.rounds else 0
+
+    def _row_for(self, name: str, driver_id: str) -> int:
+        row = self.driver_rows.get(name)
+        if row is None:
+            row = len(self.driver_rows)
+            self.driver_rows[name] = row
+            self.driver_ids[driver_id] = row
+            self.points.extend([0.0] * len(self.rounds))
+        return row
+
+    def add_points(self, name: str, driver_id: str, round_number: int, points: float, columns: Dict[int, int]):
+        column = columns.get(round_number)
+        if column is None:
+            return
+        row = self._row_for(name, driver_id)
+        self.points[row * len(self.rounds) + column] += points
+
+    def row(self, driver: str) -> List[float]:
+        """Per-round points for a driver (by full name or driverId); zeros if absent"""
+        row = self.driver_rows.get(driver.strip())
+        if row is None:
+            row = self.driver_ids.get(driver)
+        width = len(self.rounds)
+        if row is None:
+            return [0.0] * width
+        return self.points[row * width:(row + 1) * width].tolist()
+
+    def cumulative(self, driver: str) -> List[float]:
+        """Running points total after each round"""
+        return list(accumulate(self.row(driver)))
+
+    def progression(self, *drivers: str) -> Dict:
+        """
+        Points progression for any number of drivers in the shape the
+        compare view expects: {'races': [...], 'points': [...]} for one driver,
+        {'races': [...], 'drivers': {name: [...]}} for several.
+        """
+        if len(drivers) == 1:
+            return {'points': self.cumulative(drivers[0]), 'races': list(self.race_names)}
+        return {
+            'races': list(self.race_names),
+            'drivers': {driver: self.cumulative(driver) for driver in drivers}
+        }
+
+
+def _driver_name(driver: Dict) -> str:
+    return f"{driver.get('givenName', '')} {driver.get('familyName', '')}".strip()
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def build_season_points_matrix(year: int) -> Optional[SeasonPointsMatrix]:
+    """
+    Fetch a season's results and sprint results once and fold them into a
+    SeasonPointsMatrix. Columns are every calendar round that has either
+    happened or already has results, in round order. Completed seasons
+    are folded from the local warehouse.
+    """
+    from app.services import warehouse
+
+    if warehouse.is_available(year):
+        results = warehouse.season_results_as_ergast(year)
+        sprints = warehouse.season_results_as_ergast(year, sprint=True)
+    else:
+        results = _fetch_paginated(f"{API_BASE_URL}/{year}/results.json", 'RaceTable', 'Races', 'Results')
+        if results is None:
+            return None
+        sprints = _fetch_paginated(f"{API_BASE_URL}/{year}/sprint.json", 'RaceTable', 'Races', 'SprintResults') or []
+
+    calendar = {int(race['round']): race for race in get_races_by_season(str(year))}
+    now = datetime.now()
+    rounds = {int(race['round']) for race in results}
+    for round_number, race in calendar.items():
+        try:
+            if datetime.fromisoformat(race['date']) <= now:
+                rounds.add(round_number)
+        except (ValueError, TypeError, KeyError):
+            continue
+    rounds = sorted(rounds)
+
+    # PREFER THE SHORT LOCALITY FOR CHART LABELS
+    results_by_round = {int(race['round']): race for race in results}
+    race_names = []
+    for round_number in rounds:
+        race = calendar.get(round_number) or results_by_round.get(round_number, {})
+        locality = race.get('locality') or race.get('Circuit', {}).get('Location', {}).get('locality')
+        race_names.append(locality or race.get('raceName', f"Race {round_number}"))
+
+    matrix = SeasonPointsMatrix(year, rounds, race_names)
+    columns = {round_number: column for column, round_number in enumerate(rounds)}
+    for races, child_key in ((results, 'Results'), (sprints, 'SprintResults')):
+        for race in races:
+            round_number = int(race['round'])
+            for result in race.get(child_key, []):
+                driver = result.get('Driver', {})
+                matrix.add_points(_driver_name(driver), driver.get('driverId', ''), round_number,
+                                  _to_float(result.get('points', 0)), columns)
+    return matrix
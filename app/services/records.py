@@ -0,0 +1,344 @@
+"""
+# COMPACT RECORDS FOR CACHED RACE DATA
+# __slots__ CLASSES INSTEAD OF PER-ROW DICTS. DRIVERS, CONSTRUCTORS AND
+# CIRCUITS LIVE ONCE IN SHARED REFERENCE TABLES AND ROWS POINT AT THEM, SO
+# A NAME OR CIRCUIT IS STORED ONCE PER WORKER NO MATTER HOW MANY RESULTS
+# MENTION IT. SHORT STRINGS (IDS, POSITIONS, POINTS) ARE INTERNED.
+#
+# RECORDS BEHAVE LIKE THE DICTS THEY REPLACE FOR READERS: TEMPLATES USE
+# ATTRIBUTES, SERVICE CODE CAN USE record['key'] / record.get('key'), AND
+# to_dict() GIVES THE OLD DICT SHAPE FOR JSON RESPONSES.
+"""
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+def _s(value) -> Optional[str]:
+    """Intern a string field (None stays None)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """
+    BASE FOR ALL RECORDS. _fields LISTS THE PUBLIC KEYS (INCLUDING ONES
+    DERIVED FROM REFERENCES) IN THE ORDER to_dict() EMITS THEM.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def get(self, key: str, default=None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fields and hasattr(self, key)
+
+    def keys(self):
+        return [key for key in self._fields if hasattr(self, key)]
+
+    def to_dict(self) -> Dict:
+        """Plain dict view (nested records converted too)"""
+        out = {}
+        for key in self._fields:
+            try:
+                value = getattr(self, key)
+            except AttributeError:
+                continue
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [v.to_dict() if isinstance(v, Record) else v for v in value]
+            out[key] = value
+        return out
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Record) and self.to_dict() == other.to_dict()
+
+    __hash__ = object.__hash__
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+# ---------------------------------------------------------------------------
+# REFERENCE TABLES
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=1024)
+def _generate_driver_code(given_name: str, family_name: str) -> str:
+    """
+    Generate a driver code from their name when not provided by the API.
+    For historical drivers where code is not available.
+    """
+    # FOR SINGLE WORD NAMES, USE FIRST 3 LETTERS
+    if not given_name or not family_name:
+        full_name = (given_name or '') + (family_name or '')
+        return full_name[:3].upper() if full_name else ''
+
+    # Try to create a 3-letter code from initials and surname
+    if len(family_name) >= 2:
+        return family_name[:3].upper()
+
+    # Fallback: combine initials
+    return (given_name[0] + family_name[0]).upper()
+
+
+class DriverRef(Record):
+    __slots__ = ('id', 'name', 'givenName', 'familyName', 'apiCode', 'code', 'number',
+                 'nationality', 'dateOfBirth', 'wikiUrl')
+    _fields = ('id', 'name', 'nationality', 'dateOfBirth', 'wikiUrl', 'code', 'number')
+
+    def __init__(self, driver_id, given_name, family_name, code, number, nationality, date_of_birth, wiki_url):
+        self.id = _s(driver_id)
+        self.givenName = _s(given_name or '')
+        self.familyName = _s(family_name or '')
+        self.name = _s(f"{self.givenName} {self.familyName}".strip())
+        self.apiCode = _s(code or '')  # AS THE API HAS IT, MAY BE EMPTY
+        self.code = _s(code or _generate_driver_code(self.givenName, self.familyName))
+        self.number = _s(number or '')
+        self.nationality = _s(nationality or '')
+        self.dateOfBirth = _s(date_of_birth or '')
+        self.wikiUrl = wiki_url or ''
+
+    def __reduce__(self):
+        # UNPICKLED (E.G. FROM THE SHARED CACHE) BACK INTO THE SHARED TABLE
+        return _reintern_driver, (self.id, self.givenName, self.familyName, self.apiCode, self.number,
+                                  self.nationality, self.dateOfBirth, self.wikiUrl)
+
+
+class ConstructorRef(Record):
+    __slots__ = ('id', 'name')
+    _fields = ('id', 'name')
+
+    def __init__(self, constructor_id, name):
+        self.id = _s(constructor_id)
+        self.name = _s(name or '')
+
+    def __reduce__(self):
+        return _reintern_constructor, (self.id, self.name)
+
+
+class CircuitRef(Record):
+    __slots__ = ('id', 'name', 'locality', 'country', 'countryCode')
+    _fields = ('id', 'name', 'locality', 'country', 'countryCode')
+
+    def __init__(self, circuit_id, name, locality, country, country_code):
+        self.id = _s(circuit_id)
+        self.name = _s(name or '')
+        self.locality = _s(locality or '')
+        self.country = _s(country or '')
+        self.countryCode = _s(country_code or '')
+
+    def __reduce__(self):
+        return _reintern_circuit, (self.id, self.name, self.locality, self.country, self.countryCode)
+
+
+_drivers = {}
+_constructors = {}
+_circuits = {}
+_ref_lock = threading.Lock()
+
+
+def _intern_ref(table: Dict, key: str, factory):
+    ref = table.get(key)
+    if ref is None:
+        with _ref_lock:
+            ref = table.get(key)
+            if ref is None:
+                ref = table[key] = factory()
+    return ref
+
+
+def driver_ref(data: Dict) -> DriverRef:
+    """Shared DriverRef for an API Driver object"""
+    return _intern_ref(_drivers, data['driverId'], lambda: DriverRef(
+        data['driverId'], data.get('givenName'), data.get('familyName'), data.get('code'),
+        data.get('permanentNumber'), data.get('nationality'), data.get('dateOfBirth'), data.get('url')))
+
+
+def constructor_ref(data: Dict) -> ConstructorRef:
+    """Shared ConstructorRef for an API Constructor object"""
+    return _intern_ref(_constructors, data['constructorId'],
+                       lambda: ConstructorRef(data['constructorId'], data.get('name')))
+
+
+def circuit_ref(data: Dict, country_code: str = '') -> CircuitRef:
+    """Shared CircuitRef for an API Circuit object"""
+    location = data.get('Location', {})
+    return _intern_ref(_circuits, data['circuitId'], lambda: CircuitRef(
+        data['circuitId'], data.get('circuitName'), location.get('locality'), location.get('country'), country_code))
+
+
+def _reintern_driver(driver_id, *fields) -> DriverRef:
+    return _intern_ref(_drivers, driver_id, lambda: DriverRef(driver_id, *fields))
+
+
+def _reintern_constructor(constructor_id, name) -> ConstructorRef:
+    return _intern_ref(_constructors, constructor_id, lambda: ConstructorRef(constructor_id, name))
+
+
+def _reintern_circuit(circuit_id, *fields) -> CircuitRef:
+    return _intern_ref(_circuits, circuit_id, lambda: CircuitRef(circuit_id, *fields))
+
+
+def reference_counts() -> Dict[str, int]:
+    """Size of each shared reference table"""
+    return {'drivers': len(_drivers), 'constructors': len(_constructors), 'circuits': len(_circuits)}
+
+
+# ---------------------------------------------------------------------------
+# ROW RECORDS
+# ---------------------------------------------------------------------------
+
+class RaceInfo(Record):
+    """ONE CALENDAR ENTRY (get_races_by_season)"""
+    __slots__ = ('round', 'raceName', 'circuit', 'date', 'time', 'url', 'season')
+    _fields = ('round', 'raceName', 'circuitName', 'circuitId', 'country', 'countryCode', 'locality',
+               'date', 'time', 'url', 'season')
+
+    def __init__(self, season, round_number, race_name, circuit: CircuitRef, date, time, url):
+        self.season = _s(str(season))
+        self.round = _s(str(round_number))
+        self.raceName = _s(race_name)
+        self.circuit = circuit
+        self.date = _s(date)
+        self.time = _s(time or '')
+        self.url = url or ''
+
+    @property
+    def circuitName(self):
+        return self.circuit.name
+
+    @property
+    def circuitId(self):
+        return self.circuit.id
+
+    @property
+    def country(self):
+        return self.circuit.country
+
+    @property
+    def countryCode(self):
+        return self.circuit.countryCode
+
+    @property
+    def locality(self):
+        return self.circuit.locality
+
+
+class RaceDetail(RaceInfo):
+    """A RACE WITH ITS CLASSIFICATION (get_race_results)"""
+    __slots__ = ('results', 'isFutureRace', 'raceDateTime')
+    _fields = RaceInfo._fields + ('results', 'isFutureRace', 'raceDateTime')
+
+
+class RaceResult(Record):
+    """ONE CLASSIFIED DRIVER IN A RACE"""
+    __slots__ = ('position', 'driver', 'constructor', 'grid', 'laps', 'status', 'points', 'time',
+                 'fastestLap', 'fastestLapTime')
+    _fields = ('position', 'driverName', 'driverId', 'driverCode', 'driverNumber', 'constructorName',
+               'constructorId', 'grid', 'laps', 'status', 'points', 'time', 'fastestLap', 'fastestLapTime')
+
+    def __init__(self, position, driver: DriverRef, constructor: Optional[ConstructorRef], grid, laps, status,
+                 points, time, fastest_lap, fastest_lap_time):
+        self.position = _s(position)
+        self.driver = driver
+        self.constructor = constructor
+        self.grid = _s(grid or '')
+        self.laps = _s(laps or '')
+        self.status = _s(status or '')
+        self.points = _s(points or '0')
+        self.time = time or ''
+        self.fastestLap = _s(fastest_lap or '')
+        self.fastestLapTime = fastest_lap_time or ''
+
+    @property
+    def driverName(self):
+        return self.driver.name
+
+    @property
+    def driverId(self):
+        return self.driver.id
+
+    @property
+    def driverCode(self):
+        return self.driver.apiCode
+
+    @property
+    def driverNumber(self):
+        return self.driver.number
+
+    @property
+    def constructorName(self):
+        return self.constructor.name if self.constructor else ''
+
+    @property
+    def constructorId(self):
+        return self.constructor.id if self.constructor else ''
+
+
+class DriverRaceResult(Record):
+    """ONE RACE OF A DRIVER'S SEASON (get_driver_results)"""
+    __slots__ = ('round', 'raceName', 'circuit', 'date', 'grid', 'position', 'points', 'status', 'constructor')
+    _fields = ('round', 'raceName', 'circuitName', 'date', 'country', 'countryCode', 'grid', 'position',
+               'points', 'status', 'constructor')
+
+    def __init__(self, round_number, race_name, circuit: CircuitRef, date, grid, position, points, status,
+                 constructor):
+        self.round = _s(str(round_number))
+        self.raceName = _s(race_name)
+        self.circuit = circuit
+        self.date = _s(date)
+        self.grid = _s(grid or 'N/A')
+        self.position = _s(position or 'N/A')
+        self.points = _s(points or '0')
+        self.status = _s(status or 'Unknown')
+        self.constructor = _s(constructor or 'Unknown')
+
+    @property
+    def circuitName(self):
+        return self.circuit.name
+
+    @property
+    def country(self):
+        return self.circuit.country
+
+    @property
+    def countryCode(self):
+        return self.circuit.countryCode
+
+
+class DriverEntry(Record):
+    """
+    A DRIVER IN SEARCH RESULTS; SEASON ROSTERS ADD THE CHAMPIONSHIP STANDING,
+    ALL-HISTORY ENTRIES LEAVE THOSE FIELDS UNSET
+    """
+    __slots__ = ('driver', 'position', 'points', 'wins', 'constructor')
+    _fields = DriverRef._fields + ('position', 'points', 'wins', 'constructor')
+
+    def __init__(self, driver: DriverRef, position=None, points=None, wins=None, constructor=None,
+                 standing: bool = True):
+        self.driver = driver
+        if standing:
+            self.position = _s(position or '0')
+            self.points = _s(points or '0')
+            self.wins = _s(wins or '0')
+            self.constructor = _s(constructor)
+
+    def __getattr__(self, key):
+        # DRIVER FIELDS (id, name, code, ...) COME FROM THE SHARED REFERENCE
+        if key in DriverRef._fields:
+            return getattr(self.driver, key)
+        raise AttributeError(key)
@@ -0,0 +1,205 @@
+"""
+# SINGLE-FLIGHT REQUEST COALESCING
+# ONE IN-FLIGHT FETCH PER KEY. CONCURRENT CALLERS FOR THE SAME KEY WAIT ON
+# THE LEADER'S RESULT INSTEAD OF FIRING THEIR OWN IDENTICAL UPSTREAM CALL.
+#   - SingleFlight   : ACROSS THREADS (AND ASYNC TASKS) INSIDE ONE WORKER
+#   - process_lock() : ACROSS GUNICORN WORKERS ON THE SAME BOX (FILE LOCK)
+#   - ProcessLease   : LONG-HELD VERSION OF THE SAME LOCK, FOR ELECTING ONE
+#                      WORKER TO RUN A BACKGROUND JOB
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Tuple
+
+try:
+    import fcntl
+except ImportError:  # WINDOWS - NO CROSS-PROCESS LOCKING, THREAD LEVEL STILL WORKS
+    fcntl = None
+
+from config import Config
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    COALESCES CONCURRENT CALLS THAT SHARE A KEY
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for the same key is already running,
+        in which case wait for it and return (or raise) its outcome.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, coro_fn, *args, **kwargs):
+        """
+        do() for coroutines, sharing the same keys: a task leads by awaiting
+        coro_fn(*args, **kwargs), or waits (off the event loop) on whichever
+        thread or task already leads.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            await asyncio.get_running_loop().run_in_executor(None, call.done.wait)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = await coro_fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched"""
+        with self._lock:
+            return len(self._calls)
+
+
+@contextmanager
+def process_lock(key: str, timeout: float = None):
+    """
+    Hold an exclusive per-key file lock shared by every worker process.
+    Gives up waiting after `timeout` seconds and runs unlocked rather than
+    stalling the request (the caller re-checks the shared store either way).
+    The lock file is removed on release, so SINGLEFLIGHT_LOCK_DIR only
+    holds the files of keys being fetched right now.
+    """
+    if fcntl is None:
+        yield False
+        return
+
+    timeout = Config.SINGLEFLIGHT_LOCK_TIMEOUT if timeout is None else timeout
+    os.makedirs(Config.SINGLEFLIGHT_LOCK_DIR, exist_ok=True)
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    path = os.path.join(Config.SINGLEFLIGHT_LOCK_DIR, f"{name}.lock")
+
+    deadline = time.monotonic() + timeout
+    fd, acquired = _lock_file(path, deadline)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            # UNLINK WHILE STILL HOLDING IT: ANYONE QUEUED ON THIS FILE SEES IT'S GONE AND REOPENS
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def _lock_file(path: str, deadline: float) -> Tuple[int, bool]:
+    """Open and flock path, retrying until deadline; (fd, whether the lock is held)"""
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return fd, False
+                time.sleep(0.05)
+        # THE HOLDER WE WAITED ON MAY HAVE UNLINKED THE FILE; A LOCK ON A REMOVED FILE EXCLUDES NOBODY
+        try:
+            current = os.stat(path).st_ino == os.fstat(fd).st_ino
+        except FileNotFoundError:
+            current = False
+        if current:
+            return fd, True
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class ProcessLease:
+    """
+    NON-BLOCKING, LONG-HELD FILE LOCK. THE FIRST WORKER TO acquire() KEEPS IT
+    UNTIL release() OR EXIT (THE OS DROPS IT IF THE WORKER DIES), SO ANOTHER
+    WORKER'S NEXT acquire() TAKES OVER. SHARED BY EVERY PROCESS THAT SEES
+    SINGLEFLIGHT_LOCK_DIR, SO NODES NEED A SHARED LOCK DIR TO ELECT ONE LEADER.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._fd = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """Try to become (or stay) the holder; never blocks"""
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            # NO CROSS-PROCESS LOCKING - TREAT THE ONLY PROCESS AS THE HOLDER
+            self._fd = -1
+            return True
+
+        os.makedirs(Config.SINGLEFLIGHT_LOCK_DIR, exist_ok=True)
+        name = hashlib.sha1(self.key.encode('utf-8')).hexdigest()
+        fd = os.open(os.path.join(Config.SINGLEFLIGHT_LOCK_DIR, f"{name}.lease"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        if self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
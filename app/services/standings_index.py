@@ -0,0 +1,115 @@
+"""
+# STANDINGS RANK INDEX
+# ONE SEASON'S DRIVERS CHAMPIONSHIP AS A RANK-ORDERED ARRAY PLUS A
+# driverId -> RANK MAP, BUILT FROM ONE STANDINGS FETCH PER DATA VERSION
+# (LATEST COMPLETED ROUND). POSITION, SEASON STATS AND PREV/NEXT NEIGHBOUR
+# LOOKUPS FOR A DRIVER PROFILE ARE THEN O(1).
+"""
+from typing import Dict, List, Optional, Tuple
+
+from app.services.jolpica import API_BASE_URL, _fetch_paginated, get_latest_completed_round
+from app.services.singleflight import SingleFlight
+
+
+class StandingsRankIndex:
+    """
+    rows[rank] -> DRIVER ENTRY, ranks[driverId] -> rank (0 = CHAMPIONSHIP LEADER)
+    """
+    __slots__ = ('year', 'version', 'rows', 'ranks')
+
+    def __init__(self, year: str, version: int, rows: List[Dict]):
+        self.year = year
+        self.version = version
+        self.rows = sorted(rows, key=_position_order)
+        self.ranks = {row['id']: rank for rank, row in enumerate(self.rows)}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def rank(self, driver_id: str) -> Optional[int]:
+        return self.ranks.get(driver_id)
+
+    def entry(self, driver_id: str) -> Optional[Dict]:
+        """Position, points, wins and constructor for one driver"""
+        rank = self.ranks.get(driver_id)
+        return self.rows[rank] if rank is not None else None
+
+    def position(self, driver_id: str) -> Optional[str]:
+        entry = self.entry(driver_id)
+        return entry['position'] if entry else None
+
+    def neighbours(self, driver_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """The drivers directly ahead of and behind a driver in the standings"""
+        rank = self.ranks.get(driver_id)
+        if rank is None:
+            return None, None
+        ahead = self.rows[rank - 1] if rank > 0 else None
+        behind = self.rows[rank + 1] if rank + 1 < len(self.rows) else None
+        return ahead, behind
+
+
+def _position_order(row: Dict):
+    try:
+        return (int(row['position']), row['name'])
+    except (KeyError, ValueError, TypeError):
+        return (float('inf'), row['name'])
+
+
+def _load_rows(year: str) -> Optional[List[Dict]]:
+    from app.services import warehouse
+
+    if warehouse.is_available(year):
+        return [{
+            'id': s.driver_id,
+            'name': s.driver.full_name,
+            'position': s.position or s.position_text or '',
+            'points': s.points or '0',
+            'wins': s.wins or '0',
+            'constructor': s.constructor.name if s.constructor else None
+        } for s in warehouse.final_driver_standings(year)]
+
+    lists = _fetch_paginated(f"{API_BASE_URL}/{year}/driverStandings.json",
+                             'StandingsTable', 'StandingsLists', 'DriverStandings')
+    if lists is None:
+        return None
+    rows = []
+    for standing in (lists[0].get('DriverStandings', []) if lists else []):
+        try:
+            driver = standing['Driver']
+            rows.append({
+                'id': driver['driverId'],
+                'name': f"{driver['givenName']} {driver['familyName']}",
+                'position': standing.get('position') or standing.get('positionText', ''),
+                'points': standing.get('points', '0'),
+                'wins': standing.get('wins', '0'),
+                'constructor': standing['Constructors'][0]['name'] if standing.get('Constructors') else None
+            })
+        except (KeyError, IndexError):
+            continue
+    return rows
+
+
+_indexes = {}  # YEAR -> StandingsRankIndex (LATEST DATA VERSION ONLY)
+_builds = SingleFlight()
+
+
+def _build(year: str, version: int) -> Optional[StandingsRankIndex]:
+    rows = _load_rows(year)
+    if rows is None:
+        return None
+    index = StandingsRankIndex(year, version, rows)
+    _indexes[year] = index
+    return index
+
+
+def get_standings_index(year) -> Optional[StandingsRankIndex]:
+    """
+    The season's standings index, rebuilt only when a new round has results.
+    None if the standings couldn't be fetched.
+    """
+    year = str(year)
+    version = get_latest_completed_round(year)
+    index = _indexes.get(year)
+    if index is not None and index.version == version:
+        return index
+    return _builds.do((year, version), _build, year, version)
@@ -0,0 +1,638 @@
+"""
+# TIERED CACHE
+# ONE CACHE FOR THE WHOLE APP: A PER-WORKER IN-MEMORY L1 (BoundedTTLCache)
+# IN FRONT OF AN L2 EVERY GUNICORN WORKER SHARES (SQLITE FILE BY DEFAULT,
+# REDIS IF CACHE_L2_URL POINTS AT ONE). ENTRIES LIVE IN NAMESPACES WITH
+# THEIR OWN TTL; A VALUE COMPUTED BY ONE WORKER IS READ FROM L2 BY THE REST
+# INSTEAD OF EACH OF THEM REDOING THE WORK.
+#
+# COHERENCE: WRITES, DELETES AND NAMESPACE CLEARS ARE APPENDED TO A SHARED
+# INVALIDATION LOG. EVERY WORKER READS THE LOG AT MOST EVERY
+# CACHE_SYNC_INTERVAL SECONDS AND DROPS THE AFFECTED L1 ENTRIES, SO A
+# WORKER NEVER SERVES ITS OWN OLD COPY FOR LONGER THAN THAT.
+#
+# TRUST: L2 IS SHARED WITH EVERY WORKER (AND, WITH REDIS, EVERY HOST), SO A
+# PICKLED VALUE IS ONLY LOADED IF IT CARRIES AN HMAC OF SECRET_KEY. WITHOUT
+# A SECRET_KEY THE CACHE RUNS L1-ONLY. THE REDIS ENVELOPE AND INVALIDATION
+# LOG ARE PLAIN JSON.
+#
+#   memoize(namespace, ttl)  - DECORATOR, REPLACES functools.lru_cache
+#   CacheNamespace           - DIRECT get/set/delete/clear ACCESS
+#   FlaskTieredCache         - Flask-Caching BACKEND (CACHE_TYPE) ON THE SAME TIERS
+"""
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from flask_caching.backends.base import BaseCache
+
+from app.services import fallback, metrics, tracing
+from app.services.memory_cache import BoundedTTLCache, CacheEntry
+from app.services.singleflight import SingleFlight
+from config import Config
+
+# INVALIDATION LOG ROWS AND EXPIRED ENTRIES ARE PURGED THIS OFTEN
+_MAINTENANCE_INTERVAL = 300
+# INVALIDATIONS OLDER THAN THIS ARE DROPPED FROM THE LOG
+_LOG_RETENTION = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+_SIGNATURE_BYTES = hashlib.sha256().digest_size
+
+_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_invalidations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin INTEGER NOT NULL,
+    namespace TEXT NOT NULL,
+    key TEXT,
+    at REAL NOT NULL
+)
+"""
+
+
+# ---------------------------------------------------------------------------
+# L2 BACKENDS
+# ---------------------------------------------------------------------------
+
+class SQLiteBackend:
+    """
+    SHARED L2 IN A LOCAL SQLITE FILE. ONE CONNECTION PER THREAD, WAL JOURNAL
+    SO WORKERS CAN READ WHILE ANOTHER ONE WRITES (SAME SETUP AS THE
+    UPSTREAM RESPONSE STORE).
+    """
+    name = 'sqlite'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_LOG_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float, Optional[float]]]:
+        row = self._connection().execute(
+            'SELECT body, stored_at, expires_at FROM cache_entries WHERE namespace = ? AND key = ?',
+            (namespace, key)
+        ).fetchone()
+        if row is None or (row[2] is not None and row[2] <= time.time()):
+            return None
+        return row
+
+    def set(self, namespace: str, key: str, body: bytes, stored_at: float, expires_at: Optional[float]):
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (namespace, key, body, stored_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (namespace, key, sqlite3.Binary(body), stored_at, expires_at)
+            )
+
+    def delete(self, namespace: str, key: str):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM cache_entries WHERE namespace = ? AND key = ?', (namespace, key))
+
+    def clear(self, namespace: str):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM cache_entries WHERE namespace = ?', (namespace,))
+
+    def publish(self, origin: int, namespace: str, key: Optional[str]):
+        with self._connection() as conn:
+            conn.execute('INSERT INTO cache_invalidations (origin, namespace, key, at) VALUES (?, ?, ?, ?)',
+                         (origin, namespace, key, time.time()))
+
+    def invalidations(self, cursor: Optional[int]) -> Tuple[int, List[Tuple[int, str, Optional[str]]]]:
+        """Log rows after cursor as (new cursor, [(origin, namespace, key)]); None = start at the end"""
+        conn = self._connection()
+        if cursor is None:
+            return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM cache_invalidations').fetchone()[0], []
+        rows = conn.execute(
+            'SELECT seq, origin, namespace, key FROM cache_invalidations WHERE seq > ? ORDER BY seq', (cursor,)
+        ).fetchall()
+        if not rows:
+            return cursor, []
+        return rows[-1][0], [(origin, namespace, key) for _, origin, namespace, key in rows]
+
+    def size(self) -> Tuple[int, int]:
+        """(entries, bytes) currently stored"""
+        return tuple(self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM cache_entries').fetchone())
+
+    def maintain(self):
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute('DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+            conn.execute('DELETE FROM cache_invalidations WHERE at < ?', (now - _LOG_RETENTION,))
+
+
+class RedisBackend:
+    """
+    SHARED L2 IN REDIS (ANY SERVER SPEAKING THE PROTOCOL). ENTRIES ARE PLAIN
+    KEYS WITH A REDIS TTL; THE INVALIDATION LOG IS A SORTED SET SCORED BY A
+    SEQUENCE COUNTER.
+    """
+    name = 'redis'
+
+    def __init__(self, url: str, prefix: str = 'f1nsight:cache:'):
+        import redis  # OPTIONAL DEPENDENCY, ONLY NEEDED FOR redis:// URLS
+
+        self._redis = redis.Redis.from_url(url)
+        self._redis.ping()
+        self._prefix = prefix
+        self._log = prefix + '__log__'
+        self._seq = prefix + '__seq__'
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self._prefix}{namespace}:{key}"
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float, Optional[float]]]:
+        # STORED AS A JSON LINE [stored_at, expires_at] FOLLOWED BY THE (SIGNED) BODY
+        raw = self._redis.get(self._key(namespace, key))
+        if raw is None:
+            return None
+        header, _, body = raw.partition(b'\n')
+        stored_at, expires_at = json.loads(header)
+        return body, stored_at, expires_at
+
+    def set(self, namespace: str, key: str, body: bytes, stored_at: float, expires_at: Optional[float]):
+        ttl_ms = None if expires_at is None else max(1, int((expires_at - time.time()) * 1000))
+        header = json.dumps([stored_at, expires_at]).encode('utf-8')
+        self._redis.set(self._key(namespace, key), header + b'\n' + body, px=ttl_ms)
+
+    def delete(self, namespace: str, key: str):
+        self._redis.delete(self._key(namespace, key))
+
+    def clear(self, namespace: str):
+        keys = list(self._redis.scan_iter(match=self._key(namespace, '*'), count=500))
+        if keys:
+            self._redis.delete(*keys)
+
+    def publish(self, origin: int, namespace: str, key: Optional[str]):
+        seq = self._redis.incr(self._seq)
+        self._redis.zadd(self._log, {json.dumps([seq, origin, namespace, key, time.time()]): seq})
+
+    @staticmethod
+    def _log_row(raw: bytes) -> Optional[list]:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None  # NOT WRITTEN BY THIS VERSION
+
+    def invalidations(self, cursor: Optional[int]) -> Tuple[int, List[Tuple[int, str, Optional[str]]]]:
+        if cursor is None:
+            return int(self._redis.get(self._seq) or 0), []
+        raws = self._redis.zrangebyscore(self._log, f"({cursor}", '+inf', withscores=True)
+        if not raws:
+            return cursor, []
+        rows = [row for row in (self._log_row(raw) for raw, _ in raws) if row is not None]
+        return int(raws[-1][1]), [(origin, namespace, key) for _, origin, namespace, key, _ in rows]
+
+    def size(self) -> Tuple[int, int]:
+        entries = sum(1 for _ in self._redis.scan_iter(match=self._prefix + '*', count=500))
+        return entries, 0  # BYTES AREN'T CHEAPLY KNOWN, SEE INFO memory
+
+    def maintain(self):
+        cutoff = time.time() - _LOG_RETENTION
+        stale = []
+        for raw in self._redis.zrange(self._log, 0, -1):
+            row = self._log_row(raw)
+            if row is None or row[4] < cutoff:
+                stale.append(raw)
+        if stale:
+            self._redis.zrem(self._log, *stale)
+
+
+def _open_backend(url: str):
+    """L2 backend for CACHE_L2_URL; falls back to the default SQLite file if Redis can't be used"""
+    parts = urlsplit(url)
+    if parts.scheme in ('redis', 'rediss', 'unix'):
+        try:
+            return RedisBackend(url)
+        except Exception as e:
+            print(f"Redis cache backend unavailable ({e}), using SQLite")
+            url = _FALLBACK_L2_URL
+    return SQLiteBackend(url[len('sqlite:///'):] if url.startswith('sqlite:///') else url)
+
+
+# NEXT TO THE UPSTREAM RESPONSE STORE
+_FALLBACK_L2_URL = 'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(Config.UPSTREAM_STORE_PATH)),
+                                               'tiered_cache.db')
+
+
+def _sign(body: bytes) -> bytes:
+    return hmac.new(Config.SECRET_KEY.encode('utf-8'), body, hashlib.sha256).digest()
+
+
+def _seal(value: Any) -> bytes:
+    """Pickle a value for L2, prefixed with its HMAC"""
+    body = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return _sign(body) + body
+
+
+def _unseal(sealed: bytes) -> Any:
+    """Load a value written by _seal; ValueError (without unpickling) if the HMAC doesn't match"""
+    signature, body = sealed[:_SIGNATURE_BYTES], sealed[_SIGNATURE_BYTES:]
+    if not hmac.compare_digest(signature, _sign(body)):
+        raise ValueError('signature mismatch')
+    return pickle.loads(body)
+
+
+# ---------------------------------------------------------------------------
+# TIERS
+# ---------------------------------------------------------------------------
+
+class _NamespaceStats:
+    __slots__ = ('l1_hits', 'l2_hits', 'misses', 'sets', 'deletes', 'clears', 'l2_errors')
+
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, 0)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class TieredCache:
+    """
+    THE PROCESS-WIDE L1 + L2 PAIR. L1 KEYS ARE "namespace<US>key". L2 IS
+    OPENED ON FIRST USE; IF IT FAILS, THE CACHE RUNS L1-ONLY (AND SAYS SO).
+    """
+
+    def __init__(self, l2_url: str):
+        self.l1 = BoundedTTLCache(
+            max_bytes=Config.CACHE_L1_MAX_BYTES,
+            max_entries=Config.CACHE_L1_MAX_ENTRIES,
+            default_ttl=Config.CACHE_DEFAULT_TIMEOUT,
+            long_ttl=86400,
+        )
+        self._l2_url = l2_url
+        self._l2 = None
+        self._l2_failed = False
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._cursor = None
+        self._synced_at = 0.0
+        self._maintained_at = time.time()
+
+    @property
+    def l2(self):
+        if self._l2 is None and not self._l2_failed:
+            with self._lock:
+                if self._l2 is None and not self._l2_failed:
+                    if not Config.SECRET_KEY:
+                        print("Shared cache (L2) needs SECRET_KEY to sign its entries, caching per worker only")
+                        self._l2_failed = True
+                        return None
+                    try:
+                        self._l2 = _open_backend(self._l2_url)
+                    except Exception as e:
+                        print(f"Shared cache (L2) unavailable, caching per worker only: {e}")
+                        self._l2_failed = True
+        return self._l2
+
+    def stats_for(self, namespace: str) -> _NamespaceStats:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats.setdefault(namespace, _NamespaceStats())
+        return stats
+
+    # --- COHERENCE ---------------------------------------------------------
+
+    def sync(self, force: bool = False):
+        """Apply other workers' invalidations to L1 (at most every CACHE_SYNC_INTERVAL)"""
+        now = time.time()
+        if not force and now - self._synced_at < Config.CACHE_SYNC_INTERVAL:
+            return
+        l2 = self.l2
+        if l2 is None:
+            return
+        with self._lock:
+            if not force and now - self._synced_at < Config.CACHE_SYNC_INTERVAL:
+                return
+            self._synced_at = now
+            try:
+                self._cursor, rows = l2.invalidations(self._cursor)
+                if now - self._maintained_at > _MAINTENANCE_INTERVAL:
+                    self._maintained_at = now
+                    l2.maintain()
+            except Exception as e:
+                print(f"Shared cache sync failed: {e}")
+                return
+        pid = os.getpid()
+        for origin, namespace, key in rows:
+            if origin == pid:
+                continue
+            if key is None:
+                self.l1.pop_prefix(_l1_key(namespace, ''))
+            else:
+                self.l1.pop(_l1_key(namespace, key))
+
+    def _publish(self, namespace: str, key: Optional[str]):
+        try:
+            self.l2.publish(os.getpid(), namespace, key)
+        except Exception as e:
+            print(f"Shared cache invalidation for {namespace} failed: {e}")
+
+    # --- OPERATIONS --------------------------------------------------------
+
+    def get_entry(self, namespace: str, key: str, shared: bool) -> Optional[CacheEntry]:
+        stats = self.stats_for(namespace)
+        if shared:
+            self.sync()
+        entry = self.l1.get(_l1_key(namespace, key))
+        if entry is not None:
+            stats.l1_hits += 1
+            tracing.count('cache', 'l1')
+            return entry
+        l2 = self.l2 if shared else None
+        if l2 is not None:
+            try:
+                with tracing.span(f"l2 get {namespace}", 'l2'):
+                    row = l2.get(namespace, key)
+            except Exception as e:
+                stats.l2_errors += 1
+                print(f"Shared cache read of {namespace}:{key} failed: {e}")
+                row = None
+            if row is not None:
+                body, stored_at, expires_at = row
+                try:
+                    value = _unseal(bytes(body))
+                except Exception as e:
+                    print(f"Discarding unreadable cache entry {namespace}:{key}: {e}")
+                else:
+                    stats.l2_hits += 1
+                    tracing.count('cache', 'l2')
+                    # PROMOTE INTO L1 FOR THE REST OF ITS LIFETIME
+                    ttl = (expires_at - time.time()) if expires_at is not None else float('inf')
+                    self.l1.set(_l1_key(namespace, key), value, ttl=ttl, stored_at=stored_at, size=len(body))
+                    return self.l1.get(_l1_key(namespace, key)) or CacheEntry(value, stored_at, stored_at + ttl, 0)
+        stats.misses += 1
+        tracing.count('cache', 'miss')
+        return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float], shared: bool,
+            stored_at: Optional[float] = None):
+        stored_at = stored_at or time.time()
+        self.stats_for(namespace).sets += 1
+        l1_ttl = float('inf') if ttl is None else ttl
+        l2 = self.l2 if shared else None
+        if l2 is None:
+            self.l1.set(_l1_key(namespace, key), value, ttl=l1_ttl, stored_at=stored_at)
+            return
+        try:
+            body = _seal(value)
+        except Exception as e:
+            self.l1.set(_l1_key(namespace, key), value, ttl=l1_ttl, stored_at=stored_at)
+            print(f"Not sharing {namespace}:{key}, value can't be pickled: {e}")
+            return
+        # THE PICKLE IS MADE FOR L2 ANYWAY; ITS LENGTH SIZES THE L1 ENTRY
+        self.l1.set(_l1_key(namespace, key), value, ttl=l1_ttl, stored_at=stored_at, size=len(body))
+        try:
+            l2.set(namespace, key, body, stored_at, None if ttl is None else stored_at + ttl)
+        except Exception as e:
+            self.stats_for(namespace).l2_errors += 1
+            print(f"Shared cache write of {namespace}:{key} failed: {e}")
+            return
+        self._publish(namespace, key)
+
+    def delete(self, namespace: str, key: str, shared: bool):
+        self.stats_for(namespace).deletes += 1
+        self.l1.pop(_l1_key(namespace, key))
+        l2 = self.l2 if shared else None
+        if l2 is None:
+            return
+        try:
+            l2.delete(namespace, key)
+        except Exception as e:
+            print(f"Shared cache delete of {namespace}:{key} failed: {e}")
+        self._publish(namespace, key)
+
+    def clear(self, namespace: str, shared: bool):
+        self.stats_for(namespace).clears += 1
+        self.l1.pop_prefix(_l1_key(namespace, ''))
+        l2 = self.l2 if shared else None
+        if l2 is None:
+            return
+        try:
+            l2.clear(namespace)
+        except Exception as e:
+            print(f"Shared cache clear of {namespace} failed: {e}")
+        self._publish(namespace, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """L1 size/eviction counters, the L2 backend in use, and per-namespace hit rates"""
+        l2 = self.l2
+        return {
+            'l1': self.l1.stats(),
+            'l2': l2.name if l2 is not None else None,
+            'namespaces': {name: stats.to_dict() for name, stats in sorted(self._stats.items())},
+        }
+
+
+def _l1_key(namespace: str, key: str) -> str:
+    return f"{namespace}\x1f{key}"
+
+
+_tiered_cache = None
+_tiered_cache_lock = threading.Lock()
+
+
+def get_tiered_cache() -> TieredCache:
+    """Return the process wide tiered cache, creating it on first use"""
+    global _tiered_cache
+    if _tiered_cache is None:
+        with _tiered_cache_lock:
+            if _tiered_cache is None:
+                _tiered_cache = TieredCache(Config.CACHE_L2_URL or _FALLBACK_L2_URL)
+    return _tiered_cache
+
+
+class CacheNamespace:
+    """
+    A NAMED SLICE OF THE TIERED CACHE WITH ITS OWN DEFAULT TTL (None = NO
+    EXPIRY). shared=False KEEPS IT IN L1 ONLY, FOR DATA THAT ALREADY HAS A
+    SHARED STORE OF ITS OWN (E.G. RAW UPSTREAM RESPONSES).
+    """
+
+    def __init__(self, name: str, ttl: Optional[float] = None, shared: bool = True):
+        self.name = name
+        self.ttl = ttl
+        self.shared = shared
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """The live entry (value + stored_at) for a key, from L1 or L2, or None"""
+        return get_tiered_cache().get_entry(self.name, key, self.shared)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, stored_at: Optional[float] = None):
+        """Store a value; stored_at keeps the original fetch time of data loaded from elsewhere"""
+        get_tiered_cache().set(self.name, key, value, self.ttl if ttl is None else ttl, self.shared, stored_at)
+
+    def delete(self, key: str):
+        get_tiered_cache().delete(self.name, key, self.shared)
+
+    def clear(self):
+        """Drop every entry of the namespace, in this worker and (if shared) all others"""
+        get_tiered_cache().clear(self.name, self.shared)
+
+    def stats(self) -> Dict[str, int]:
+        return get_tiered_cache().stats_for(self.name).to_dict()
+
+
+def _collect_metrics():
+    # READ FROM THE CACHE'S OWN COUNTERS WHEN A METRICS SNAPSHOT IS TAKEN
+    cache = _tiered_cache
+    if cache is None:
+        return []
+    requests = metrics.Counter('f1nsight_cache_requests_total', 'Tiered cache lookups by namespace and result',
+                               ('namespace', 'result'))
+    writes = metrics.Counter('f1nsight_cache_writes_total', 'Tiered cache sets, deletes and namespace clears',
+                             ('namespace', 'op'))
+    errors = metrics.Counter('f1nsight_cache_l2_errors_total', 'Failed shared (L2) cache reads and writes',
+                             ('namespace',))
+    for name, stats in list(cache._stats.items()):
+        requests.inc(name, 'l1_hit', amount=stats.l1_hits)
+        requests.inc(name, 'l2_hit', amount=stats.l2_hits)
+        requests.inc(name, 'miss', amount=stats.misses)
+        writes.inc(name, 'set', amount=stats.sets)
+        writes.inc(name, 'delete', amount=stats.deletes)
+        writes.inc(name, 'clear', amount=stats.clears)
+        errors.inc(name, amount=stats.l2_errors)
+
+    l1 = cache.l1.stats()
+    evictions = metrics.Counter('f1nsight_cache_evictions_total', 'Entries evicted to stay within budget', ('layer',))
+    expirations = metrics.Counter('f1nsight_cache_expirations_total', 'Entries dropped on expiry', ('layer',))
+    entries = metrics.Gauge('f1nsight_cache_entries', 'Entries held per cache layer', ('layer',))
+    size = metrics.Gauge('f1nsight_cache_bytes', 'Approximate bytes held per cache layer', ('layer',))
+    evictions.inc('l1', amount=l1['evictions'])
+    expirations.inc('l1', amount=l1['expirations'])
+    entries.set(l1['entries'], 'l1')
+    size.set(l1['bytes'], 'l1')
+    return [requests, writes, errors, evictions, expirations, entries, size]
+
+
+metrics.register_collector(_collect_metrics)
+
+
+# ---------------------------------------------------------------------------
+# MEMOIZE (REPLACES functools.lru_cache)
+# ---------------------------------------------------------------------------
+
+_fills = SingleFlight()
+
+
+def _call_key(args: tuple, kwargs: Dict) -> str:
+    return repr((args, sorted(kwargs.items()))) if kwargs else repr(args)
+
+
+def memoize(namespace: str, ttl: Optional[float] = None, shared: bool = True, method: bool = False):
+    """
+    Cache a function's results in the tiered cache, keyed on its arguments
+    (method=True leaves self out of the key). None results aren't cached,
+    so a failed fetch is retried on the next call, and results built from a
+    fallback (last-known-good or missing upstream data) are only kept for
+    UPSTREAM_NEGATIVE_TTL. Concurrent misses for
+    the same arguments in one worker run the function once.
+    The wrapper keeps lru_cache's cache_clear() (now clearing every worker)
+    and adds cache_delete(*args, **kwargs) for a single entry.
+    """
+    cache = CacheNamespace(namespace, ttl, shared)
+
+    def decorator(fn):
+        def fill(key, args, kwargs):
+            with tracing.span(f"compute {namespace}"), fallback.watching() as report:
+                value = fn(*args, **kwargs)
+            if value is not None:
+                cache.set(key, value, ttl=Config.UPSTREAM_NEGATIVE_TTL if report else None)
+            return value
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = _call_key(args[1:] if method else args, kwargs)
+            entry = cache.get_entry(key)
+            if entry is not None:
+                return entry.value
+            return _fills.do((namespace, key), fill, key, args, kwargs)
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_delete = lambda *args, **kwargs: cache.delete(_call_key(args[1:] if method else args, kwargs))
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# FLASK-CACHING BACKEND
+# ---------------------------------------------------------------------------
+
+class FlaskTieredCache(BaseCache):
+    """
+    Flask-Caching backend (CACHE_TYPE = "app.services.tiered_cache.FlaskTieredCache")
+    storing @cache.memoize / @cache.cached entries in the "flask" namespace,
+    so they are shared across workers and delete_memoized reaches all of them.
+    """
+
+    def __init__(self, default_timeout: int = 300, namespace: str = 'flask'):
+        super().__init__(default_timeout)
+        self._cache = CacheNamespace(namespace, default_timeout)
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        return cls(*args, **kwargs)
+
+    def _ttl(self, timeout: Optional[int]) -> Optional[float]:
+        timeout = self._normalize_timeout(timeout)
+        return None if timeout == 0 else timeout  # 0 = NEVER EXPIRES
+
+    def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        # A VALUE COMPUTED WHILE THE REQUEST WAS ON FALLBACK DATA IS ONLY KEPT BRIEFLY
+        self._cache.set(key, value, ttl=fallback.cache_ttl(self._ttl(timeout)))
+        return True
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        if self.has(key):
+            return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key: str) -> bool:
+        self._cache.delete(key)
+        return True
+
+    def has(self, key: str) -> bool:
+        return self._cache.get_entry(key) is not None
+
+    def clear(self) -> bool:
+        self._cache.clear()
+        return True
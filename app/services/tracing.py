@@ -0,0 +1,310 @@
+"""
+# REQUEST-SCOPED TRACING
+# EACH REQUEST CARRIES A Trace IN A CONTEXT VARIABLE (SO IT FOLLOWS THE
+# REQUEST INTO FAN-OUT, PAGE-FETCH AND ASYNC WORKERS). UPSTREAM CALLS,
+# BACKOFF SLEEPS, CACHE LOOKUPS, DATABASE QUERIES AND TEMPLATE RENDERS ADD
+# THEIR COUNT AND TIME TO IT; THE TOTALS GO OUT AS A Server-Timing HEADER
+# (ON EVERY RESPONSE WITH SERVER_TIMING_ENABLED, ELSE ONLY TO X-Trace REQUESTS).
+#
+# A SAMPLED REQUEST (TRACE_SAMPLE_RATE, OR AN X-Trace: 1 HEADER WHEN
+# TRACE_HEADER_ENABLED) ALSO KEEPS THE SPAN TREE AND IS APPENDED AS ONE
+# JSON LINE TO TRACE_LOG_PATH. OUTSIDE A REQUEST EVERY HOOK IS A SINGLE
+# CONTEXT VARIABLE LOOKUP.
+"""
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import Config
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    __slots__ = ('name', 'category', 'start', 'end', 'attrs', 'children')
+
+    def __init__(self, name: str, category: Optional[str], attrs: Dict):
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.end = None
+        self.attrs = attrs
+        self.children = []
+
+    def to_dict(self, origin: float) -> Dict:
+        out = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round(((self.end or time.perf_counter()) - self.start) * 1000, 3),
+        }
+        if self.category:
+            out['category'] = self.category
+        if self.attrs:
+            out['attrs'] = self.attrs
+        if self.children:
+            out['children'] = [child.to_dict(origin) for child in self.children]
+        return out
+
+
+class Trace:
+    """
+    PER-REQUEST ACCOUNTING: totals[category] = [COUNT, SECONDS],
+    counts[category][key] = N, AND (IF SAMPLED) THE ROOT OF THE SPAN TREE
+    """
+    __slots__ = ('name', 'sampled', 'root', 'totals', 'counts', '_lock')
+
+    def __init__(self, name: str, sampled: bool):
+        self.name = name
+        self.sampled = sampled
+        self.root = Span(name, None, {})
+        self.totals = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float, count: int = 1):
+        with self._lock:
+            total = self.totals.get(category)
+            if total is None:
+                self.totals[category] = [count, seconds]
+            else:
+                total[0] += count
+                total[1] += seconds
+
+    def count(self, category: str, key: str):
+        with self._lock:
+            keys = self.counts.setdefault(category, {})
+            keys[key] = keys.get(key, 0) + 1
+
+    def attach(self, parent: Optional[Span], span: Span):
+        with self._lock:
+            (parent or self.root).children.append(span)
+
+    def calls(self, category: str) -> int:
+        total = self.totals.get(category)
+        return total[0] if total else 0
+
+    def elapsed(self) -> float:
+        return (self.root.end or time.perf_counter()) - self.root.start
+
+
+class _SpanContext:
+    """CONTEXT MANAGER RETURNED BY span(); A NO-OP WHEN NO TRACE IS ACTIVE"""
+    __slots__ = ('trace', 'span', 'category', 'start', 'token')
+
+    def __init__(self, trace: Optional[Trace], name: str, category: Optional[str], attrs: Dict):
+        self.trace = trace
+        self.category = category
+        self.span = None
+        self.token = None
+        if trace is not None and trace.sampled:
+            self.span = Span(name, category, attrs)
+
+    def __enter__(self) -> Optional[Span]:
+        if self.trace is None:
+            return None
+        if self.span is not None:
+            self.trace.attach(_current_span.get(), self.span)
+            self.token = _current_span.set(self.span)
+        self.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.trace is None:
+            return False
+        elapsed = time.perf_counter() - self.start
+        if self.category:
+            self.trace.add(self.category, elapsed)
+        if self.span is not None:
+            self.span.end = time.perf_counter()
+            if exc_type is not None:
+                self.span.attrs['error'] = exc_type.__name__
+            _current_span.reset(self.token)
+        return False
+
+
+def current() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def span(name: str, category: Optional[str] = None, **attrs) -> _SpanContext:
+    """
+    Time a block. Its duration is added to the request's total for category
+    (if given); in a sampled request it also becomes a node of the span tree.
+    """
+    return _SpanContext(_current_trace.get(), name, category, attrs)
+
+
+def record(category: str, seconds: float, count: int = 1):
+    """Add time measured elsewhere to the current request's totals"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(category, seconds, count)
+
+
+def count(category: str, key: str):
+    """Count an event without timing it (e.g. a cache hit)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.count(category, key)
+
+
+def bind(trace: Optional[Trace], parent: Optional[Span] = None):
+    """Make trace (and parent span) current in a context that didn't inherit them, e.g. an asyncio task"""
+    _current_trace.set(trace)
+    _current_span.set(parent)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+# ---------------------------------------------------------------------------
+# REQUEST LIFECYCLE
+# ---------------------------------------------------------------------------
+
+def start(name: str, sampled: bool) -> contextvars.Token:
+    return _current_trace.set(Trace(name, sampled))
+
+
+def finish(token: contextvars.Token) -> Optional[Trace]:
+    trace = _current_trace.get()
+    _current_trace.reset(token)
+    if trace is not None:
+        trace.root.end = time.perf_counter()
+    return trace
+
+
+def server_timing(trace: Trace) -> str:
+    """Server-Timing header value: one metric per category plus the total"""
+    parts = []
+    for category, (calls, seconds) in sorted(trace.totals.items()):
+        parts.append(f'{category};dur={seconds * 1000:.1f};desc="{calls} call{"s" if calls != 1 else ""}"')
+    for category, keys in sorted(trace.counts.items()):
+        desc = ' '.join(f"{key}={n}" for key, n in sorted(keys.items()))
+        parts.append(f'{category};desc="{desc}"')
+    parts.append(f'total;dur={trace.elapsed() * 1000:.1f}')
+    return ', '.join(parts)
+
+
+_log_lock = threading.Lock()
+
+
+def write_log(trace: Trace, **fields):
+    """Append a sampled trace as one JSON line to TRACE_LOG_PATH"""
+    entry = {
+        'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'pid': os.getpid(),
+        **fields,
+        'duration_ms': round(trace.elapsed() * 1000, 3),
+        'totals': {category: {'calls': calls, 'ms': round(seconds * 1000, 3)}
+                   for category, (calls, seconds) in trace.totals.items()},
+        'counts': trace.counts,
+        'spans': trace.root.to_dict(trace.root.start).get('children', []),
+    }
+    line = json.dumps(entry, separators=(',', ':'), default=str) + '\n'
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(Config.TRACE_LOG_PATH)), exist_ok=True)
+            with open(Config.TRACE_LOG_PATH, 'a') as f:
+                f.write(line)
+    except OSError as e:
+        print(f"Error writing trace log: {e}")
+
+
+_installed = False
+
+
+def init_request_tracing(app):
+    """Trace every request of app: Server-Timing header, per-route call counts, sampled trace log"""
+    global _installed
+    from flask import g, request, before_render_template, template_rendered
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app.services import metrics
+
+    upstream_calls = metrics.histogram('f1nsight_request_upstream_calls',
+                                       'Upstream HTTP attempts made while serving one request, by route',
+                                       ('route',), buckets=(0, 1, 2, 5, 10, 25, 50, 100))
+
+    @app.before_request
+    def _start_trace():
+        g.trace_requested = Config.TRACE_HEADER_ENABLED and request.headers.get('X-Trace') == '1'
+        sampled = g.trace_requested or random.random() < Config.TRACE_SAMPLE_RATE
+        g.trace_token = start(request.endpoint or request.path, sampled)
+
+    @app.after_request
+    def _report_trace(response):
+        trace = current()
+        if trace is None:
+            return response
+        if Config.SERVER_TIMING_ENABLED or g.get('trace_requested'):
+            response.headers['Server-Timing'] = server_timing(trace)
+        upstream_calls.observe(trace.calls('upstream'), request.endpoint or 'unmatched')
+        g.trace_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_trace(exc):
+        token = g.pop('trace_token', None)
+        if token is None:
+            return
+        trace = finish(token)
+        if trace is not None and trace.sampled:
+            write_log(trace, route=request.endpoint, method=request.method, path=request.full_path,
+                      status=g.pop('trace_status', 500))
+
+    def _template_started(sender, template, context, **extra):
+        renders = g.setdefault('trace_renders', [])
+        context_manager = span(f"render {template.name}", 'render')
+        context_manager.__enter__()
+        renders.append(context_manager)
+
+    def _template_finished(sender, template, context, **extra):
+        renders = g.get('trace_renders')
+        if renders:
+            renders.pop().__exit__(None, None, None)
+
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+
+    if _installed:
+        return
+    _installed = True
+
+    # EVERY ENGINE (APP DB AND WAREHOUSE); NO-OPS OUTSIDE A TRACED REQUEST.
+    # QUERIES ARE LEAVES, SO THEY ARE TIMED HERE RATHER THAN MADE CURRENT
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        if _current_trace.get() is not None:
+            conn.info.setdefault('trace_query_starts', []).append(time.perf_counter())
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        _finish_query(conn, statement)
+
+    @event.listens_for(Engine, 'handle_error')
+    def _query_failed(exception_context):
+        if exception_context.connection is not None:
+            _finish_query(exception_context.connection, exception_context.statement or '', failed=True)
+
+
+def _finish_query(conn, statement: str, failed: bool = False):
+    trace = _current_trace.get()
+    starts = conn.info.get('trace_query_starts')
+    if trace is None or not starts:
+        return
+    started = starts.pop()
+    trace.add('db', time.perf_counter() - started)
+    if trace.sampled:
+        query = Span('sql', 'db', {'statement': statement[:200]})
+        query.start = started
+        query.end = time.perf_counter()
+        if failed:
+            query.attrs['error'] = True
+        trace.attach(_current_span.get(), query)
@@ -0,0 +1,241 @@
+"""
+# SHARED UPSTREAM HTTP CLIENT
+# EVERY SERVICE THAT TALKS TO JOLPICA GOES THROUGH ONE POOLED CLIENT:
+#   - KEEP-ALIVE CONNECTION POOL (NO FRESH TLS HANDSHAKE PER CALL)
+#   - PER-HOST CONCURRENCY LIMIT
+#   - CONSISTENT (CONNECT, READ) TIMEOUTS
+#   - JITTERED EXPONENTIAL BACKOFF ON CONNECTION ERRORS, 429 AND 5XX
+#   - A RATE TOKEN FROM THE SHARED GOVERNOR BEFORE EVERY ATTEMPT
+#   - A CIRCUIT BREAKER PER ENDPOINT FAMILY (FAIL FAST DURING AN OUTAGE)
+#   - PER-ENDPOINT LATENCY COUNTERS (ALSO EXPORTED TO /metrics)
+"""
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.services import metrics, tracing
+from app.services.breaker import CircuitBreakers, CircuitOpen, get_circuit_breakers
+from app.services.governor import INTERACTIVE, RateGovernor, current_lane, get_rate_governor
+from config import Config
+
+# STATUS CODES WORTH ANOTHER ATTEMPT
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# ERGAST RESOURCE NAMES USED TO GROUP URLS INTO ENDPOINT FAMILIES
+_RESOURCES = {
+    'seasons', 'races', 'results', 'sprint', 'qualifying', 'driverstandings',
+    'constructorstandings', 'drivers', 'constructors', 'circuits', 'status',
+    'laps', 'pitstops'
+}
+
+
+UPSTREAM_LATENCY = metrics.histogram(
+    'f1nsight_upstream_request_duration_seconds', 'Jolpica HTTP attempts by endpoint family and outcome',
+    ('family', 'outcome'))
+UPSTREAM_RETRIES = metrics.counter(
+    'f1nsight_upstream_retries_total', 'Jolpica attempts repeated after a connection error, 429 or 5xx', ('family',))
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Collapse a Jolpica URL into its endpoint family, e.g.
+    /ergast/f1/2024/5/results.json -> 'results'
+    /ergast/f1/2024.json           -> 'races' (season calendar)
+    """
+    path = urlsplit(url).path.rstrip('/')
+    parts = [p.lower().rsplit('.json', 1)[0] for p in path.split('/') if p]
+    for part in reversed(parts):
+        if part in _RESOURCES:
+            return part
+    return 'races'
+
+
+class EndpointStats:
+    """Latency counters for a single endpoint family"""
+    __slots__ = ('count', 'errors', 'total_seconds', 'max_seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def to_dict(self) -> Dict:
+        avg = self.total_seconds / self.count if self.count else 0.0
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': round(avg * 1000, 2),
+            'max_ms': round(self.max_seconds * 1000, 2),
+        }
+
+
+class UpstreamClient:
+    """
+    POOLED HTTP CLIENT SHARED BY JOLPICA, DRIVERCHAMP AND CONSTRUCTORCHAMP
+    """
+
+    def __init__(self, pool_size: int = 10, max_per_host: int = 4,
+                 connect_timeout: float = 3.05, read_timeout: float = 10,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 8.0,
+                 governor: Optional[RateGovernor] = None, breakers: Optional[CircuitBreakers] = None,
+                 interactive_retries: int = 2, interactive_backoff_cap: float = 1.0):
+        self.timeout = (connect_timeout, read_timeout)
+        self.governor = governor
+        self.breakers = breakers
+        self.interactive_retries = interactive_retries
+        self.interactive_backoff_cap = interactive_backoff_cap
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        # RETRIES ARE HANDLED HERE, NOT BY URLLIB3, SO THEY CAN BE JITTERED AND COUNTED
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/json', 'User-Agent': 'f1nsight'})
+
+        self._host_slots = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _slots_for(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slots
+            return slots
+
+    def _record(self, family: str, elapsed: float, failed: bool, outcome: str):
+        with self._lock:
+            stats = self._stats.get(family)
+            if stats is None:
+                stats = self._stats[family] = EndpointStats()
+            stats.count += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if failed:
+                stats.errors += 1
+        UPSTREAM_LATENCY.observe(elapsed, family, outcome)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when given"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url: str, headers: Optional[Dict] = None, timeout=None) -> requests.Response:
+        """
+        GET a URL through the shared pool.
+        Returns the final response (which may still be an error status) with the
+        seconds spent waiting for rate tokens as response.queue_delay;
+        raises requests.exceptions.RequestException if every attempt failed to connect
+        (governor.RateLimited if no rate token came in time, breaker.CircuitOpen if the
+        endpoint family's circuit is open - neither is retried).
+        User (interactive lane) requests make at most interactive_retries attempts and
+        stop early once the circuit opens or the next backoff would exceed
+        interactive_backoff_cap, returning the last outcome.
+        """
+        family = endpoint_family(url)
+        slots = self._slots_for(url)
+        breaker = self.breakers.for_family(family) if self.breakers is not None else None
+        interactive = current_lane() == INTERACTIVE
+        attempts = max(1, min(self.max_retries, self.interactive_retries)) if interactive else self.max_retries
+        queued = 0.0
+
+        for attempt in range(attempts):
+            response = None
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpen(f"circuit for {family} is open (next probe in {breaker.retry_in():.0f}s)")
+            if self.governor is not None:
+                queued += self.governor.acquire()
+            start = time.perf_counter()
+            try:
+                with tracing.span(f"GET {family}", 'upstream', url=url, attempt=attempt) as span, slots:
+                    response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+                    if span is not None:
+                        span.attrs['status'] = response.status_code
+            except requests.exceptions.RequestException as e:
+                self._record(family, time.perf_counter() - start, True, type(e).__name__)
+                if breaker is not None:
+                    breaker.failure()
+                if attempt == attempts - 1:
+                    raise
+                error = e
+            else:
+                failed = response.status_code >= 400
+                self._record(family, time.perf_counter() - start, failed, str(response.status_code))
+                if breaker is not None:
+                    if response.status_code >= 500:
+                        breaker.failure()
+                    elif response.status_code != 429:
+                        breaker.success()
+                if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                    response.queue_delay = queued
+                    return response
+
+            delay = self._backoff(attempt, response)
+            if self.governor is not None and response is not None and response.status_code == 429:
+                # EVERY OTHER CALLER IN EVERY WORKER WAITS IT OUT TOO
+                self.governor.pause(delay)
+
+            # DON'T PARK A USER'S REQUEST THREAD IN A LONG SLEEP OR RETRY INTO AN OPEN CIRCUIT;
+            # THE CALLER FALLS BACK TO ITS LAST GOOD COPY INSTEAD
+            if (breaker is not None and breaker.is_open()) or (interactive and delay > self.interactive_backoff_cap):
+                if response is None:
+                    raise error
+                response.queue_delay = queued
+                return response
+
+            UPSTREAM_RETRIES.inc(family)
+            with tracing.span('backoff', 'backoff', family=family):
+                time.sleep(delay)
+
+        response.queue_delay = queued
+        return response
+
+    def get_json(self, url: str, timeout=None) -> Dict:
+        """GET a URL and decode its JSON body, raising for error statuses"""
+        response = self.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Snapshot of the per-endpoint latency counters"""
+        with self._lock:
+            return {family: stats.to_dict() for family, stats in self._stats.items()}
+
+
+_upstream_client = None
+_upstream_client_lock = threading.Lock()
+
+
+def get_upstream_client() -> UpstreamClient:
+    """Return the process wide upstream client, creating it on first use"""
+    global _upstream_client
+    if _upstream_client is None:
+        with _upstream_client_lock:
+            if _upstream_client is None:
+                _upstream_client = UpstreamClient(
+                    pool_size=Config.UPSTREAM_POOL_SIZE,
+                    max_per_host=Config.UPSTREAM_MAX_PER_HOST,
+                    connect_timeout=Config.UPSTREAM_CONNECT_TIMEOUT,
+                    read_timeout=Config.UPSTREAM_READ_TIMEOUT,
+                    max_retries=Config.UPSTREAM_MAX_RETRIES,
+                    governor=get_rate_governor(),
+                    breakers=get_circuit_breakers(),
+                    interactive_retries=Config.UPSTREAM_INTERACTIVE_MAX_RETRIES,
+                    interactive_backoff_cap=Config.UPSTREAM_INTERACTIVE_BACKOFF_CAP,
+                )
+    return _upstream_client
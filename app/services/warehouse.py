@@ -0,0 +1,546 @@
+"""
+# LOCAL F1 DATA WAREHOUSE
+# BULK-INGESTS JOLPICA SEASONS INTO THE INDEXED 'warehouse' DATABASE
+# (app/models/f1.py) AND ANSWERS THE SERVICE LAYER'S READS FOR SEASONS THAT
+# ARE FULLY LOADED, SO HISTORICAL PAGES NEVER NEED THE UPSTREAM API.
+# THE SEASON IN PROGRESS IS TOPPED UP ROUND BY ROUND (refresh_season), SO A
+# RACE WEEKEND COSTS A HANDFUL OF REQUESTS INSTEAD OF A FULL SEASON RE-PULL.
+#
+# READ FUNCTIONS RETURN EXACTLY THE SHAPES THE jolpica / driverChamp /
+# constructorChamp FUNCTIONS RETURN, SO CALLERS CAN USE EITHER SOURCE.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+from flask import current_app, has_app_context
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models.f1 import (Season, Circuit, Driver, Constructor, Race, Result, SprintResult,
+                           QualifyingResult, DriverStanding, ConstructorStanding, SyncState)
+from app.services import fallback
+from app.services.jolpica import (API_BASE_URL, _fetch_paginated, _fetch_latest_round, _schedule_refresh,
+                                  get_country_code)
+from app.services.records import (CircuitRef, DriverRef, DriverEntry, DriverRaceResult, RaceDetail, RaceInfo,
+                                  RaceResult, circuit_ref, constructor_ref, driver_ref)
+from app.services.singleflight import process_lock
+from config import Config
+
+# PER-ROUND TABLES, REPLACED TOGETHER WHEN A ROUND IS (RE)INGESTED
+_ROUND_MODELS = (Result, SprintResult, QualifyingResult, DriverStanding, ConstructorStanding)
+
+
+class SyncError(Exception):
+    """Raised when a season can't be fetched completely from upstream"""
+
+
+# ---------------------------------------------------------------------------
+# INGESTION
+# ---------------------------------------------------------------------------
+
+def _fetch_live(url: str, table_key: str, list_key: str, child_key: Optional[str] = None) -> Optional[List[Dict]]:
+    """_fetch_paginated, but None instead of a last-known-good fallback - the warehouse only ingests live data"""
+    with fallback.watching() as report:
+        rows = _fetch_paginated(url, table_key, list_key, child_key)
+    return None if report.stale else rows
+
+
+def _fetch_season_payloads(year: int) -> Dict[str, List[Dict]]:
+    """Fetch every resource of a season through the paginated fetch layer"""
+    base = f"{API_BASE_URL}/{year}"
+    resources = {
+        'races': (f"{base}.json", 'RaceTable', 'Races', None),
+        'drivers': (f"{base}/drivers.json", 'DriverTable', 'Drivers', None),
+        'constructors': (f"{base}/constructors.json", 'ConstructorTable', 'Constructors', None),
+        'results': (f"{base}/results.json", 'RaceTable', 'Races', 'Results'),
+        # SPRINTS, EARLY QUALIFYING AND PRE-1958 CONSTRUCTOR STANDINGS SIMPLY DON'T EXIST - UPSTREAM
+        # ANSWERS WITH AN EMPTY TABLE, WHICH IS KEPT; A FAILED OR STALE FETCH MUST NOT LOOK THE SAME
+        'sprints': (f"{base}/sprint.json", 'RaceTable', 'Races', 'SprintResults'),
+        'qualifying': (f"{base}/qualifying.json", 'RaceTable', 'Races', 'QualifyingResults'),
+        'driver_standings': (f"{base}/driverStandings.json", 'StandingsTable', 'StandingsLists', 'DriverStandings'),
+        'constructor_standings': (f"{base}/constructorStandings.json", 'StandingsTable', 'StandingsLists', 'ConstructorStandings'),
+    }
+
+    payloads = {}
+    for name, args in resources.items():
+        rows = _fetch_live(*args)
+        if rows is None:
+            raise SyncError(f"could not fetch {name} for {year}")
+        payloads[name] = rows
+    return payloads
+
+
+def _fetch_round_payloads(year: int, round_number: int) -> Optional[Dict[str, List[Dict]]]:
+    """
+    Fetch one round's results, sprint, qualifying and standings-after-round.
+    None if the round isn't fully published yet (no results or no driver
+    standings) or a request failed, so the caller can retry it later.
+    """
+    base = f"{API_BASE_URL}/{year}/{round_number}"
+    resources = {
+        'results': (f"{base}/results.json", 'RaceTable', 'Races', 'Results'),
+        'sprints': (f"{base}/sprint.json", 'RaceTable', 'Races', 'SprintResults'),
+        'qualifying': (f"{base}/qualifying.json", 'RaceTable', 'Races', 'QualifyingResults'),
+        'driver_standings': (f"{base}/driverStandings.json", 'StandingsTable', 'StandingsLists', 'DriverStandings'),
+        'constructor_standings': (f"{base}/constructorStandings.json", 'StandingsTable', 'StandingsLists', 'ConstructorStandings'),
+    }
+
+    payloads = {}
+    for name, args in resources.items():
+        rows = _fetch_live(*args)
+        if rows is None:
+            return None
+        payloads[name] = rows
+    if not payloads['results'] or not payloads['driver_standings']:
+        return None
+    return payloads
+
+
+class _Ingest:
+    """
+    UPSERTS REFERENCE ROWS (CIRCUITS, DRIVERS, CONSTRUCTORS) ONCE PER SYNC
+    AND APPENDS PER-ROUND ROWS TO THE CURRENT SESSION
+    """
+
+    def __init__(self):
+        self._seen = set()
+
+    def circuit(self, data: Dict):
+        key = ('circuit', data['circuitId'])
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        location = data.get('Location', {})
+        db.session.merge(Circuit(circuit_id=data['circuitId'], name=data.get('circuitName', ''),
+                                 locality=location.get('locality'), country=location.get('country'),
+                                 url=data.get('url')))
+
+    def driver(self, data: Dict):
+        key = ('driver', data['driverId'])
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        db.session.merge(Driver(driver_id=data['driverId'], given_name=data.get('givenName', ''),
+                                family_name=data.get('familyName', ''), code=data.get('code'),
+                                permanent_number=data.get('permanentNumber'),
+                                nationality=data.get('nationality'), date_of_birth=data.get('dateOfBirth'),
+                                url=data.get('url')))
+
+    def constructor(self, data: Dict):
+        key = ('constructor', data['constructorId'])
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        db.session.merge(Constructor(constructor_id=data['constructorId'], name=data.get('name', ''),
+                                     nationality=data.get('nationality'), url=data.get('url')))
+
+    def race(self, data: Dict):
+        self.circuit(data['Circuit'])
+        db.session.add(Race(season=int(data['season']), round=int(data['round']),
+                            race_name=data['raceName'], circuit_id=data['Circuit']['circuitId'],
+                            date=data.get('date'), time=data.get('time'), url=data.get('url')))
+
+    def results(self, race: Dict):
+        season, round_number = int(race['season']), int(race['round'])
+        for r in race.get('Results', []):
+            self.driver(r['Driver'])
+            constructor = r.get('Constructor')
+            if constructor:
+                self.constructor(constructor)
+            fastest = r.get('FastestLap', {})
+            db.session.add(Result(
+                season=season, round=round_number, driver_id=r['Driver']['driverId'],
+                constructor_id=constructor['constructorId'] if constructor else None,
+                number=r.get('number'), position=r.get('position'), position_text=r.get('positionText'),
+                points=_to_float(r.get('points')), grid=r.get('grid'), laps=r.get('laps'),
+                status=r.get('status'), time=r.get('Time', {}).get('time'),
+                fastest_lap_rank=fastest.get('rank'), fastest_lap_time=fastest.get('Time', {}).get('time')))
+
+    def sprint_results(self, race: Dict):
+        season, round_number = int(race['season']), int(race['round'])
+        for r in race.get('SprintResults', []):
+            self.driver(r['Driver'])
+            constructor = r.get('Constructor')
+            if constructor:
+                self.constructor(constructor)
+            db.session.add(SprintResult(
+                season=season, round=round_number, driver_id=r['Driver']['driverId'],
+                constructor_id=constructor['constructorId'] if constructor else None,
+                position=r.get('position'), points=_to_float(r.get('points')), grid=r.get('grid'),
+                laps=r.get('laps'), status=r.get('status'), time=r.get('Time', {}).get('time')))
+
+    def qualifying(self, race: Dict):
+        season, round_number = int(race['season']), int(race['round'])
+        for q in race.get('QualifyingResults', []):
+            self.driver(q['Driver'])
+            constructor = q.get('Constructor')
+            if constructor:
+                self.constructor(constructor)
+            db.session.add(QualifyingResult(
+                season=season, round=round_number, driver_id=q['Driver']['driverId'],
+                constructor_id=constructor['constructorId'] if constructor else None,
+                position=q.get('position'), q1=q.get('Q1'), q2=q.get('Q2'), q3=q.get('Q3')))
+
+    def driver_standings(self, standings_list: Dict):
+        season, round_number = int(standings_list['season']), int(standings_list['round'])
+        for s in standings_list.get('DriverStandings', []):
+            self.driver(s['Driver'])
+            constructors = s.get('Constructors') or []
+            for constructor in constructors:
+                self.constructor(constructor)
+            db.session.add(DriverStanding(
+                season=season, round=round_number, driver_id=s['Driver']['driverId'],
+                constructor_id=constructors[0]['constructorId'] if constructors else None,
+                position=s.get('position'), position_text=s.get('positionText'),
+                points=s.get('points'), wins=s.get('wins')))
+
+    def constructor_standings(self, standings_list: Dict):
+        season, round_number = int(standings_list['season']), int(standings_list['round'])
+        for s in standings_list.get('ConstructorStandings', []):
+            self.constructor(s['Constructor'])
+            db.session.add(ConstructorStanding(
+                season=season, round=round_number, constructor_id=s['Constructor']['constructorId'],
+                position=s.get('position'), position_text=s.get('positionText'),
+                points=s.get('points'), wins=s.get('wins')))
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _season_finished(year: int, rounds, held) -> bool:
+    """A season is complete once it's in the past and every round has results"""
+    if year >= datetime.now().year:
+        return False
+    return set(rounds) <= set(held)
+
+
+def sync_season(year: int, force: bool = False) -> SyncState:
+    """
+    Ingest one whole season in a single transaction (replacing whatever was
+    stored for it). Complete seasons are skipped unless force is set, which
+    makes a full-history sync resumable; seasons already partly held are
+    topped up round by round with refresh_season.
+    """
+    state = db.session.get(SyncState, year)
+    if state and not force:
+        return state if state.complete else refresh_season(year)
+
+    payloads = _fetch_season_payloads(year)
+    ingest = _Ingest()
+    try:
+        for model in (Race,) + _ROUND_MODELS:
+            model.query.filter_by(season=year).delete()
+
+        db.session.merge(Season(year=year, url=None))
+        for driver in payloads['drivers']:
+            ingest.driver(driver)
+        for constructor in payloads['constructors']:
+            ingest.constructor(constructor)
+        for race in payloads['races']:
+            ingest.race(race)
+        for race in payloads['results']:
+            ingest.results(race)
+        for race in payloads['sprints']:
+            ingest.sprint_results(race)
+        for race in payloads['qualifying']:
+            ingest.qualifying(race)
+        for standings_list in payloads['driver_standings']:
+            ingest.driver_standings(standings_list)
+        for standings_list in payloads['constructor_standings']:
+            ingest.constructor_standings(standings_list)
+
+        state = state or SyncState(season=year)
+        state.last_round = max((int(r['round']) for r in payloads['results']), default=0)
+        state.total_rounds = len(payloads['races'])
+        state.complete = _season_finished(year, {int(r['round']) for r in payloads['races']},
+                                          {int(r['round']) for r in payloads['results']})
+        state.synced_at = datetime.now()
+        db.session.add(state)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+    return state
+
+
+def _merge_calendar(year: int, calendar: List[Dict], ingest: _Ingest):
+    """Upsert the season's races; drop rounds cancelled before they were run"""
+    existing = {race.round: race for race in Race.query.filter_by(season=year).all()}
+    for data in calendar:
+        race = existing.pop(int(data['round']), None)
+        if race is None:
+            ingest.race(data)
+            continue
+        ingest.circuit(data['Circuit'])
+        race.race_name = data['raceName']
+        race.circuit_id = data['Circuit']['circuitId']
+        race.date, race.time, race.url = data.get('date'), data.get('time'), data.get('url')
+    for race in existing.values():
+        if not Result.query.filter_by(season=year, round=race.round).first():
+            db.session.delete(race)
+
+
+def _merge_round(state: SyncState, year: int, round_number: int, payloads: Dict[str, List[Dict]]):
+    """Replace one round's rows and advance the held round in one transaction"""
+    ingest = _Ingest()
+    try:
+        for model in _ROUND_MODELS:
+            model.query.filter_by(season=year, round=round_number).delete()
+        for race in payloads['results']:
+            ingest.results(race)
+        for race in payloads['sprints']:
+            ingest.sprint_results(race)
+        for race in payloads['qualifying']:
+            ingest.qualifying(race)
+        for standings_list in payloads['driver_standings']:
+            ingest.driver_standings(standings_list)
+        for standings_list in payloads['constructor_standings']:
+            ingest.constructor_standings(standings_list)
+        state.last_round = max(state.last_round, round_number)
+        state.synced_at = datetime.now()
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
+def refresh_season(year: int) -> SyncState:
+    """
+    Incrementally top up a season that's already in the warehouse: refresh
+    the calendar, then fetch and merge only the rounds completed since the
+    last held round. Each round is committed on its own, so an interrupted
+    refresh resumes from the first missing round and re-running is a no-op.
+    """
+    with process_lock(f"warehouse-refresh:{year}"):
+        # ANOTHER WORKER MAY HAVE REFRESHED WHILE WE WAITED FOR THE LOCK
+        db.session.expire_all()
+        state = db.session.get(SyncState, year)
+        if state is None:
+            return sync_season(year)
+        if state.complete:
+            return state
+
+        calendar = _fetch_paginated(f"{API_BASE_URL}/{year}.json", 'RaceTable', 'Races')
+        if calendar is None:
+            raise SyncError(f"could not fetch the {year} calendar")
+        latest = _fetch_latest_round(year)
+
+        try:
+            _merge_calendar(year, calendar, _Ingest())
+            state.total_rounds = len(calendar)
+            state.synced_at = datetime.now()
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            raise
+
+        rounds = sorted(int(race['round']) for race in calendar)
+        for round_number in rounds:
+            if round_number <= state.last_round or round_number > latest:
+                continue
+            payloads = _fetch_round_payloads(year, round_number)
+            if payloads is None:
+                # NOT FULLY PUBLISHED YET - PICK UP FROM HERE NEXT TIME
+                break
+            _merge_round(state, year, round_number, payloads)
+
+        if _season_finished(year, rounds, range(1, state.last_round + 1)):
+            state.complete = True
+            db.session.commit()
+        return state
+
+
+def _refresh_in_background(year: int):
+    """Top up a stale in-progress season off the request thread"""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            refresh_season(year)
+
+    _schedule_refresh(f"warehouse-refresh:{year}", run)
+
+
+def sync_seasons(years, force: bool = False, echo=print) -> Dict[int, str]:
+    """Sync several seasons, reporting progress; one failure doesn't stop the rest"""
+    db.create_all(bind_key='warehouse')
+    outcome = {}
+    for year in years:
+        try:
+            state = sync_season(year, force=force)
+            outcome[year] = 'complete' if state.complete else f"partial (round {state.last_round})"
+        except (SyncError, SQLAlchemyError) as e:
+            outcome[year] = f"failed: {e}"
+        echo(f"{year}: {outcome[year]}")
+    return outcome
+
+
+# ---------------------------------------------------------------------------
+# READS
+# ---------------------------------------------------------------------------
+
+def sync_state(year) -> Optional[SyncState]:
+    """The season's sync bookkeeping, or None if it isn't held (or there's no warehouse)"""
+    if not has_app_context():
+        return None
+    try:
+        return db.session.get(SyncState, int(year))
+    except (ValueError, TypeError, SQLAlchemyError):
+        db.session.rollback()
+        return None
+
+
+def is_available(year) -> bool:
+    """
+    True if a season can be served without upstream: it's fully ingested,
+    or it's in progress and was topped up recently. In-progress seasons
+    older than the refresh interval are refreshed in the background and
+    served stale meanwhile, up to WAREHOUSE_MAX_STALE.
+    """
+    state = sync_state(year)
+    if state is None:
+        return False
+    if state.complete:
+        return True
+
+    age = (datetime.now() - state.synced_at).total_seconds() if state.synced_at else float('inf')
+    if age < Config.WAREHOUSE_REFRESH_INTERVAL:
+        return True
+    _refresh_in_background(state.season)
+    return age < Config.WAREHOUSE_REFRESH_INTERVAL + Config.WAREHOUSE_MAX_STALE
+
+
+def latest_round(year) -> int:
+    """Last round with results held for a season (0 if none)"""
+    state = db.session.get(SyncState, int(year))
+    return state.last_round if state else 0
+
+
+def _driver_ref(driver: Driver) -> DriverRef:
+    return driver_ref({'driverId': driver.driver_id, 'givenName': driver.given_name,
+                       'familyName': driver.family_name, 'code': driver.code,
+                       'permanentNumber': driver.permanent_number, 'nationality': driver.nationality,
+                       'dateOfBirth': driver.date_of_birth, 'url': driver.url})
+
+
+def _circuit_ref(circuit: Circuit) -> CircuitRef:
+    return circuit_ref({'circuitId': circuit.circuit_id, 'circuitName': circuit.name,
+                        'Location': {'locality': circuit.locality, 'country': circuit.country}},
+                       get_country_code(circuit.country))
+
+
+def _race_info(race: Race, record_type=RaceInfo) -> RaceInfo:
+    return record_type(race.season, race.round, race.race_name, _circuit_ref(race.circuit),
+                       race.date, race.time, race.url)
+
+
+def races_for_season(year) -> List[RaceInfo]:
+    """Season calendar in get_races_by_season's shape"""
+    races = Race.query.filter_by(season=int(year)).order_by(Race.round).all()
+    return [_race_info(race) for race in races]
+
+
+def race_results(year, round_number) -> Union[RaceDetail, Dict]:
+    """
+    One race with its classification in get_race_results' shape. {} for a
+    round with no results held (not run yet, or run since the last top-up),
+    so the caller falls through to the live path and its upcoming-race view.
+    """
+    race = Race.query.filter_by(season=int(year), round=int(round_number)).first()
+    if race is None:
+        return {}
+    rows = Result.query.filter_by(season=race.season, round=race.round).all()
+    if not rows:
+        return {}
+    race_info = _race_info(race, RaceDetail)
+    race_info.isFutureRace = False
+    race_info.results = []
+    rows.sort(key=lambda r: int(r.position) if (r.position or '').isdigit() else 999)
+    for r in rows:
+        constructor = constructor_ref({'constructorId': r.constructor.constructor_id,
+                                       'name': r.constructor.name}) if r.constructor else None
+        race_info.results.append(RaceResult(
+            r.position, _driver_ref(r.driver), constructor, r.grid, r.laps, r.status,
+            _points_text(r.points), r.time, r.fastest_lap_rank, r.fastest_lap_time))
+    return race_info
+
+
+def driver_results(driver_id: str, year) -> List[DriverRaceResult]:
+    """A driver's season in get_driver_results' shape"""
+    rows = (db.session.query(Result, Race)
+            .join(Race, (Race.season == Result.season) & (Race.round == Result.round))
+            .filter(Result.season == int(year), Result.driver_id == driver_id)
+            .order_by(Result.round).all())
+    return [DriverRaceResult(race.round, race.race_name, _circuit_ref(race.circuit), race.date,
+                             r.grid, r.position, _points_text(r.points), r.status,
+                             r.constructor.name if r.constructor else None)
+            for r, race in rows]
+
+
+def _final_round(model, year: int) -> Optional[int]:
+    return db.session.query(db.func.max(model.round)).filter(model.season == year).scalar()
+
+
+def final_driver_standings(year) -> List[DriverStanding]:
+    year = int(year)
+    last_round = _final_round(DriverStanding, year)
+    if last_round is None:
+        return []
+    rows = DriverStanding.query.filter_by(season=year, round=last_round).all()
+    return sorted(rows, key=lambda s: int(s.position) if (s.position or '').isdigit() else 999)
+
+
+def final_constructor_standings(year) -> List[ConstructorStanding]:
+    year = int(year)
+    last_round = _final_round(ConstructorStanding, year)
+    if last_round is None:
+        return []
+    rows = ConstructorStanding.query.filter_by(season=year, round=last_round).all()
+    return sorted(rows, key=lambda s: int(s.position) if (s.position or '').isdigit() else 999)
+
+
+def season_drivers(year) -> List[Driver]:
+    """Every driver classified in at least one race of the season"""
+    driver_ids = db.session.query(Result.driver_id).filter(Result.season == int(year)).distinct()
+    return Driver.query.filter(Driver.driver_id.in_(driver_ids)).order_by(Driver.family_name).all()
+
+
+def season_roster(year) -> List[DriverEntry]:
+    """Season drivers with their championship standing, in search_drivers' row shape"""
+    standings = {s.driver_id: s for s in final_driver_standings(year)}
+    roster = []
+    for driver in season_drivers(year):
+        standing = standings.get(driver.driver_id)
+        if standing is None:
+            roster.append(DriverEntry(_driver_ref(driver)))
+            continue
+        roster.append(DriverEntry(_driver_ref(driver), standing.position, standing.points, standing.wins,
+                                  standing.constructor.name if standing.constructor else None))
+    return roster
+
+
+def season_results_as_ergast(year, sprint: bool = False) -> List[Dict]:
+    """
+    Minimal Ergast-shaped races ({'round', 'Results': [{'Driver', 'points'}]})
+    for code that folds raw results, e.g. the season points matrix.
+    """
+    model, child_key = (SprintResult, 'SprintResults') if sprint else (Result, 'Results')
+    races = {}
+    for r in model.query.filter_by(season=int(year)).order_by(model.round).all():
+        race = races.setdefault(r.round, {'season': str(r.season), 'round': str(r.round), child_key: []})
+        race[child_key].append({
+            'points': _points_text(r.points),
+            'Driver': {'driverId': r.driver_id, 'givenName': r.driver.given_name, 'familyName': r.driver.family_name}
+        })
+    return list(races.values())
+
+
+def _points_text(points) -> str:
+    """Render stored points the way the API does ('25', '0.5')"""
+    if points is None:
+        return '0'
+    return str(int(points)) if float(points).is_integer() else str(points)
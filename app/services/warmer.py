@@ -0,0 +1,169 @@
+"""
+# CALENDAR-AWARE CACHE WARMER
+# ONE ELECTED WORKER (ProcessLease) WATCHES THE CURRENT SEASON'S CALENDAR.
+# ONCE A RACE'S SCHEDULED END HAS PASSED IT POLLS FOR RESULTS AND, AS SOON
+# AS THEY LAND, REFRESHES STANDINGS, RESULTS, THE POINTS MATRIX AND DRIVER
+# ROSTERS SO THE POST-RACE RUSH HITS WARM CACHES INSTEAD OF UPSTREAM.
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app import cache
+from app.services import governor, jolpica
+from app.services.http_store import get_response_store
+from app.services.singleflight import ProcessLease
+from config import Config
+
+# LAST (SEASON, ROUND) WARMED, SHARED SO A NEW LEADER DOESN'T REPEAT IT
+_STATE_KEY = 'cache_warmer_last_warmed'
+# NEVER SLEEP LONGER THAN THIS, SO CALENDAR CHANGES ARE PICKED UP
+_MAX_IDLE = 6 * 3600
+
+
+def race_end(race: Dict) -> Optional[datetime]:
+    """Scheduled end of a race (UTC): start time plus CACHE_WARMER_RACE_DURATION"""
+    try:
+        start = datetime.fromisoformat(f"{race['date']}T{(race.get('time') or '00:00:00Z').rstrip('Z')}")
+    except (KeyError, ValueError, TypeError):
+        return None
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start + timedelta(seconds=Config.CACHE_WARMER_RACE_DURATION)
+
+
+def warm_season(year: int, round_number: int):
+    """
+    Refresh everything a finished round invalidates. Upstream reads are
+    revalidated (conditional GETs) rather than served from cache, and the
+    memoized results the round changed are dropped and rebuilt (other
+    seasons and rounds are left alone).
+    """
+    from app.services import driver_index, warehouse
+    from app.services.constructorChamp import constructorStandings
+    from app.services.driverChamp import driverStandings
+    from app.services.standings_index import get_standings_index
+
+    with jolpica.revalidating():
+        if warehouse.sync_state(year) is not None:
+            warehouse.refresh_season(year)
+        jolpica.get_latest_completed_round(year)
+
+        # delete_memoized WITHOUT ARGUMENTS WOULD DROP EVERY SEASON; DELETE THE NO-YEAR (CURRENT SEASON) KEY ONLY
+        driver_list = driverStandings.get_driver_list
+        cache.delete(driver_list.make_cache_key(driver_list.uncached))
+        for key in (year, str(year)):
+            cache.delete_memoized(driverStandings.get_driver_standings, key)
+            cache.delete_memoized(driverStandings.get_driver_list, key)
+            driverStandings.get_driver_standings(key)
+        driverStandings.get_driver_list()
+        driverStandings.get_driver_list(year)
+        constructorStandings.get_constructor_standings(year)
+
+        # ONLY THE ENTRIES THIS ROUND CHANGED - THE SEASON'S CALENDAR, THE ROUND'S
+        # RESULTS AND THE SEASONS OF THE DRIVERS CLASSIFIED IN IT - SO OTHER
+        # SEASONS AND ROUNDS STAY WARM IN EVERY WORKER
+        for key in (year, str(year)):
+            jolpica.get_races_by_season.cache_delete(key)
+            jolpica.get_race_results.cache_delete(key, str(round_number))
+            jolpica.get_races_by_season(key)
+        race = jolpica.get_race_results(str(year), str(round_number))
+        for result in getattr(race, 'results', None) or []:
+            jolpica.get_driver_results.cache_delete(result.driver.id, str(year))
+        driver_index.invalidate(year)
+        jolpica.search_drivers(str(year), '')
+
+        driverStandings.get_points_matrix(year)
+        get_standings_index(year)
+
+
+class CacheWarmer:
+    """
+    BACKGROUND THREAD, STARTED ONCE PER WORKER. EVERY WORKER RUNS ONE BUT ONLY
+    THE LEASE HOLDER DOES ANY WORK; THE OTHERS RETRY THE LEASE EACH POLL.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._lease = ProcessLease('cache-warmer')
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._lease.release()
+
+    def _run(self):
+        delay = 5  # SHORT FIRST WAIT: WARM A FRESHLY STARTED WORKER SOON
+        while not self._stop.wait(delay):
+            delay = Config.CACHE_WARMER_POLL_INTERVAL
+            if not self._lease.acquire():
+                continue
+            try:
+                with self.app.app_context(), governor.lane(governor.BACKGROUND):
+                    delay = self.tick(datetime.now(timezone.utc))
+            except Exception as e:
+                print(f"Cache warmer error: {e}")
+
+    def _last_warmed(self) -> List[int]:
+        stored = get_response_store().get_value(_STATE_KEY)
+        return stored[0] if stored else [0, 0]
+
+    def tick(self, now: datetime) -> float:
+        """One scheduling step; returns seconds until the next one"""
+        year = now.year
+        ends = {}
+        for race in jolpica.get_races_by_season(str(year)):
+            end = race_end(race)
+            if end is not None:
+                ends[int(race['round'])] = end
+
+        finished = [r for r, end in ends.items() if end <= now]
+        upcoming = [end for end in ends.values() if end > now]
+        idle = _MAX_IDLE
+        if upcoming:
+            idle = min(idle, (min(upcoming) - now).total_seconds())
+        idle = max(idle, Config.CACHE_WARMER_POLL_INTERVAL)
+        if not finished:
+            return idle
+
+        target = max(finished)
+        if self._last_warmed() >= [year, target]:
+            return idle
+
+        if (now - ends[target]).total_seconds() > Config.CACHE_WARMER_MAX_WAIT:
+            # RESULTS NEVER SHOWED UP (OR WE STARTED LONG AFTER) - STOP POLLING FOR THIS ONE
+            get_response_store().put_value(_STATE_KEY, [year, target])
+            return idle
+
+        with jolpica.revalidating():
+            latest = jolpica._fetch_latest_round(year)
+        if latest < target:
+            return Config.CACHE_WARMER_POLL_INTERVAL
+
+        warm_season(year, latest)
+        get_response_store().put_value(_STATE_KEY, [year, latest])
+        print(f"Cache warmer: warmed {year} round {latest}")
+        return idle
+
+
+_cache_warmer = None
+_cache_warmer_lock = threading.Lock()
+
+
+def start_cache_warmer(app) -> CacheWarmer:
+    """Start this worker's cache warmer thread (idempotent)"""
+    global _cache_warmer
+    if _cache_warmer is None:
+        with _cache_warmer_lock:
+            if _cache_warmer is None:
+                _cache_warmer = CacheWarmer(app)
+                _cache_warmer.start()
+    return _cache_warmer
@@ -0,0 +1,8 @@
+"""
+# OFFLINE BENCHMARK SUITE
+# fixtures      - RECORDED (OR SEEDED SYNTHETIC) JOLPICA SEASONS
+# fake_jolpica  - LOCAL ERGAST-COMPATIBLE SERVER OVER THOSE FIXTURES, WITH
+#                 INJECTABLE LATENCY AND ERRORS AND PER-FAMILY CALL COUNTS
+# run           - COLD / WARM LATENCY PERCENTILES AND UPSTREAM CALLS PER
+#                 ROUTE, CHECKED AGAINST thresholds.json
+"""
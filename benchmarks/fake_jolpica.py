@@ -0,0 +1,483 @@
+"""
+# LOCAL STAND-IN FOR THE JOLPICA (ERGAST) API
+# ANSWERS THE SAME URL GRAMMAR - /{season}/{round}/drivers/{id}/results.json
+# ETC. - FROM SEASON FIXTURES, WITH ERGAST'S limit/offset PAGINATION (BY
+# INNER ROW FOR RESULTS AND STANDINGS), ETags AND 304s.
+#
+# EVERY REQUEST IS COUNTED BY ENDPOINT FAMILY; LATENCY, JITTER AND ERROR
+# RATE CAN BE SET AT START OR CHANGED WHILE RUNNING:
+#   GET  /_bench/stats    CALL COUNTS
+#   POST /_bench/reset    ZERO THE COUNTS
+#   POST /_bench/config   {"latency_ms": 80, "jitter_ms": 40, "error_rate": 0.05, "error_status": 503}
+#
+#   python -m benchmarks.fake_jolpica --port 8001 --latency-ms 80
+#   JOLPICA_BASE_URL=http://127.0.0.1:8001/ergast/f1 flask run
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import load_seasons
+
+DEFAULT_YEARS = (2023, 2024)
+PATH_PREFIX = '/ergast/f1'
+DEFAULT_LIMIT = 30
+MAX_LIMIT = 100
+
+FILTERS = {'drivers': ('Driver', 'driverId'), 'constructors': ('Constructor', 'constructorId')}
+RESOURCES = {'seasons', 'races', 'drivers', 'constructors', 'circuits', 'results', 'sprint', 'qualifying',
+             'driverstandings', 'constructorstandings', 'status', 'laps', 'pitstops'}
+# RESOURCE -> (TABLE, LIST KEY, INNER LIST KEY) OF THE RESPONSE
+TABLES = {
+    'seasons': ('SeasonTable', 'Seasons', None),
+    'races': ('RaceTable', 'Races', None),
+    'drivers': ('DriverTable', 'Drivers', None),
+    'constructors': ('ConstructorTable', 'Constructors', None),
+    'circuits': ('CircuitTable', 'Circuits', None),
+    'results': ('RaceTable', 'Races', 'Results'),
+    'sprint': ('RaceTable', 'Races', 'SprintResults'),
+    'qualifying': ('RaceTable', 'Races', 'QualifyingResults'),
+    'driverstandings': ('StandingsTable', 'StandingsLists', 'DriverStandings'),
+    'constructorstandings': ('StandingsTable', 'StandingsLists', 'ConstructorStandings'),
+    'status': ('StatusTable', 'Status', None),
+    'laps': ('RaceTable', 'Races', 'Laps'),
+    'pitstops': ('RaceTable', 'Races', 'PitStops'),
+}
+
+
+class Query:
+    __slots__ = ('season', 'round', 'filters', 'resource')
+
+    def __init__(self, season: Optional[str], round_: Optional[str], filters: Dict[str, str], resource: str):
+        self.season = season
+        self.round = round_
+        self.filters = filters
+        self.resource = resource
+
+
+def parse_path(path: str) -> Optional[Query]:
+    """Ergast URL path -> Query, or None if it isn't one"""
+    if path.startswith(PATH_PREFIX):
+        path = path[len(PATH_PREFIX):]
+    segments = [s for s in path.lower().split('/') if s]
+    if segments and segments[-1].endswith('.json'):
+        segments[-1] = segments[-1][:-5]
+    season = round_ = None
+    i = 0
+    if i < len(segments) and (segments[i] == 'current' or (segments[i].isdigit() and len(segments[i]) == 4)):
+        season = segments[i]
+        i += 1
+        if i < len(segments) and (segments[i] == 'last' or segments[i].isdigit()):
+            round_ = segments[i]
+            i += 1
+    filters, resource = {}, None
+    while i < len(segments):
+        name = segments[i]
+        if name in FILTERS and i + 1 < len(segments) and segments[i + 1] not in RESOURCES:
+            filters[name] = segments[i + 1]
+            i += 2
+        elif name in RESOURCES and i == len(segments) - 1:
+            resource = name
+            i += 1
+        else:
+            return None
+    if resource is None:
+        resource = list(filters)[-1] if filters else ('races' if season else 'seasons')
+    return Query(season, round_, filters, resource)
+
+
+def _number(text) -> float:
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _points_text(points: float) -> str:
+    return str(int(points)) if float(points).is_integer() else str(points)
+
+
+class Ergast:
+    """THE ERGAST QUERY LANGUAGE OVER A SET OF SEASON FIXTURES"""
+
+    def __init__(self, seasons: Dict[str, Dict]):
+        self.seasons = dict(sorted(seasons.items()))
+        self._standings = {}
+        self._lock = threading.Lock()
+
+    # SCOPE -------------------------------------------------------------------
+
+    def _years(self, query: Query) -> List[str]:
+        if query.season is None:
+            return list(self.seasons)
+        if query.season == 'current':
+            return list(self.seasons)[-1:]
+        return [query.season] if query.season in self.seasons else []
+
+    def _last_round(self, year: str) -> int:
+        rounds = [int(race['round']) for race in self.seasons[year]['results']]
+        return max(rounds) if rounds else 0
+
+    def _round(self, year: str, query: Query) -> Optional[int]:
+        if query.round is None:
+            return None
+        return self._last_round(year) if query.round == 'last' else int(query.round)
+
+    @staticmethod
+    def _matches(row: Dict, filters: Dict[str, str]) -> bool:
+        for name, value in filters.items():
+            key, id_field = FILTERS[name]
+            if row.get(key, {}).get(id_field, '').lower() != value:
+                return False
+        return True
+
+    def _race_rows(self, kind: str, query: Query) -> List[Dict]:
+        """Races of a session kind (results, sprint, qualifying) with their rows filtered"""
+        inner = TABLES[kind][2]
+        out = []
+        for year in self._years(query):
+            round_ = self._round(year, query)
+            for race in self.seasons[year].get(kind, []):
+                if round_ is not None and int(race['round']) != round_:
+                    continue
+                rows = [row for row in race.get(inner, []) if self._matches(row, query.filters)]
+                if rows:
+                    out.append(dict(race, **{inner: rows}))
+        return out
+
+    # RESOURCES ---------------------------------------------------------------
+
+    def _races(self, query: Query) -> List[Dict]:
+        if query.filters:
+            return [{k: v for k, v in race.items() if k != 'Results'} for race in self._race_rows('results', query)]
+        out = []
+        for year in self._years(query):
+            round_ = self._round(year, query)
+            out.extend(race for race in self.seasons[year]['races']
+                       if round_ is None or int(race['round']) == round_)
+        return out
+
+    def _entities(self, kind: str, query: Query) -> List[Dict]:
+        """Drivers or constructors in scope, first appearance order"""
+        key, id_field = FILTERS[kind]
+        own = {name: value for name, value in query.filters.items() if name == kind}
+        others = {name: value for name, value in query.filters.items() if name != kind}
+        if others or query.round is not None:
+            scoped = Query(query.season, query.round, others, 'results')
+            candidates = [row[key] for race in self._race_rows('results', scoped) for row in race['Results']]
+        else:
+            candidates = [entity for year in self._years(query) for entity in self.seasons[year][kind]]
+        seen, out = set(), []
+        for entity in candidates:
+            entity_id = entity[id_field]
+            if entity_id in seen or (own and entity_id.lower() != own[kind]):
+                continue
+            seen.add(entity_id)
+            out.append(entity)
+        return out
+
+    def _circuits(self, query: Query) -> List[Dict]:
+        seen, out = set(), []
+        for race in self._races(query):
+            circuit = race['Circuit']
+            if circuit['circuitId'] not in seen:
+                seen.add(circuit['circuitId'])
+                out.append(circuit)
+        return out
+
+    def _seasons(self, query: Query) -> List[Dict]:
+        if query.filters:
+            years = sorted({race['season'] for race in self._race_rows('results', query)})
+        else:
+            years = self._years(query)
+        return [{'season': year, 'url': f"https://en.wikipedia.org/wiki/{year}_Formula_One_World_Championship"}
+                for year in years]
+
+    def standings_after(self, year: str, round_: int) -> Tuple[List[Dict], List[Dict]]:
+        """(driver standings, constructor standings) after a round, computed from race and sprint points"""
+        key = (year, round_)
+        with self._lock:
+            cached = self._standings.get(key)
+        if cached is not None:
+            return cached
+
+        drivers, constructors = {}, {}
+        sessions = [(race, 'Results') for race in self.seasons[year]['results']]
+        sessions += [(race, 'SprintResults') for race in self.seasons[year].get('sprint', [])]
+        for race, inner in sessions:
+            if int(race['round']) > round_:
+                continue
+            for row in race.get(inner, []):
+                won = inner == 'Results' and row.get('position') == '1'
+                driver = drivers.setdefault(row['Driver']['driverId'], {
+                    'Driver': row['Driver'], 'Constructors': [], 'points': 0.0, 'wins': 0, 'best': 99})
+                driver['points'] += _number(row.get('points'))
+                driver['wins'] += won
+                if inner == 'Results':
+                    driver['best'] = min(driver['best'], int(_number(row.get('position')) or 99))
+                if row['Constructor'] not in driver['Constructors']:
+                    driver['Constructors'].append(row['Constructor'])
+                team = constructors.setdefault(row['Constructor']['constructorId'], {
+                    'Constructor': row['Constructor'], 'points': 0.0, 'wins': 0})
+                team['points'] += _number(row.get('points'))
+                team['wins'] += won
+
+        ranked_drivers = sorted(drivers.values(), key=lambda d: (-d['points'], -d['wins'], d['best']))
+        ranked_teams = sorted(constructors.values(), key=lambda c: (-c['points'], -c['wins']))
+        result = (
+            [{'position': str(p + 1), 'positionText': str(p + 1), 'points': _points_text(d['points']),
+              'wins': str(d['wins']), 'Driver': d['Driver'], 'Constructors': d['Constructors']}
+             for p, d in enumerate(ranked_drivers)],
+            [{'position': str(p + 1), 'positionText': str(p + 1), 'points': _points_text(c['points']),
+              'wins': str(c['wins']), 'Constructor': c['Constructor']}
+             for p, c in enumerate(ranked_teams)],
+        )
+        with self._lock:
+            self._standings[key] = result
+        return result
+
+    def _standings_lists(self, query: Query) -> List[Dict]:
+        drivers_table = query.resource == 'driverstandings'
+        out = []
+        for year in self._years(query):
+            last = self._last_round(year)
+            round_ = self._round(year, query) or last
+            if not last or round_ > last:
+                continue  # NOT RUN YET
+            rows = self.standings_after(year, round_)[0 if drivers_table else 1]
+            rows = [row for row in rows if self._standing_matches(row, query.filters)]
+            if rows:
+                inner = 'DriverStandings' if drivers_table else 'ConstructorStandings'
+                out.append({'season': year, 'round': str(round_), inner: rows})
+        return out
+
+    @staticmethod
+    def _standing_matches(row: Dict, filters: Dict[str, str]) -> bool:
+        if 'drivers' in filters and row.get('Driver', {}).get('driverId', '').lower() != filters['drivers']:
+            return False
+        if 'constructors' in filters:
+            teams = row.get('Constructors') or [row.get('Constructor', {})]
+            if not any(t.get('constructorId', '').lower() == filters['constructors'] for t in teams):
+                return False
+        return True
+
+    def rows(self, query: Query) -> List[Dict]:
+        resource = query.resource
+        if resource in ('results', 'sprint', 'qualifying'):
+            return self._race_rows(resource, query)
+        if resource in ('driverstandings', 'constructorstandings'):
+            return self._standings_lists(query)
+        if resource == 'races':
+            return self._races(query)
+        if resource in FILTERS:
+            return self._entities(resource, query)
+        if resource == 'circuits':
+            return self._circuits(query)
+        if resource == 'seasons':
+            return self._seasons(query)
+        return []  # LAPS, PIT STOPS AND STATUS AREN'T USED BY THE APP
+
+    # RESPONSE ----------------------------------------------------------------
+
+    def respond(self, url: str) -> Optional[Dict]:
+        """The JSON body Jolpica would send for url, or None for a bad request"""
+        parts = urlsplit(url)
+        query = parse_path(parts.path)
+        if query is None:
+            return None
+        params = parse_qs(parts.query)
+        try:
+            limit = min(int(params.get('limit', [DEFAULT_LIMIT])[0]), MAX_LIMIT)
+            offset = max(int(params.get('offset', [0])[0]), 0)
+        except ValueError:
+            return None
+        table, key, inner = TABLES[query.resource]
+        rows = self.rows(query)
+
+        if inner:
+            # PAGINATE BY INNER ROW, SPLITTING A RACE (OR STANDINGS LIST) ACROSS PAGES
+            flat = [(row, item) for row in rows for item in row[inner]]
+            total = len(flat)
+            page = []
+            for row, item in flat[offset:offset + limit]:
+                if page and page[-1]['_source'] is row:
+                    page[-1][inner].append(item)
+                else:
+                    page.append(dict(row, **{inner: [item], '_source': row}))
+            for row in page:
+                del row['_source']
+        else:
+            total = len(rows)
+            page = rows[offset:offset + limit]
+
+        body = {key: page}
+        if query.season:
+            body['season'] = query.season
+        if query.round:
+            body['round'] = query.round
+        for name, value in query.filters.items():
+            body[FILTERS[name][1]] = value
+        return {'MRData': {
+            'xmlns': '', 'series': 'f1', 'url': url,
+            'limit': str(limit), 'offset': str(offset), 'total': str(total), table: body,
+        }}
+
+
+# ---------------------------------------------------------------------------
+# HTTP SERVER
+# ---------------------------------------------------------------------------
+
+class FakeJolpica:
+    """
+    THREADED HTTP SERVER OVER AN Ergast INSTANCE, WITH INJECTABLE LATENCY /
+    ERRORS AND PER-FAMILY CALL COUNTS. USE IN-PROCESS (start() / stop()) OR
+    FROM THE COMMAND LINE.
+    """
+
+    def __init__(self, years: Iterable = DEFAULT_YEARS, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, seed: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.ergast = Ergast(load_seasons(years))
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._calls = {}
+        self._errors = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{PATH_PREFIX}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-jolpica', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    # COUNTERS ----------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'calls': sum(self._calls.values()), 'by_family': dict(self._calls), 'errors': self._errors}
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+            self._errors = 0
+
+    def configure(self, **settings):
+        for name in ('latency_ms', 'jitter_ms', 'error_rate', 'error_status'):
+            if name in settings:
+                setattr(self, name, type(getattr(self, name))(settings[name]))
+
+    def _count(self, family: str) -> Tuple[float, bool]:
+        """Count a call; returns (delay in seconds, whether to fail it)"""
+        with self._lock:
+            self._calls[family] = self._calls.get(family, 0) + 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.error_rate
+            self._errors += fail
+        return delay, fail
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # KEEP-ALIVE, LIKE THE REAL API
+
+            def _send(self, status: int, body: bytes = b'', headers: Optional[Dict] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def _send_json(self, status: int, data, headers: Optional[Dict] = None):
+                self._send(status, json.dumps(data).encode(), dict(headers or {}, **{'Content-Type': 'application/json'}))
+
+            def do_GET(self):
+                if self.path.startswith('/_bench/stats'):
+                    return self._send_json(200, fake.stats())
+                query = parse_path(urlsplit(self.path).path)
+                delay, fail = fake._count(query.resource if query else 'invalid')
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    headers = {'Retry-After': '1'} if fake.error_status == 429 else None
+                    return self._send_json(fake.error_status, {'detail': 'injected error'}, headers)
+
+                data = fake.ergast.respond(f"http://{self.headers.get('Host', 'localhost')}{self.path}")
+                if data is None:
+                    return self._send_json(400, {'detail': 'Bad Request'})
+                body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+                etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+                if self.headers.get('If-None-Match') == etag:
+                    return self._send(304, headers={'ETag': etag})
+                self._send(200, body, {'Content-Type': 'application/json', 'ETag': etag})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = self.rfile.read(length) if length else b''
+                if self.path.startswith('/_bench/reset'):
+                    fake.reset()
+                    return self._send_json(200, fake.stats())
+                if self.path.startswith('/_bench/config'):
+                    try:
+                        fake.configure(**json.loads(payload or b'{}'))
+                    except (ValueError, TypeError) as e:
+                        return self._send_json(400, {'detail': str(e)})
+                    return self._send_json(200, {name: getattr(fake, name) for name in
+                                                 ('latency_ms', 'jitter_ms', 'error_rate', 'error_status')})
+                self._send_json(404, {'detail': 'Not Found'})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve Jolpica fixtures locally')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--years', nargs='+', type=int, default=list(DEFAULT_YEARS))
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='uniform +/- around the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = FakeJolpica(args.years, args.latency_ms, args.jitter_ms, args.error_rate, args.error_status,
+                         args.seed, args.host, args.port)
+    print(f"Fake Jolpica serving {', '.join(map(str, args.years))} at {server.base_url}")
+    print(f"  JOLPICA_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
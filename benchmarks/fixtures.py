@@ -0,0 +1,295 @@
+"""
+# SEASON FIXTURES FOR THE FAKE JOLPICA SERVER
+# A SEASON IS THE SIX RESOURCES THE WAREHOUSE INGESTS (CALENDAR, DRIVERS,
+# CONSTRUCTORS, RESULTS, SPRINT, QUALIFYING) WITH EVERY PAGE MERGED; THE
+# SERVER DERIVES EVERY OTHER ENDPOINT (PER ROUND, PER DRIVER, STANDINGS)
+# FROM THEM.
+#
+# RECORDED SEASONS LIVE IN benchmarks/fixtures/<year>.json:
+#   python -m benchmarks.fixtures record 2023 2024
+# SEASONS THAT HAVEN'T BEEN RECORDED ARE GENERATED FROM A FIXED SEED, SO
+# EVERY RUN (AND EVERY MACHINE) SEES THE SAME DATA.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LIVE_BASE_URL = 'https://api.jolpi.ca/ergast/f1'
+
+# RESOURCE -> (URL SUFFIX, TABLE, LIST KEY, INNER LIST KEY)
+RESOURCES = {
+    'races': ('.json', 'RaceTable', 'Races', None),
+    'drivers': ('/drivers.json', 'DriverTable', 'Drivers', None),
+    'constructors': ('/constructors.json', 'ConstructorTable', 'Constructors', None),
+    'results': ('/results.json', 'RaceTable', 'Races', 'Results'),
+    'sprint': ('/sprint.json', 'RaceTable', 'Races', 'SprintResults'),
+    'qualifying': ('/qualifying.json', 'RaceTable', 'Races', 'QualifyingResults'),
+}
+
+RACE_POINTS = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+SPRINT_POINTS = (8, 7, 6, 5, 4, 3, 2, 1)
+
+# ---------------------------------------------------------------------------
+# SYNTHETIC SEASONS
+# ---------------------------------------------------------------------------
+
+_CONSTRUCTORS = [
+    ('red_bull', 'Red Bull', 'Austrian'), ('ferrari', 'Ferrari', 'Italian'),
+    ('mercedes', 'Mercedes', 'German'), ('mclaren', 'McLaren', 'British'),
+    ('aston_martin', 'Aston Martin', 'British'), ('alpine', 'Alpine F1 Team', 'French'),
+    ('williams', 'Williams', 'British'), ('rb', 'RB F1 Team', 'Italian'),
+    ('sauber', 'Sauber', 'Swiss'), ('haas', 'Haas F1 Team', 'American'),
+]
+
+# (driverId, number, code, given name, family name, date of birth, nationality), TWO PER CONSTRUCTOR
+_DRIVERS = [
+    ('max_verstappen', '33', 'VER', 'Max', 'Verstappen', '1997-09-30', 'Dutch'),
+    ('perez', '11', 'PER', 'Sergio', 'Pérez', '1990-01-26', 'Mexican'),
+    ('leclerc', '16', 'LEC', 'Charles', 'Leclerc', '1997-10-16', 'Monegasque'),
+    ('sainz', '55', 'SAI', 'Carlos', 'Sainz', '1994-09-01', 'Spanish'),
+    ('hamilton', '44', 'HAM', 'Lewis', 'Hamilton', '1985-01-07', 'British'),
+    ('russell', '63', 'RUS', 'George', 'Russell', '1998-02-15', 'British'),
+    ('norris', '4', 'NOR', 'Lando', 'Norris', '1999-11-13', 'British'),
+    ('piastri', '81', 'PIA', 'Oscar', 'Piastri', '2001-04-06', 'Australian'),
+    ('alonso', '14', 'ALO', 'Fernando', 'Alonso', '1981-07-29', 'Spanish'),
+    ('stroll', '18', 'STR', 'Lance', 'Stroll', '1998-10-29', 'Canadian'),
+    ('gasly', '10', 'GAS', 'Pierre', 'Gasly', '1996-02-07', 'French'),
+    ('ocon', '31', 'OCO', 'Esteban', 'Ocon', '1996-09-17', 'French'),
+    ('albon', '23', 'ALB', 'Alexander', 'Albon', '1996-03-23', 'Thai'),
+    ('sargeant', '2', 'SAR', 'Logan', 'Sargeant', '2000-12-31', 'American'),
+    ('tsunoda', '22', 'TSU', 'Yuki', 'Tsunoda', '2000-05-11', 'Japanese'),
+    ('ricciardo', '3', 'RIC', 'Daniel', 'Ricciardo', '1989-07-01', 'Australian'),
+    ('bottas', '77', 'BOT', 'Valtteri', 'Bottas', '1989-08-28', 'Finnish'),
+    ('zhou', '24', 'ZHO', 'Guanyu', 'Zhou', '1999-05-30', 'Chinese'),
+    ('hulkenberg', '27', 'HUL', 'Nico', 'Hülkenberg', '1987-08-19', 'German'),
+    ('kevin_magnussen', '20', 'MAG', 'Kevin', 'Magnussen', '1992-10-05', 'Danish'),
+]
+
+# (circuitId, circuit name, locality, country, lat, long, grand prix)
+_CIRCUITS = [
+    ('bahrain', 'Bahrain International Circuit', 'Sakhir', 'Bahrain', '26.0325', '50.5106', 'Bahrain'),
+    ('jeddah', 'Jeddah Corniche Circuit', 'Jeddah', 'Saudi Arabia', '21.6319', '39.1044', 'Saudi Arabian'),
+    ('albert_park', 'Albert Park Grand Prix Circuit', 'Melbourne', 'Australia', '-37.8497', '144.968', 'Australian'),
+    ('suzuka', 'Suzuka Circuit', 'Suzuka', 'Japan', '34.8431', '136.541', 'Japanese'),
+    ('shanghai', 'Shanghai International Circuit', 'Shanghai', 'China', '31.3389', '121.22', 'Chinese'),
+    ('miami', 'Miami International Autodrome', 'Miami', 'USA', '25.9581', '-80.2389', 'Miami'),
+    ('imola', 'Autodromo Enzo e Dino Ferrari', 'Imola', 'Italy', '44.3439', '11.7167', 'Emilia Romagna'),
+    ('monaco', 'Circuit de Monaco', 'Monte-Carlo', 'Monaco', '43.7347', '7.42056', 'Monaco'),
+    ('villeneuve', 'Circuit Gilles Villeneuve', 'Montreal', 'Canada', '45.5', '-73.5228', 'Canadian'),
+    ('catalunya', 'Circuit de Barcelona-Catalunya', 'Montmeló', 'Spain', '41.57', '2.26111', 'Spanish'),
+    ('red_bull_ring', 'Red Bull Ring', 'Spielberg', 'Austria', '47.2197', '14.7647', 'Austrian'),
+    ('silverstone', 'Silverstone Circuit', 'Silverstone', 'UK', '52.0786', '-1.01694', 'British'),
+    ('hungaroring', 'Hungaroring', 'Budapest', 'Hungary', '47.5789', '19.2486', 'Hungarian'),
+    ('spa', 'Circuit de Spa-Francorchamps', 'Spa', 'Belgium', '50.4372', '5.97139', 'Belgian'),
+    ('zandvoort', 'Circuit Park Zandvoort', 'Zandvoort', 'Netherlands', '52.3888', '4.54092', 'Dutch'),
+    ('monza', 'Autodromo Nazionale di Monza', 'Monza', 'Italy', '45.6156', '9.28111', 'Italian'),
+    ('baku', 'Baku City Circuit', 'Baku', 'Azerbaijan', '40.3725', '49.8533', 'Azerbaijan'),
+    ('marina_bay', 'Marina Bay Street Circuit', 'Marina Bay', 'Singapore', '1.2914', '103.864', 'Singapore'),
+    ('americas', 'Circuit of the Americas', 'Austin', 'USA', '30.1328', '-97.6411', 'United States'),
+    ('rodriguez', 'Autódromo Hermanos Rodríguez', 'Mexico City', 'Mexico', '19.4042', '-99.0907', 'Mexico City'),
+    ('interlagos', 'Autódromo José Carlos Pace', 'São Paulo', 'Brazil', '-23.7036', '-46.6997', 'São Paulo'),
+    ('vegas', 'Las Vegas Strip Street Circuit', 'Las Vegas', 'United States', '36.1147', '-115.173', 'Las Vegas'),
+    ('losail', 'Losail International Circuit', 'Al Daayen', 'Qatar', '25.49', '51.4542', 'Qatar'),
+    ('yas_marina', 'Yas Marina Circuit', 'Abu Dhabi', 'UAE', '24.4672', '54.6031', 'Abu Dhabi'),
+]
+
+_SPRINT_ROUNDS = {5, 6, 11, 19, 21, 23}
+_DNF_STATUSES = ('Engine', 'Collision', 'Gearbox', 'Hydraulics', 'Accident', 'Brakes')
+
+
+def _lap_time(seconds: float) -> str:
+    return f"{int(seconds // 60)}:{seconds % 60:06.3f}"
+
+
+def _race_time(millis: int) -> str:
+    hours, rest = divmod(millis, 3600000)
+    minutes, rest = divmod(rest, 60000)
+    return f"{hours}:{minutes:02d}:{rest / 1000:06.3f}"
+
+
+def _points_text(points: float) -> str:
+    return str(int(points)) if float(points).is_integer() else str(points)
+
+
+def synthetic_season(year: int) -> Dict:
+    """A complete, seeded season: 24 rounds, 10 constructors, 20 drivers, 6 sprints"""
+    rng = random.Random(year)
+    constructors = [{
+        'constructorId': cid, 'url': f"http://en.wikipedia.org/wiki/{name.replace(' ', '_')}",
+        'name': name, 'nationality': nationality,
+    } for cid, name, nationality in _CONSTRUCTORS]
+    drivers = [{
+        'driverId': did, 'permanentNumber': number, 'code': code,
+        'url': f"http://en.wikipedia.org/wiki/{given}_{family}",
+        'givenName': given, 'familyName': family, 'dateOfBirth': dob, 'nationality': nationality,
+    } for did, number, code, given, family, dob, nationality in _DRIVERS]
+    team_of = {d['driverId']: constructors[i // 2] for i, d in enumerate(drivers)}
+    # CAR PACE DOMINATES, DRIVER PACE SPLITS TEAM-MATES; ONE SHUFFLE PER SEASON
+    pace = {d['driverId']: rng.gauss(0, 1) + 0.35 * (i // 2) + 0.15 * (i % 2) for i, d in enumerate(drivers)}
+
+    races, results, sprints, qualifying = [], [], [], []
+    race_day = date(year, 3, 2)
+    while race_day.weekday() != 6:
+        race_day += timedelta(days=1)
+    for index, (cid, circuit_name, locality, country, lat, lng, gp) in enumerate(_CIRCUITS):
+        round_number = str(index + 1)
+        race = {
+            'season': str(year), 'round': round_number,
+            'url': f"https://en.wikipedia.org/wiki/{year}_{gp.replace(' ', '_')}_Grand_Prix",
+            'raceName': f"{gp} Grand Prix",
+            'Circuit': {
+                'circuitId': cid, 'url': f"http://en.wikipedia.org/wiki/{circuit_name.replace(' ', '_')}",
+                'circuitName': circuit_name,
+                'Location': {'lat': lat, 'long': lng, 'locality': locality, 'country': country},
+            },
+            'date': race_day.isoformat(), 'time': '13:00:00Z',
+        }
+        if index + 1 in _SPRINT_ROUNDS:
+            race['Sprint'] = {'date': (race_day - timedelta(days=1)).isoformat(), 'time': '15:00:00Z'}
+        races.append(race)
+
+        base_lap = 78 + rng.random() * 20
+        quali_order = sorted(drivers, key=lambda d: pace[d['driverId']] + rng.gauss(0, 0.6))
+        qualifying.append(dict(race, QualifyingResults=[{
+            'number': d['permanentNumber'], 'position': str(p + 1), 'Driver': d,
+            'Constructor': team_of[d['driverId']],
+            'Q1': _lap_time(base_lap + 0.8 + p * 0.05),
+            **({'Q2': _lap_time(base_lap + 0.4 + p * 0.04)} if p < 15 else {}),
+            **({'Q3': _lap_time(base_lap + p * 0.03)} if p < 10 else {}),
+        } for p, d in enumerate(quali_order)]))
+        grid = {d['driverId']: p + 1 for p, d in enumerate(quali_order)}
+
+        laps = 50 + rng.randint(0, 20)
+        race_order = sorted(drivers, key=lambda d: pace[d['driverId']] + rng.gauss(0, 0.9))
+        retired = set(d['driverId'] for d in rng.sample(race_order, rng.randint(0, 3)))
+        finishers = [d for d in race_order if d['driverId'] not in retired]
+        classified = finishers + [d for d in race_order if d['driverId'] in retired]
+        winner_millis = int(laps * (base_lap + 4) * 1000)
+        fastest = rng.choice(finishers[:10])['driverId']
+        entries = []
+        for p, d in enumerate(classified):
+            points = RACE_POINTS[p] if p < len(RACE_POINTS) and d['driverId'] not in retired else 0
+            entry = {
+                'number': d['permanentNumber'], 'position': str(p + 1),
+                'positionText': str(p + 1) if d['driverId'] not in retired else 'R',
+                'points': _points_text(points), 'Driver': d, 'Constructor': team_of[d['driverId']],
+                'grid': str(grid[d['driverId']]),
+            }
+            if d['driverId'] in retired:
+                entry.update(laps=str(rng.randint(1, laps - 1)), status=rng.choice(_DNF_STATUSES))
+            else:
+                gap = 0 if p == 0 else int(p * 2800 + rng.random() * 2000)
+                lapped = gap > 90000
+                entry.update(laps=str(laps - 1 if lapped else laps), status='+1 Lap' if lapped else 'Finished')
+                if not lapped:
+                    entry['Time'] = {'millis': str(winner_millis + gap),
+                                     'time': _race_time(winner_millis) if p == 0 else f"+{gap / 1000:.3f}"}
+                entry['FastestLap'] = {
+                    'rank': '1' if d['driverId'] == fastest else str(min(p + 2, 20)),
+                    'lap': str(rng.randint(laps // 2, laps)),
+                    'Time': {'time': _lap_time(base_lap + (0 if d['driverId'] == fastest else 0.2 + p * 0.05))},
+                }
+            entries.append(entry)
+        results.append(dict(race, Results=entries))
+
+        if index + 1 in _SPRINT_ROUNDS:
+            sprint_order = sorted(drivers, key=lambda d: pace[d['driverId']] + rng.gauss(0, 0.9))
+            sprints.append(dict(race, SprintResults=[{
+                'number': d['permanentNumber'], 'position': str(p + 1), 'positionText': str(p + 1),
+                'points': _points_text(SPRINT_POINTS[p] if p < len(SPRINT_POINTS) else 0),
+                'Driver': d, 'Constructor': team_of[d['driverId']], 'grid': str(p + 1),
+                'laps': str(laps // 3), 'status': 'Finished',
+            } for p, d in enumerate(sprint_order)]))
+
+        race_day += timedelta(days=7 if index % 2 else 14)
+
+    return {
+        'season': str(year), 'source': 'synthetic', 'races': races, 'drivers': drivers,
+        'constructors': constructors, 'results': results, 'sprint': sprints, 'qualifying': qualifying,
+    }
+
+
+# ---------------------------------------------------------------------------
+# RECORDED SEASONS
+# ---------------------------------------------------------------------------
+
+def fixture_path(year, fixtures_dir: str = FIXTURES_DIR) -> str:
+    return os.path.join(fixtures_dir, f"{year}.json")
+
+
+def load_season(year, fixtures_dir: str = FIXTURES_DIR) -> Dict:
+    """The recorded season if there is one, otherwise the synthetic one"""
+    try:
+        with open(fixture_path(year, fixtures_dir), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return synthetic_season(int(year))
+
+
+def load_seasons(years: Iterable, fixtures_dir: str = FIXTURES_DIR) -> Dict[str, Dict]:
+    return {str(year): load_season(year, fixtures_dir) for year in years}
+
+
+def _merge_page(rows: List[Dict], page: List[Dict], inner: Optional[str]):
+    # ERGAST PAGES NESTED RESOURCES BY THE INNER ROW, SO A RACE CAN SPAN TWO PAGES
+    for row in page:
+        if inner and rows and rows[-1].get('round') == row.get('round') and rows[-1].get('season') == row.get('season'):
+            rows[-1][inner].extend(row.get(inner, []))
+        else:
+            rows.append(row)
+
+
+def record_season(year, base_url: str = LIVE_BASE_URL, fixtures_dir: str = FIXTURES_DIR,
+                  pause: float = 0.5) -> str:
+    """Fetch every page of a season's six resources from base_url and save them as one fixture"""
+    import requests
+
+    session = requests.Session()
+    season = {'season': str(year), 'source': base_url, 'recorded_at': int(time.time())}
+    for name, (suffix, table, key, inner) in RESOURCES.items():
+        rows, offset, total = [], 0, None
+        while total is None or offset < total:
+            response = session.get(f"{base_url}/{year}{suffix}", params={'limit': 100, 'offset': offset}, timeout=30)
+            response.raise_for_status()
+            data = response.json()['MRData']
+            total = int(data.get('total', 0))
+            _merge_page(rows, data.get(table, {}).get(key, []), inner)
+            offset += int(data.get('limit', 100))
+            time.sleep(pause)  # STAY WELL UNDER JOLPICA'S BURST LIMIT
+        season[name] = rows
+        print(f"{year} {name}: {total} rows")
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    path = fixture_path(year, fixtures_dir)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(season, f, ensure_ascii=False, separators=(',', ':'))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Record Jolpica seasons as benchmark fixtures')
+    sub = parser.add_subparsers(dest='command', required=True)
+    record = sub.add_parser('record', help='fetch seasons from the live API into benchmarks/fixtures')
+    record.add_argument('years', nargs='+', type=int)
+    record.add_argument('--base-url', default=LIVE_BASE_URL)
+    synth = sub.add_parser('synthesize', help='write the synthetic season instead (e.g. to inspect it)')
+    synth.add_argument('years', nargs='+', type=int)
+    args = parser.parse_args(argv)
+
+    for year in args.years:
+        if args.command == 'record':
+            print(f"Recorded {record_season(year, args.base_url)}")
+        else:
+            os.makedirs(FIXTURES_DIR, exist_ok=True)
+            with open(fixture_path(year), 'w', encoding='utf-8') as f:
+                json.dump(synthetic_season(year), f, ensure_ascii=False, indent=1)
+            print(f"Wrote {fixture_path(year)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,446 @@
+"""
+# RACE-WEEKEND LOAD TEST
+# STARTS THE FAKE JOLPICA SERVER AND GUNICORN (OR TARGETS A RUNNING SERVER),
+# THEN RAMPS VIRTUAL USERS THROUGH STAGES. EACH USER LOGS IN ONCE AND THEN
+# LOOPS OVER WEIGHTED SCENARIOS WITH THINK TIME, KEEPING ITS OWN COOKIES AND
+# (LIKE A BROWSER) THE ETAGS OF PAGES IT HAS SEEN:
+#   dashboard     - OPEN AND RELOAD THE DASHBOARD
+#   season_switch - FLICK THROUGH SEASONS WITH ?year=
+#   compare       - THE COMPARE PAGE, THEN DATA FOR RANDOM DRIVER PAIRS
+#   typeahead     - ONE XHR SEARCH PER KEYSTROKE WHILE A NAME IS TYPED
+#   profile       - A DRIVER PROFILE FOLLOWED BY ITS ASYNC /stats FETCH
+# EVERY STAGE REPORTS THROUGHPUT, p50/p99 LATENCY, ERROR RATE AND UPSTREAM
+# CALLS PER REQUEST; THE STAGE WHERE THROUGHPUT STOPS GROWING (OR p99
+# BREAKS --slo-ms) IS THE SATURATION POINT.
+#
+#   python -m benchmarks.load --workers 4 --users 5 10 20 40 --stage-seconds 30
+#   python -m benchmarks.load --target http://127.0.0.1:5000 --users 10 --accounts 0
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from benchmarks.fake_jolpica import DEFAULT_YEARS
+from benchmarks.fixtures import load_seasons
+from benchmarks.run import ROOT_DIR, app_env, percentile
+
+ACCOUNT_PASSWORD = 'Load-test-2024!'
+READY_TIMEOUT = 60.0
+REQUEST_TIMEOUT = 30.0
+
+# SCENARIO -> WEIGHT. RACE WEEKENDS ARE DASHBOARD AND COMPARE HEAVY
+MIXES = {
+    'race-weekend': {'dashboard': 35, 'season_switch': 10, 'compare': 25, 'typeahead': 15, 'profile': 15},
+    'browse': {'dashboard': 20, 'season_switch': 25, 'compare': 15, 'typeahead': 20, 'profile': 20},
+}
+
+
+class Sample:
+    __slots__ = ('stage', 'name', 'ms', 'status', 'error')
+
+    def __init__(self, stage: int, name: str, ms: float, status: int, error: Optional[str]):
+        self.stage = stage
+        self.name = name
+        self.ms = ms
+        self.status = status
+        self.error = error
+
+
+class Recorder:
+    """ALL SAMPLES OF THE RUN, TAGGED WITH THE STAGE THAT WAS RUNNING WHEN THEY FINISHED"""
+
+    def __init__(self):
+        self.stage = 0
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, ms: float, status: int, error: Optional[str] = None):
+        sample = Sample(self.stage, name, ms, status, error)
+        with self._lock:
+            self.samples.append(sample)
+
+    def for_stage(self, stage: int) -> List[Sample]:
+        with self._lock:
+            return [s for s in self.samples if s.stage == stage]
+
+
+# ---------------------------------------------------------------------------
+# VIRTUAL USERS
+# ---------------------------------------------------------------------------
+
+class VirtualUser(threading.Thread):
+    def __init__(self, number: int, base_url: str, account: Optional[str], catalogue: Dict,
+                 mix: Dict[str, int], think_ms: float, browser_cache: bool,
+                 recorder: Recorder, stop: threading.Event):
+        super().__init__(name=f"vu-{number}", daemon=True)
+        self.base_url = base_url
+        self.account = account
+        self.catalogue = catalogue
+        self.scenarios = [SCENARIOS[name] for name in mix]
+        self.weights = list(mix.values())
+        self.think_ms = think_ms
+        self.browser_cache = browser_cache
+        self.recorder = recorder
+        self.stop = stop
+        self.rng = random.Random(number)
+        self.session = requests.Session()
+        self.etags = {}
+
+    def think(self, scale: float = 1.0):
+        if self.think_ms:
+            self.stop.wait(self.rng.expovariate(1000 / (self.think_ms * scale)))
+
+    def request(self, name: str, path: str, method: str = 'GET', **kwargs) -> Optional[requests.Response]:
+        headers = dict(kwargs.pop('headers', None) or {})
+        if self.browser_cache and method == 'GET' and path in self.etags:
+            headers['If-None-Match'] = self.etags[path]
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, headers=headers,
+                                            timeout=REQUEST_TIMEOUT, allow_redirects=False, **kwargs)
+        except requests.RequestException as e:
+            self.recorder.add(name, (time.perf_counter() - started) * 1000, 0, type(e).__name__)
+            return None
+        elapsed = (time.perf_counter() - started) * 1000
+        error = None
+        if response.status_code >= 500:
+            error = str(response.status_code)
+        elif response.status_code in (301, 302) and '/auth/login' in response.headers.get('Location', ''):
+            error = 'logged out'
+        self.recorder.add(name, elapsed, response.status_code, error)
+        if response.headers.get('ETag'):
+            self.etags[path] = response.headers['ETag']
+        return response
+
+    def login(self) -> bool:
+        if self.account is None:
+            return True
+        self.request('auth.login (form)', '/auth/login')
+        response = self.request('auth.login', '/auth/login', method='POST',
+                                data={'username': self.account, 'password': ACCOUNT_PASSWORD})
+        return response is not None and response.status_code == 302
+
+    def run(self):
+        if not self.login():
+            print(f"{self.name}: login as {self.account} failed")
+            return
+        while not self.stop.is_set():
+            scenario = self.rng.choices(self.scenarios, self.weights)[0]
+            scenario(self)
+            self.think()
+
+
+def _year(vu: VirtualUser) -> str:
+    # MOST TRAFFIC IS ON THE LATEST SEASON
+    years = vu.catalogue['years']
+    return years[-1] if vu.rng.random() < 0.7 else vu.rng.choice(years)
+
+
+def dashboard(vu: VirtualUser):
+    year = vu.catalogue['years'][-1]
+    vu.request('dashboard.index', f"/dashboard/?year={year}")
+    vu.think()
+    vu.request('dashboard.index', f"/dashboard/?year={year}")  # RELOAD FOR THE LATEST RESULT
+
+
+def season_switch(vu: VirtualUser):
+    for year in vu.rng.sample(vu.catalogue['years'], min(3, len(vu.catalogue['years']))):
+        vu.request('dashboard.index', f"/dashboard/?year={year}")
+        vu.think(0.5)
+
+
+def compare(vu: VirtualUser):
+    vu.request('dashboard.compare', '/dashboard/compare')
+    year = _year(vu)
+    for _ in range(vu.rng.randint(1, 3)):
+        vu.think(0.5)
+        first, second = vu.rng.sample(vu.catalogue['drivers'][year], 2)
+        vu.request('dashboard.compare_data',
+                   f"/dashboard/compare/data?year={year}&driver1={first['driverId']}&driver2={second['driverId']}")
+
+
+def typeahead(vu: VirtualUser):
+    year = _year(vu)
+    name = vu.rng.choice(vu.catalogue['drivers'][year])['familyName'].lower()
+    scope = 'all' if vu.rng.random() < 0.3 else year
+    for length in range(1, min(len(name), 6) + 1):
+        vu.request('drivers.search (typeahead)', f"/drivers/search?year={scope}&q={name[:length]}",
+                   headers={'X-Requested-With': 'XMLHttpRequest'})
+        vu.stop.wait(vu.rng.uniform(0.06, 0.18))  # KEYSTROKES, NOT THINK TIME
+    vu.request('drivers.search', f"/drivers/search?year={year}&q={name[:6]}")
+
+
+def profile(vu: VirtualUser):
+    year = _year(vu)
+    driver = vu.rng.choice(vu.catalogue['drivers'][year])['driverId']
+    vu.request('drivers.profile', f"/drivers/drivers/{driver}?year={year}")
+    vu.request('drivers.driver_stats', f"/drivers/drivers/{driver}/stats")
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], None]] = {
+    'dashboard': dashboard, 'season_switch': season_switch, 'compare': compare,
+    'typeahead': typeahead, 'profile': profile,
+}
+
+
+# ---------------------------------------------------------------------------
+# PROCESSES UNDER TEST
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, proc: Optional[subprocess.Popen] = None):
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {proc.returncode} before it was ready")
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {READY_TIMEOUT:.0f}s")
+
+
+def seed_accounts(count: int):
+    """Create load-test accounts (run inside the app's environment)"""
+    from app import create_app, db
+    from app.models.user import User
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        for i in range(count):
+            username = f"loadtest{i}"
+            if User.query.filter_by(username=username).first() is None:
+                user = User(username=username, email=f"{username}@example.com")
+                user.set_password(ACCOUNT_PASSWORD)
+                db.session.add(user)
+        db.session.commit()
+
+
+class Stack:
+    """FAKE JOLPICA + GUNICORN IN A TEMP DIRECTORY, TORN DOWN ON EXIT"""
+
+    def __init__(self, args):
+        self.args = args
+        self.tmp = tempfile.mkdtemp(prefix='f1nsight-load-')
+        self.procs = []
+        self.upstream_url = args.upstream_url
+        self.stats_url = None
+        self.base_url = args.target
+
+    def _spawn(self, command: List[str], env: Dict, name: str) -> subprocess.Popen:
+        log = open(os.path.join(self.tmp, f"{name}.log"), 'w')
+        proc = subprocess.Popen(command, cwd=ROOT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        self.procs.append(proc)
+        return proc
+
+    def __enter__(self):
+        args = self.args
+        if self.upstream_url is None:
+            port = _free_port()
+            proc = self._spawn([sys.executable, '-m', 'benchmarks.fake_jolpica', '--port', str(port),
+                                '--years', *map(str, args.years), '--latency-ms', str(args.latency_ms),
+                                '--jitter-ms', str(args.jitter_ms), '--error-rate', str(args.error_rate)],
+                               dict(os.environ), 'fake_jolpica')
+            self.upstream_url = f"http://127.0.0.1:{port}/ergast/f1"
+            _wait_ready(f"http://127.0.0.1:{port}/_bench/stats", proc)
+        if '/ergast' in self.upstream_url:
+            self.stats_url = self.upstream_url.split('/ergast')[0] + '/_bench/stats'
+
+        if self.base_url is None:
+            env = app_env(self.tmp, self.upstream_url)
+            env['CACHE_WARMER_ENABLED'] = 'true' if args.warmer else 'false'
+            env['UPSTREAM_GOVERNOR_ENABLED'] = 'false' if args.no_governor else 'true'
+            if args.accounts:
+                subprocess.run([sys.executable, '-m', 'benchmarks.load', '--seed-accounts', str(args.accounts)],
+                               cwd=ROOT_DIR, env=env, check=True, capture_output=True)
+            port = _free_port()
+            command = [sys.executable, '-m', 'gunicorn', '--workers', str(args.workers), '--threads',
+                       str(args.threads), '--bind', f"127.0.0.1:{port}", '--timeout', '60', 'run:app']
+            proc = self._spawn(command, env, 'gunicorn')
+            self.base_url = f"http://127.0.0.1:{port}"
+            _wait_ready(self.base_url + '/auth/login', proc)
+        return self
+
+    def __exit__(self, *exc):
+        for proc in reversed(self.procs):
+            proc.terminate()
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if exc[0] is not None:
+            print(f"Logs kept in {self.tmp}")
+        else:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+        return False
+
+    def upstream_calls(self) -> Optional[int]:
+        if self.stats_url is None:
+            return None
+        try:
+            return requests.get(self.stats_url, timeout=5).json()['calls']
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+
+
+# ---------------------------------------------------------------------------
+# RUN AND REPORT
+# ---------------------------------------------------------------------------
+
+def summarize(samples: List[Sample], seconds: float) -> Dict:
+    latencies = [s.ms for s in samples]
+    errors = sum(1 for s in samples if s.error)
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / seconds, 1) if seconds else 0.0,
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'not_modified': sum(1 for s in samples if s.status == 304),
+    }
+
+
+def run_load(args) -> Dict:
+    seasons = load_seasons(args.years)
+    years = sorted(seasons)
+    catalogue = {'years': years, 'drivers': {year: seasons[year]['drivers'] for year in years}}
+    mix = MIXES[args.mix]
+    recorder = Recorder()
+    stop = threading.Event()
+    users, stages = [], []
+
+    with Stack(args) as stack:
+        print(f"Target {stack.base_url} (upstream {stack.upstream_url}), mix {args.mix}")
+        for stage, target_users in enumerate(args.users):
+            recorder.stage = stage
+            while len(users) < target_users:
+                number = len(users)
+                account = f"loadtest{number % args.accounts}" if args.accounts else None
+                user = VirtualUser(number, stack.base_url, account, catalogue, mix, args.think_ms,
+                                   not args.no_browser_cache, recorder, stop)
+                user.start()
+                users.append(user)
+            calls_before = stack.upstream_calls()
+            time.sleep(args.stage_seconds)
+            calls_after = stack.upstream_calls()
+
+            result = summarize(recorder.for_stage(stage), args.stage_seconds)
+            result['users'] = target_users
+            if calls_before is not None and calls_after is not None and result['requests']:
+                result['upstream_calls_per_request'] = round((calls_after - calls_before) / result['requests'], 3)
+            stages.append(result)
+            print(f"  {target_users:>4} users: {result['rps']:>7.1f} req/s  p50 {result['p50_ms']:>7.1f} ms  "
+                  f"p99 {result['p99_ms']:>8.1f} ms  errors {result['error_rate']:.2%}")
+        stop.set()
+        for user in users:
+            user.join(REQUEST_TIMEOUT)
+
+    endpoints = {}
+    for name in sorted({s.name for s in recorder.samples}):
+        endpoints[name] = summarize([s for s in recorder.samples if s.name == name],
+                                    args.stage_seconds * len(args.users))
+    errors = {}
+    for s in recorder.samples:
+        if s.error:
+            errors[f"{s.name}: {s.error}"] = errors.get(f"{s.name}: {s.error}", 0) + 1
+    return {
+        'params': {'workers': args.workers, 'threads': args.threads, 'mix': args.mix, 'think_ms': args.think_ms,
+                   'latency_ms': args.latency_ms, 'error_rate': args.error_rate, 'target': args.target},
+        'stages': stages, 'endpoints': endpoints, 'errors': errors,
+    }
+
+
+def saturation(stages: List[Dict], slo_ms: float) -> Optional[Dict]:
+    """First stage where throughput grew < 10% on more users, or p99 broke the SLO"""
+    for previous, stage in zip(stages, stages[1:]):
+        if stage['p99_ms'] > slo_ms or stage['rps'] < previous['rps'] * 1.1:
+            return stage
+    return None
+
+
+def print_report(report: Dict, slo_ms: float):
+    print()
+    header = f"{'users':>6}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>10}{'errors':>9}{'304s':>7}{'upstream/req':>14}"
+    print(header)
+    print('-' * len(header))
+    for stage in report['stages']:
+        print(f"{stage['users']:>6}{stage['requests']:>10}{stage['rps']:>9.1f}{stage['p50_ms']:>9.1f}"
+              f"{stage['p99_ms']:>10.1f}{stage['error_rate']:>9.2%}{stage['not_modified']:>7}"
+              f"{stage.get('upstream_calls_per_request', float('nan')):>14.3f}")
+    print()
+    header = f"{'endpoint':<30}{'requests':>10}{'p50 ms':>9}{'p99 ms':>10}{'errors':>9}"
+    print(header)
+    print('-' * len(header))
+    for name, result in report['endpoints'].items():
+        print(f"{name:<30}{result['requests']:>10}{result['p50_ms']:>9.1f}{result['p99_ms']:>10.1f}"
+              f"{result['error_rate']:>9.2%}")
+    if report['errors']:
+        print('\nErrors:')
+        for key, count in sorted(report['errors'].items(), key=lambda item: -item[1]):
+            print(f"  {count:>6}  {key}")
+    saturated = saturation(report['stages'], slo_ms)
+    print()
+    if saturated:
+        peak = max(report['stages'], key=lambda s: s['rps'])
+        print(f"Saturation at {saturated['users']} users: peak {peak['rps']:.1f} req/s at {peak['users']} users, "
+              f"p99 {saturated['p99_ms']:.0f} ms (SLO {slo_ms:.0f} ms)")
+    else:
+        print(f"No saturation up to {report['stages'][-1]['users']} users (SLO {slo_ms:.0f} ms); add stages")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ramp virtual users against f1nsight to find its saturation point')
+    parser.add_argument('--users', nargs='+', type=int, default=[5, 10, 20, 40], help='users per stage (ramped)')
+    parser.add_argument('--stage-seconds', type=float, default=30.0)
+    parser.add_argument('--mix', choices=list(MIXES), default='race-weekend')
+    parser.add_argument('--think-ms', type=float, default=500.0, help='mean pause between steps (0 = closed loop)')
+    parser.add_argument('--no-browser-cache', action='store_true', help="don't send If-None-Match")
+    parser.add_argument('--slo-ms', type=float, default=1000.0, help='p99 above this counts as saturated')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=1, help='threads per gunicorn worker (>1 = gthread)')
+    parser.add_argument('--warmer', action='store_true', help='run the cache warmer in the workers')
+    parser.add_argument('--no-governor', action='store_true',
+                        help="don't hold the app to Jolpica's rate limits (measure the app alone)")
+    parser.add_argument('--accounts', type=int, default=10, help='accounts to seed and log in as (0 = anonymous)')
+    parser.add_argument('--years', nargs='+', type=int, default=list(DEFAULT_YEARS))
+    parser.add_argument('--latency-ms', type=float, default=80.0, help='fake upstream latency')
+    parser.add_argument('--jitter-ms', type=float, default=40.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fake upstream error rate')
+    parser.add_argument('--target', help='load an already running app instead of starting gunicorn')
+    parser.add_argument('--upstream-url', help='use an already running fake Jolpica')
+    parser.add_argument('--output', help='also write the report as JSON')
+    parser.add_argument('--seed-accounts', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.seed_accounts is not None:
+        seed_accounts(args.seed_accounts)
+        return 0
+
+    report = run_load(args)
+    print_report(report, args.slo_ms)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+# ROUTE BENCHMARKS AGAINST THE FAKE JOLPICA SERVER
+# EACH ROUTE IS MEASURED IN FRESH WORKER PROCESSES WITH EMPTY CACHES, STORES
+# AND WAREHOUSE (A NEW TEMP DIRECTORY EACH):
+#   cold - THE FIRST REQUEST A NEW WORKER SERVES (REPEATED --cold-runs TIMES)
+#   warm - --warm-requests MORE REQUESTS AFTER ONE PRIMING REQUEST
+# FOR EVERY REQUEST IT RECORDS LATENCY AND THE UPSTREAM CALLS IT CAUSED
+# (COUNTED BY THE FAKE SERVER, SO BACKGROUND REFRESHES COUNT TOO).
+#
+#   python -m benchmarks.run                          # REPORT
+#   python -m benchmarks.run --check                  # EXIT 1 ON A REGRESSION
+#   python -m benchmarks.run --update-thresholds      # ACCEPT THE CURRENT NUMBERS
+#
+# UPSTREAM CALL BUDGETS ARE EXACT: ANY EXTRA CALL FAILS --check. LATENCY
+# BUDGETS CARRY HEADROOM AND ARE MACHINE SPECIFIC - REGENERATE THEM ON THE
+# MACHINE THAT RUNS --check.
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.fake_jolpica import FakeJolpica
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thresholds.json')
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ENDPOINT -> URL (FILLED FROM PARAMS); ALL OF THEM ARE CONDITIONAL-GET
+# ROUTES, BUT THE TEST CLIENT SENDS NO VALIDATORS, SO EVERY REQUEST RENDERS
+ROUTES = {
+    'dashboard.index': '/dashboard/?year={year}',
+    'dashboard.races': '/dashboard/races?year={year}&round={round}',
+    'dashboard.compare_data': '/dashboard/compare/data?year={year}&driver1={driver}&driver2={rival}',
+    'drivers.search': '/drivers/search?year={year}',
+    'drivers.profile': '/drivers/drivers/{driver}?year={year}',
+    'drivers.driver_stats': '/drivers/drivers/{driver}/stats',
+}
+PARAMS = {'year': 2024, 'round': 5, 'driver': 'hulkenberg', 'rival': 'kevin_magnussen'}
+
+# LATENCY BUDGET = max(MEASURED p95 * HEADROOM, MEASURED p95 + FLOOR)
+LATENCY_HEADROOM = 2.0
+LATENCY_FLOOR_MS = 25.0
+
+# BACKGROUND WORK (SWR REFRESHES, WAREHOUSE TOP-UPS) A REQUEST STARTS IS
+# COUNTED UNTIL THE FAKE SERVER HAS SEEN NO CALL FOR SETTLE_QUIET SECONDS
+SETTLE_QUIET = 0.3
+SETTLE_TIMEOUT = 15.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples: List[Dict]) -> Dict:
+    latencies = [s['ms'] for s in samples]
+    calls = [s['upstream_calls'] for s in samples]
+    return {
+        'requests': len(samples),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(max(latencies, default=0.0), 2),
+        'upstream_calls': max(calls, default=0),
+        'upstream_calls_total': sum(calls),
+        'statuses': sorted({s['status'] for s in samples}),
+    }
+
+
+# ---------------------------------------------------------------------------
+# WORKER (ONE FRESH PROCESS PER MEASUREMENT)
+# ---------------------------------------------------------------------------
+
+def _settle(stats_url: str) -> int:
+    """Wait until the fake server goes quiet; returns its call count"""
+    deadline = time.monotonic() + SETTLE_TIMEOUT
+    last = requests.get(stats_url).json()['calls']
+    while time.monotonic() < deadline:
+        time.sleep(SETTLE_QUIET)
+        calls = requests.get(stats_url).json()['calls']
+        if calls == last:
+            break
+        last = calls
+    return last
+
+
+def worker(route: str, mode: str, requests_count: int, bench_url: str, result_file: str):
+    from app import create_app
+
+    app = create_app()
+    app.config['LOGIN_DISABLED'] = True  # MEASURE THE PAGES, NOT THE LOGIN FLOW
+    client = app.test_client()
+    url = ROUTES[route].format(**PARAMS)
+    stats_url = f"{bench_url}/_bench/stats"
+
+    if mode == 'warm':
+        client.get(url)
+    samples = []
+    for _ in range(requests_count):
+        before = _settle(stats_url)
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = (time.perf_counter() - started) * 1000
+        response.close()
+        samples.append({'ms': elapsed, 'status': response.status_code,
+                        'upstream_calls': _settle(stats_url) - before})
+
+    with open(result_file, 'w') as f:
+        json.dump(samples, f)
+
+
+# ---------------------------------------------------------------------------
+# ORCHESTRATION
+# ---------------------------------------------------------------------------
+
+def app_env(tmp: str, upstream_url: str) -> Dict[str, str]:
+    """Environment for an app process with its own empty databases, caches and stores under tmp"""
+    return dict(
+        os.environ,
+        JOLPICA_BASE_URL=upstream_url,
+        SECRET_KEY='benchmark',
+        DATABASE_URL='sqlite:///' + os.path.join(tmp, 'f1nsight.db'),
+        WAREHOUSE_DATABASE_URI='sqlite:///' + os.path.join(tmp, 'warehouse.db'),
+        UPSTREAM_STORE_PATH=os.path.join(tmp, 'upstream_store.db'),
+        UPSTREAM_STORE_MODE='live',
+        CACHE_L2_URL='sqlite:///' + os.path.join(tmp, 'tiered_cache.db'),
+        SINGLEFLIGHT_LOCK_DIR=os.path.join(tmp, 'locks'),
+        UPSTREAM_GOVERNOR_PATH=os.path.join(tmp, 'upstream_governor.state'),
+        METRICS_DIR=os.path.join(tmp, 'metrics'),
+        TRACE_LOG_PATH=os.path.join(tmp, 'traces.jsonl'),
+        CACHE_WARMER_ENABLED='false',
+        PYTHONPATH=os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get('PYTHONPATH')])),
+    )
+
+
+def _run_worker(server: FakeJolpica, route: str, mode: str, requests_count: int, verbose: bool) -> List[Dict]:
+    with tempfile.TemporaryDirectory(prefix='f1nsight-bench-') as tmp:
+        result_file = os.path.join(tmp, 'samples.json')
+        env = app_env(tmp, server.base_url)
+        bench_url = server.base_url.split('/ergast')[0]
+        command = [sys.executable, '-m', 'benchmarks.run', '--worker', route, '--mode', mode,
+                   '--requests', str(requests_count), '--bench-url', bench_url, '--result-file', result_file]
+        proc = subprocess.run(command, cwd=tmp, env=env, capture_output=not verbose, text=True)
+        if proc.returncode != 0 or not os.path.exists(result_file):
+            print(f"  {route} ({mode}) worker failed with exit code {proc.returncode}")
+            if proc.stderr:
+                print(proc.stderr[-2000:])
+            return []
+        with open(result_file) as f:
+            return json.load(f)
+
+
+def run_benchmarks(routes: List[str], cold_runs: int, warm_requests: int, latency_ms: float,
+                   jitter_ms: float, verbose: bool = False) -> Dict:
+    server = FakeJolpica(latency_ms=latency_ms, jitter_ms=jitter_ms)
+    server.start()
+    results = {}
+    try:
+        for route in routes:
+            cold = []
+            for _ in range(cold_runs):
+                cold.extend(_run_worker(server, route, 'cold', 1, verbose))
+            warm = _run_worker(server, route, 'warm', warm_requests, verbose)
+            results[route] = {'cold': summarize(cold), 'warm': summarize(warm)}
+            print(f"  {route}: cold p95 {results[route]['cold']['p95_ms']:.1f} ms / "
+                  f"{results[route]['cold']['upstream_calls']} calls, "
+                  f"warm p95 {results[route]['warm']['p95_ms']:.1f} ms / "
+                  f"{results[route]['warm']['upstream_calls']} calls")
+    finally:
+        server.stop()
+    return {
+        'params': dict(PARAMS, latency_ms=latency_ms, jitter_ms=jitter_ms,
+                       cold_runs=cold_runs, warm_requests=warm_requests),
+        'routes': results,
+    }
+
+
+def print_report(report: Dict):
+    header = f"{'route':<24}{'cold p50':>10}{'cold p95':>10}{'calls':>7}{'warm p50':>10}{'warm p95':>10}{'warm p99':>10}{'calls':>7}"
+    print(header)
+    print('-' * len(header))
+    for route, result in report['routes'].items():
+        cold, warm = result['cold'], result['warm']
+        print(f"{route:<24}{cold['p50_ms']:>10.1f}{cold['p95_ms']:>10.1f}{cold['upstream_calls']:>7}"
+              f"{warm['p50_ms']:>10.1f}{warm['p95_ms']:>10.1f}{warm['p99_ms']:>10.1f}{warm['upstream_calls']:>7}")
+
+
+# ---------------------------------------------------------------------------
+# THRESHOLDS
+# ---------------------------------------------------------------------------
+
+def _budget_ms(p95: float) -> float:
+    return round(max(p95 * LATENCY_HEADROOM, p95 + LATENCY_FLOOR_MS), 1)
+
+
+def thresholds_from(report: Dict) -> Dict:
+    routes = {}
+    for route, result in report['routes'].items():
+        routes[route] = {
+            'cold_upstream_calls': result['cold']['upstream_calls'],
+            'warm_upstream_calls': result['warm']['upstream_calls'],
+            'cold_p95_ms': _budget_ms(result['cold']['p95_ms']),
+            'warm_p95_ms': _budget_ms(result['warm']['p95_ms']),
+        }
+    return {'params': report['params'], 'routes': routes}
+
+
+def check(report: Dict, thresholds: Dict) -> List[str]:
+    """Every way report is worse than thresholds, as readable lines"""
+    failures = []
+    for route, budget in thresholds.get('routes', {}).items():
+        result = report['routes'].get(route)
+        if result is None:
+            continue
+        for mode in ('cold', 'warm'):
+            measured = result[mode]
+            if not measured['requests']:
+                failures.append(f"{route} ({mode}): no successful measurement")
+                continue
+            bad = [s for s in measured['statuses'] if s >= 500]
+            if bad:
+                failures.append(f"{route} ({mode}): answered {bad}")
+            calls = budget.get(f'{mode}_upstream_calls')
+            if calls is not None and measured['upstream_calls'] > calls:
+                failures.append(f"{route} ({mode}): {measured['upstream_calls']} upstream calls per request, "
+                                f"budget {calls}")
+            p95 = budget.get(f'{mode}_p95_ms')
+            if p95 is not None and measured['p95_ms'] > p95:
+                failures.append(f"{route} ({mode}): p95 {measured['p95_ms']:.1f} ms, budget {p95:.1f} ms")
+    return failures
+
+
+def _load_thresholds(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark f1nsight routes against a local Jolpica stand-in')
+    parser.add_argument('--routes', nargs='+', choices=list(ROUTES), default=list(ROUTES))
+    parser.add_argument('--cold-runs', type=int, default=3, help='fresh workers measured per route')
+    parser.add_argument('--warm-requests', type=int, default=30, help='requests per route after priming')
+    parser.add_argument('--latency-ms', type=float, default=None, help='fake upstream latency (default: thresholds)')
+    parser.add_argument('--jitter-ms', type=float, default=None)
+    parser.add_argument('--thresholds', default=THRESHOLDS_PATH)
+    parser.add_argument('--check', action='store_true', help='exit 1 if a route exceeds its thresholds')
+    parser.add_argument('--update-thresholds', action='store_true', help='write the measured numbers as thresholds')
+    parser.add_argument('--output', help='also write the full report as JSON')
+    parser.add_argument('--verbose', action='store_true', help="show the workers' output")
+    # INTERNAL: ONE MEASUREMENT IN A FRESH PROCESS
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--mode', choices=('cold', 'warm'), help=argparse.SUPPRESS)
+    parser.add_argument('--requests', type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument('--bench-url', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(args.worker, args.mode, args.requests, args.bench_url, args.result_file)
+        return 0
+
+    thresholds = _load_thresholds(args.thresholds)
+    # MEASURE UNDER THE SAME UPSTREAM LATENCY THE THRESHOLDS WERE TAKEN WITH
+    recorded = (thresholds or {}).get('params', {})
+    latency_ms = args.latency_ms if args.latency_ms is not None else recorded.get('latency_ms', 20.0)
+    jitter_ms = args.jitter_ms if args.jitter_ms is not None else recorded.get('jitter_ms', 5.0)
+
+    print(f"Benchmarking {len(args.routes)} routes (upstream latency {latency_ms:g}±{jitter_ms:g} ms)")
+    report = run_benchmarks(args.routes, args.cold_runs, args.warm_requests, latency_ms, jitter_ms, args.verbose)
+    print()
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_thresholds:
+        updated = thresholds_from(report)
+        if thresholds and set(args.routes) != set(ROUTES):
+            # PARTIAL RUN - KEEP THE OTHER ROUTES' BUDGETS
+            updated['routes'] = dict(thresholds.get('routes', {}), **updated['routes'])
+        with open(args.thresholds, 'w') as f:
+            json.dump(updated, f, indent=2)
+            f.write('\n')
+        print(f"\nWrote {args.thresholds}")
+
+    if args.check:
+        if thresholds is None:
+            print(f"\nNo thresholds at {args.thresholds}; run with --update-thresholds first")
+            return 1
+        failures = check(report, thresholds)
+        if failures:
+            print('\nREGRESSIONS:')
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print('\nAll routes within thresholds')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,12 +3,119 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+basedir = os.path.abspath(os.path.dirname(__file__))
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///f1nsight.db'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///f1nsight.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Local F1 data warehouse (filled by `flask f1 sync`)
+    SQLALCHEMY_BINDS = {
+        'warehouse': os.environ.get('WAREHOUSE_DATABASE_URI', 'sqlite:///f1_warehouse.db')
+    }
+    # In-progress seasons held in the warehouse are topped up round by round once
+    # older than the refresh interval, and no longer served once past max stale
+    WAREHOUSE_REFRESH_INTERVAL = int(os.environ.get('WAREHOUSE_REFRESH_INTERVAL', 300))
+    WAREHOUSE_MAX_STALE = int(os.environ.get('WAREHOUSE_MAX_STALE', 6 * 3600))
     
     # Cache Configuration
-    CACHE_TYPE = "SimpleCache"  # Flask-Caching configuration
+    CACHE_TYPE = "app.services.tiered_cache.FlaskTieredCache"  # Flask-Caching on the tiered cache below
     CACHE_DEFAULT_TIMEOUT = 300  # 5 minutes default cache timeout
-    PERMANENT_SESSION_LIFETIME = 1800  # 30 minutes session lifetime
\ No newline at end of file
+    # Tiered cache - per-worker memory (L1) in front of a store all workers share (L2):
+    # sqlite:///<path> (default) or redis://host:port/db (needs the redis package).
+    # Workers pick up each other's invalidations every CACHE_SYNC_INTERVAL seconds
+    CACHE_L2_URL = os.environ.get('CACHE_L2_URL', 'sqlite:///' + os.path.join(basedir, 'instance', 'tiered_cache.db'))
+    CACHE_L1_MAX_BYTES = int(os.environ.get('CACHE_L1_MAX_BYTES', os.environ.get('JOLPICA_CACHE_MAX_BYTES', 64 * 1024 * 1024)))
+    CACHE_L1_MAX_ENTRIES = int(os.environ.get('CACHE_L1_MAX_ENTRIES', os.environ.get('JOLPICA_CACHE_MAX_ENTRIES', 4096)))
+    CACHE_SYNC_INTERVAL = float(os.environ.get('CACHE_SYNC_INTERVAL', 1.0))
+    PERMANENT_SESSION_LIFETIME = 1800  # 30 minutes session lifetime
+
+    # Upstream (Jolpica) response store - shared by all workers, survives restarts
+    # mode: live (revalidate), record (always fetch + save) or replay (offline)
+    UPSTREAM_STORE_PATH = os.environ.get('UPSTREAM_STORE_PATH', os.path.join(basedir, 'instance', 'upstream_store.db'))
+    UPSTREAM_STORE_MODE = os.environ.get('UPSTREAM_STORE_MODE', 'live')
+    # Jolpica (Ergast-compatible) API root - point at benchmarks/fake_jolpica.py to run offline
+    JOLPICA_BASE_URL = os.environ.get('JOLPICA_BASE_URL', 'https://api.jolpi.ca/ergast/f1').rstrip('/')
+    # Shared upstream HTTP client (pooled keep-alive connections to JOLPICA_BASE_URL)
+    UPSTREAM_POOL_SIZE = int(os.environ.get('UPSTREAM_POOL_SIZE', 10))
+    UPSTREAM_MAX_PER_HOST = int(os.environ.get('UPSTREAM_MAX_PER_HOST', 4))
+    UPSTREAM_CONNECT_TIMEOUT = float(os.environ.get('UPSTREAM_CONNECT_TIMEOUT', 3.05))
+    UPSTREAM_READ_TIMEOUT = float(os.environ.get('UPSTREAM_READ_TIMEOUT', 10))
+    UPSTREAM_MAX_RETRIES = int(os.environ.get('UPSTREAM_MAX_RETRIES', 3))
+
+    # Single-flight coalescing - cross-worker lock files for concurrent cache misses
+    SINGLEFLIGHT_LOCK_DIR = os.environ.get('SINGLEFLIGHT_LOCK_DIR', os.path.join(basedir, 'instance', 'locks'))
+    SINGLEFLIGHT_LOCK_TIMEOUT = float(os.environ.get('SINGLEFLIGHT_LOCK_TIMEOUT', 15))
+
+    # Async fetch engine (one shared aiohttp session on a background loop)
+    ASYNC_FETCH_CONCURRENCY = int(os.environ.get('ASYNC_FETCH_CONCURRENCY', 8))
+
+    # Outbound rate governor - token buckets matching Jolpica's limits, shared by all
+    # workers through UPSTREAM_GOVERNOR_PATH. Background work (warmer, refreshes) only
+    # spends tokens above the reserved share and gives up after its max wait; a user
+    # request gives up (and falls back to cached data) after UPSTREAM_INTERACTIVE_MAX_WAIT
+    UPSTREAM_GOVERNOR_ENABLED = os.environ.get('UPSTREAM_GOVERNOR_ENABLED', 'true').lower() == 'true'
+    UPSTREAM_RATE_PER_SECOND = float(os.environ.get('UPSTREAM_RATE_PER_SECOND', 4))
+    UPSTREAM_RATE_PER_HOUR = float(os.environ.get('UPSTREAM_RATE_PER_HOUR', 500))
+    UPSTREAM_GOVERNOR_RESERVE = float(os.environ.get('UPSTREAM_GOVERNOR_RESERVE', 0.25))
+    UPSTREAM_INTERACTIVE_MAX_WAIT = float(os.environ.get('UPSTREAM_INTERACTIVE_MAX_WAIT', 5))
+    UPSTREAM_BACKGROUND_MAX_WAIT = float(os.environ.get('UPSTREAM_BACKGROUND_MAX_WAIT', 60))
+    UPSTREAM_GOVERNOR_PATH = os.environ.get('UPSTREAM_GOVERNOR_PATH', os.path.join(basedir, 'instance', 'upstream_governor.state'))
+
+    # Upstream failure handling - per endpoint family, a circuit opens after
+    # UPSTREAM_BREAKER_THRESHOLD consecutive failures and fails fast for
+    # UPSTREAM_BREAKER_RESET seconds before letting one probe through. A URL that
+    # failed isn't asked for again by any worker for UPSTREAM_NEGATIVE_TTL seconds;
+    # the last good payload is served instead, marked stale. User requests make at
+    # most UPSTREAM_INTERACTIVE_MAX_RETRIES attempts and give up rather than back off
+    # for longer than UPSTREAM_INTERACTIVE_BACKOFF_CAP
+    UPSTREAM_BREAKER_ENABLED = os.environ.get('UPSTREAM_BREAKER_ENABLED', 'true').lower() == 'true'
+    UPSTREAM_BREAKER_THRESHOLD = int(os.environ.get('UPSTREAM_BREAKER_THRESHOLD', 5))
+    UPSTREAM_BREAKER_RESET = float(os.environ.get('UPSTREAM_BREAKER_RESET', 30))
+    UPSTREAM_NEGATIVE_TTL = float(os.environ.get('UPSTREAM_NEGATIVE_TTL', 30))
+    UPSTREAM_INTERACTIVE_MAX_RETRIES = int(os.environ.get('UPSTREAM_INTERACTIVE_MAX_RETRIES', 2))
+    UPSTREAM_INTERACTIVE_BACKOFF_CAP = float(os.environ.get('UPSTREAM_INTERACTIVE_BACKOFF_CAP', 1))
+
+    # Calendar-aware cache warmer - one elected worker polls after each scheduled
+    # race end until results appear, then pre-warms standings, results and rosters
+    CACHE_WARMER_ENABLED = os.environ.get('CACHE_WARMER_ENABLED', 'true').lower() == 'true'
+    CACHE_WARMER_POLL_INTERVAL = int(os.environ.get('CACHE_WARMER_POLL_INTERVAL', 120))
+    CACHE_WARMER_RACE_DURATION = int(os.environ.get('CACHE_WARMER_RACE_DURATION', 2 * 3600))
+    CACHE_WARMER_MAX_WAIT = int(os.environ.get('CACHE_WARMER_MAX_WAIT', 48 * 3600))
+
+    # Fan-out executor - independent data dependencies of a view run concurrently,
+    # each falling back to a placeholder after its timeout
+    FANOUT_MAX_WORKERS = int(os.environ.get('FANOUT_MAX_WORKERS', 16))
+    FANOUT_TIMEOUT = float(os.environ.get('FANOUT_TIMEOUT', 8))
+
+    # Conditional GET - pages and JSON endpoints carry an ETag / Last-Modified derived
+    # from the season's data version and answer 304 when unchanged; browsers may reuse
+    # them for max-age seconds (short for the current season, long for past ones)
+    CONDITIONAL_GET_ENABLED = os.environ.get('CONDITIONAL_GET_ENABLED', 'true').lower() == 'true'
+    CONDITIONAL_MAX_AGE_CURRENT = int(os.environ.get('CONDITIONAL_MAX_AGE_CURRENT', 60))
+    CONDITIONAL_MAX_AGE_PAST = int(os.environ.get('CONDITIONAL_MAX_AGE_PAST', 3600))
+
+    # Prometheus metrics at /metrics - every worker snapshots its counters into
+    # METRICS_DIR at most every METRICS_FLUSH_INTERVAL seconds and a scrape merges them.
+    # Off by default; when on, a scrape must come from METRICS_ALLOWED_IPS (comma
+    # separated, loopback by default) or send "Authorization: Bearer <METRICS_TOKEN>"
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+                           if ip.strip()]
+    METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(basedir, 'instance', 'metrics'))
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+    # NewsAPI requests per day allowed by the plan (developer plan: 100)
+    NEWSAPI_DAILY_QUOTA = int(os.environ.get('NEWSAPI_DAILY_QUOTA', 100))
+
+    # Per-request tracing - upstream calls, cache lookups, queries and renders are
+    # counted and timed per request; a sampled share of requests (or, if
+    # TRACE_HEADER_ENABLED, any sent with "X-Trace: 1") is also appended as a JSON
+    # span tree to TRACE_LOG_PATH. The timings go out in a Server-Timing header only
+    # to X-Trace requests, or to every response if SERVER_TIMING_ENABLED (they reveal
+    # internal behaviour, so that is off by default)
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() == 'true'
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'false').lower() == 'true'
+    TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 0))
+    TRACE_HEADER_ENABLED = os.environ.get('TRACE_HEADER_ENABLED', 'false').lower() == 'true'
+    TRACE_LOG_PATH = os.environ.get('TRACE_LOG_PATH', os.path.join(basedir, 'instance', 'traces.jsonl'))
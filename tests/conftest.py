@@ -0,0 +1,34 @@
+# PYTEST FIXTURES: AN APP WITH ITS OWN EMPTY DATABASES, CACHES AND STORES
+# (SET BEFORE config IS IMPORTED - IT READS THE ENVIRONMENT ONCE)
+import os
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix='f1nsight-tests-')
+os.environ.update({
+    'SECRET_KEY': 'tests',
+    'DATABASE_URL': 'sqlite:///' + os.path.join(_TMP, 'f1nsight.db'),
+    'WAREHOUSE_DATABASE_URI': 'sqlite:///' + os.path.join(_TMP, 'warehouse.db'),
+    'UPSTREAM_STORE_PATH': os.path.join(_TMP, 'upstream_store.db'),
+    'CACHE_L2_URL': 'sqlite:///' + os.path.join(_TMP, 'tiered_cache.db'),
+    'SINGLEFLIGHT_LOCK_DIR': os.path.join(_TMP, 'locks'),
+    'METRICS_DIR': os.path.join(_TMP, 'metrics'),
+    'TRACE_LOG_PATH': os.path.join(_TMP, 'traces.jsonl'),
+    'UPSTREAM_GOVERNOR_PATH': os.path.join(_TMP, 'upstream_governor.state'),
+    'JOLPICA_BASE_URL': 'http://127.0.0.1:9/ergast/f1',  # NOTHING LISTENS - TESTS STUB THE FETCH LAYER
+    'CACHE_WARMER_ENABLED': 'false',
+})
+
+
+@pytest.fixture
+def app():
+    from app import create_app, db
+
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all(bind_key='warehouse')
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key='warehouse')
@@ -0,0 +1,61 @@
+import time
+
+from app.services.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+_RESET = 0.05
+
+
+def _tripped():
+    breaker = CircuitBreaker('results', failure_threshold=2, reset_timeout=_RESET)
+    breaker.failure()
+    assert breaker.state == CLOSED
+    breaker.failure()
+    return breaker
+
+
+def test_consecutive_failures_open_the_circuit():
+    breaker = _tripped()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert 0 < breaker.retry_in() <= _RESET
+
+
+def test_a_success_resets_the_failure_count():
+    breaker = CircuitBreaker('results', failure_threshold=2, reset_timeout=_RESET)
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through_and_its_success_closes():
+    breaker = _tripped()
+    time.sleep(_RESET)
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # ONE PROBE AT A TIME
+    breaker.success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_a_failed_probe_opens_the_circuit_again():
+    breaker = _tripped()
+    time.sleep(_RESET)
+
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_a_probe_that_never_reports_back_is_replaced():
+    breaker = _tripped()
+    time.sleep(_RESET)
+    assert breaker.allow()
+
+    time.sleep(_RESET)
+    assert breaker.allow()
@@ -0,0 +1,50 @@
+import pytest
+
+from app.services import jolpica
+
+_STATS_URL = '/drivers/drivers/hulkenberg/stats'
+
+
+@pytest.fixture
+def career_stats(monkeypatch):
+    calls = []
+
+    def stats(driver_id):
+        calls.append(driver_id)
+        return {'wins': 1, 'podiums': 1}
+
+    monkeypatch.setattr(jolpica, '_get_driver_career_stats', stats)
+    monkeypatch.setattr(jolpica, 'get_latest_completed_round', lambda year: 3)
+    monkeypatch.setattr(jolpica, 'get_races_by_season', lambda year: [])
+    return calls
+
+
+def test_unchanged_responses_are_answered_with_304(app, career_stats):
+    client = app.test_client()
+    first = client.get(_STATS_URL)
+    assert first.status_code == 200 and first.headers['ETag']
+
+    again = client.get(_STATS_URL, headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 304
+    assert again.data == b''
+    assert career_stats == ['hulkenberg']  # THE VIEW DIDN'T RUN FOR THE 304
+
+
+def test_a_new_round_changes_the_etag(app, career_stats, monkeypatch):
+    client = app.test_client()
+    etag = client.get(_STATS_URL).headers['ETag']
+    monkeypatch.setattr(jolpica, 'get_latest_completed_round', lambda year: 4)
+
+    assert client.get(_STATS_URL, headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_degraded_responses_are_not_reusable(app, monkeypatch):
+    monkeypatch.setattr(jolpica, '_get_driver_career_stats', lambda driver_id: None)
+    monkeypatch.setattr(jolpica, 'get_latest_completed_round', lambda year: 3)
+    monkeypatch.setattr(jolpica, 'get_races_by_season', lambda year: [])
+
+    response = app.test_client().get(_STATS_URL)
+
+    assert 'ETag' not in response.headers
+    assert response.headers['Cache-Control'] == 'private, no-cache'
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.services import driverChamp, points_matrix
+from app.services.driverChamp import driverStandings
+
+_YEAR = 2024
+_HULK = {'driverId': 'hulkenberg', 'givenName': 'Nico', 'familyName': 'Hülkenberg'}
+_CALENDAR = [{'round': str(r), 'raceName': f'Round {r}', 'locality': f'Town {r}', 'date': f'{_YEAR}-0{r}-01'}
+             for r in (1, 2, 3)]
+# ROUND 2 IS A SPRINT WEEKEND
+_RESULTS = {1: [{'Driver': _HULK, 'points': '10'}], 2: [{'Driver': _HULK, 'points': '6'}],
+            3: [{'Driver': _HULK, 'points': '1'}]}
+_SPRINTS = {2: [{'Driver': _HULK, 'points': '3'}]}
+
+
+def _season(by_round, child_key):
+    return [{'round': str(r), child_key: rows} for r, rows in by_round.items()]
+
+
+class _Engine:
+    """Per-round upstream answers for get_driver_points_async"""
+
+    async def stream_json(self, urls):
+        for key, url in urls.items():
+            round_num, child_key = key
+            rows = (_SPRINTS if '/sprint' in url else _RESULTS).get(round_num)
+            races = [{'round': str(round_num), child_key: rows}] if rows else []
+            yield key, {'MRData': {'RaceTable': {'Races': races}}}
+
+
+def test_async_fallback_counts_sprints_like_the_season_matrix(app, monkeypatch):
+    monkeypatch.setattr(points_matrix, 'get_races_by_season', lambda year: _CALENDAR)
+    monkeypatch.setattr(driverChamp, 'get_races_by_season', lambda year: _CALENDAR)
+    monkeypatch.setattr(points_matrix, '_fetch_paginated', lambda url, table, races, child: _season(
+        _SPRINTS if '/sprint' in url else _RESULTS, child))
+    monkeypatch.setattr(driverChamp, 'get_async_engine', lambda: _Engine())
+
+    matrix = points_matrix.build_season_points_matrix(_YEAR).progression('Nico Hülkenberg')
+    fallback = asyncio.run(driverStandings.get_driver_points_async('Nico Hülkenberg', _YEAR))
+
+    assert matrix['points'] == [10, 19, 20]
+    assert fallback == matrix
@@ -0,0 +1,30 @@
+from app.services import jolpica, standings_index
+
+
+class _Standings:
+    def __init__(self, points):
+        self.points = points
+
+    def entry(self, driver_id):
+        return {'position': '1', 'points': self.points, 'wins': '1', 'constructor': 'Sauber'}
+
+    def neighbours(self, driver_id):
+        return None, None
+
+
+def test_cached_profile_follows_the_season_data_version(app, monkeypatch):
+    driver = {'driverId': 'hulkenberg', 'givenName': 'Nico', 'familyName': 'Hülkenberg',
+              'nationality': 'German', 'dateOfBirth': '1987-08-19', 'code': 'HUL'}
+    monkeypatch.setattr(jolpica, '_make_request',
+                        lambda url: {'MRData': {'DriverTable': {'Drivers': [driver]}}})
+    season = {'round': 1, 'standings': _Standings('25')}
+    monkeypatch.setattr(jolpica, 'get_latest_completed_round', lambda year: season['round'])
+    monkeypatch.setattr(standings_index, 'get_standings_index', lambda year: season['standings'])
+
+    first = jolpica.get_driver_profile('hulkenberg', '2026', load_career_stats=False)
+    season['standings'] = _Standings('43')
+    assert jolpica.get_driver_profile('hulkenberg', '2026', load_career_stats=False) == first
+
+    season['round'] = 2
+    latest = jolpica.get_driver_profile('hulkenberg', '2026', load_career_stats=False)
+    assert latest['seasons']['2026']['points'] == '43'
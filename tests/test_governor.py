@@ -0,0 +1,48 @@
+import pytest
+
+from app.services import governor
+from app.services.governor import BACKGROUND, INTERACTIVE, SYNC, Bucket, RateGovernor, RateLimited
+from config import Config
+
+
+def _governor(capacity=4, rate=0.01):
+    # RESERVE 0.5: NON-INTERACTIVE LANES LEAVE HALF THE BUCKET TO USERS
+    return RateGovernor([Bucket('second', rate, capacity)], reserve=0.5)
+
+
+def test_background_lanes_leave_the_reserve_to_users():
+    rate_governor = _governor()
+    assert rate_governor._take(INTERACTIVE) == 0
+    assert rate_governor._take(BACKGROUND) == 0  # 3 LEFT: 1 + THE RESERVE OF 2
+
+    assert rate_governor._take(BACKGROUND) > 0
+    assert rate_governor._take(SYNC) > 0
+    assert rate_governor._take(INTERACTIVE) == 0
+    assert rate_governor._take(INTERACTIVE) == 0
+    assert rate_governor._take(INTERACTIVE) > 0
+
+
+def test_background_stands_aside_while_a_user_is_queued():
+    rate_governor = _governor()
+    rate_governor._interactive_waiting = 1
+
+    assert rate_governor._next_wait(BACKGROUND) == governor._POLL
+    assert rate_governor._next_wait(INTERACTIVE) == 0
+
+
+def test_a_lane_is_refused_past_its_max_wait(monkeypatch):
+    monkeypatch.setattr(Config, 'UPSTREAM_BACKGROUND_MAX_WAIT', 0.1)
+    rate_governor = _governor(capacity=2)
+    assert rate_governor._take(INTERACTIVE) == 0
+
+    with pytest.raises(RateLimited):
+        rate_governor.acquire(BACKGROUND)
+    assert rate_governor.acquire(INTERACTIVE) < 0.1
+
+
+def test_a_429_pauses_every_lane():
+    rate_governor = _governor()
+    rate_governor.pause(30)
+
+    assert rate_governor._take(INTERACTIVE) > 29
+    assert rate_governor._take(BACKGROUND) > 29
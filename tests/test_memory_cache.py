@@ -0,0 +1,24 @@
+from app.services.memory_cache import BoundedTTLCache
+
+
+def _cache():
+    # ONE STRIPE OF 1000 BYTES
+    return BoundedTTLCache(max_bytes=1000, max_entries=10, default_ttl=60, long_ttl=600, stripes=1)
+
+
+def test_oversize_value_drops_the_entry_it_would_replace():
+    cache = _cache()
+    cache.set('standings', 'old' * 10)
+    cache.set('standings', 'x' * 5000)
+
+    assert cache.get('standings') is None
+    assert cache.stats()['bytes'] == 0
+
+
+def test_caller_supplied_size_is_used_for_accounting():
+    cache = _cache()
+    cache.set('results', {'round': '1'}, size=400)
+    cache.set('results', {'round': '1'}, size=300)
+
+    assert cache.get('results').size == 300
+    assert cache.stats()['bytes'] == 300
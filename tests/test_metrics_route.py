@@ -0,0 +1,32 @@
+import pytest
+
+from config import Config
+
+_REMOTE = {'REMOTE_ADDR': '203.0.113.9'}
+
+
+@pytest.fixture
+def metrics_on(monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_ENABLED', True)
+    monkeypatch.setattr(Config, 'METRICS_TOKEN', 's3cret')
+    monkeypatch.setattr(Config, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+
+
+def test_metrics_are_off_by_default(app, monkeypatch):
+    monkeypatch.setattr(Config, 'METRICS_ENABLED', False)
+    assert app.test_client().get('/metrics').status_code == 404
+
+
+def test_remote_scrape_needs_the_token(app, metrics_on):
+    client = app.test_client()
+    assert client.get('/metrics', environ_base=_REMOTE).status_code == 403
+    assert client.get('/metrics', environ_base=_REMOTE,
+                      headers={'Authorization': 'Bearer wrong'}).status_code == 403
+
+    response = client.get('/metrics', environ_base=_REMOTE, headers={'Authorization': 'Bearer s3cret'})
+    assert response.status_code == 200
+    assert b'f1nsight_newsapi_daily_quota' in response.data
+
+
+def test_loopback_scrape_is_allowed(app, metrics_on):
+    assert app.test_client().get('/metrics').status_code == 200
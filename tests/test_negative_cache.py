@@ -0,0 +1,22 @@
+import time
+
+import requests
+
+from app.services import jolpica
+
+_URL = 'http://127.0.0.1:9/ergast/f1/2026/1/results.json'
+
+
+def test_failed_urls_are_not_retried_until_the_negative_ttl_passes(app, monkeypatch):
+    monkeypatch.setattr(jolpica._failures, 'ttl', 0.2)
+    assert not jolpica._failed_recently(_URL)
+
+    jolpica._note_failure(_URL, requests.exceptions.ConnectTimeout('timed out'))
+
+    assert jolpica._failed_recently(_URL)
+    # NEVER FETCHED: ANSWERED AT ONCE WITH NOTHING, NOT SENT UPSTREAM AGAIN
+    assert jolpica._cached_response(_URL) == (True, None)
+
+    time.sleep(0.25)
+    assert not jolpica._failed_recently(_URL)
+    assert jolpica._cached_response(_URL) == (False, None)
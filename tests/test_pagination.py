@@ -0,0 +1,65 @@
+from urllib.parse import parse_qs, urlparse
+
+from app.services import jolpica
+
+_URL = 'http://127.0.0.1:9/ergast/f1/2026/results.json'
+
+
+def _result(round_number, position):
+    return {'position': str(position), 'Driver': {'driverId': f'driver-{round_number}-{position}'}}
+
+
+# 3 ROUNDS x 2 RESULTS, SERVED 3 RESULT ROWS A PAGE: ROUND 2 STRADDLES PAGES 1 AND 2
+_ROWS = [(r, p) for r in (1, 2, 3) for p in (1, 2)]
+_PAGE = 3
+
+
+def _upstream(requested, fail_offset=None):
+    def make_request(url):
+        requested.append(url)
+        query = parse_qs(urlparse(url).query)
+        offset = int(query['offset'][0])
+        if offset == fail_offset:
+            return None
+        races = []
+        for round_number, position in _ROWS[offset:offset + _PAGE]:
+            if not races or races[-1]['round'] != str(round_number):
+                races.append({'season': '2026', 'round': str(round_number), 'Results': []})
+            races[-1]['Results'].append(_result(round_number, position))
+        return {'MRData': {'total': str(len(_ROWS)), 'limit': str(_PAGE), 'offset': str(offset),
+                           'RaceTable': {'season': '2026', 'Races': races}}}
+    return make_request
+
+
+def test_pages_are_fetched_at_the_server_limit_and_stitched(monkeypatch):
+    requested = []
+    monkeypatch.setattr(jolpica, '_make_request', _upstream(requested))
+
+    data = jolpica._make_paginated_request(_URL, 'RaceTable', 'Races', 'Results')
+
+    assert [parse_qs(urlparse(url).query)['offset'] for url in requested] == [['0'], ['3']]
+    races = data['MRData']['RaceTable']['Races']
+    assert [race['round'] for race in races] == ['1', '2', '3']
+    assert [[r['position'] for r in race['Results']] for race in races] == [['1', '2']] * 3
+    assert data['MRData']['RaceTable']['season'] == '2026'
+    assert data['MRData']['offset'] == '0'
+
+
+def test_stitching_leaves_the_cached_pages_untouched(monkeypatch):
+    pages = {}
+    fetch = _upstream([])
+
+    def make_request(url):
+        return pages.setdefault(url, fetch(url))
+    monkeypatch.setattr(jolpica, '_make_request', make_request)
+
+    jolpica._make_paginated_request(_URL, 'RaceTable', 'Races', 'Results')
+
+    first_page = next(page for url, page in pages.items() if url.endswith('offset=0'))
+    assert len(first_page['MRData']['RaceTable']['Races'][-1]['Results']) == 1
+
+
+def test_a_missing_page_fails_the_whole_read(monkeypatch):
+    monkeypatch.setattr(jolpica, '_make_request', _upstream([], fail_offset=3))
+
+    assert jolpica._make_paginated_request(_URL, 'RaceTable', 'Races', 'Results') is None
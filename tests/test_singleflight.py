@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.singleflight import SingleFlight, fcntl, process_lock
+from config import Config
+
+_needs_file_locks = pytest.mark.skipif(fcntl is None, reason='no cross-process file locks on this platform')
+
+
+def _hold(key, log, hold):
+    with process_lock(key) as acquired:
+        log.put(('in', os.getpid(), acquired, time.monotonic()))
+        time.sleep(hold)
+        log.put(('out', os.getpid(), acquired, time.monotonic()))
+
+
+@_needs_file_locks
+def test_process_lock_excludes_other_workers_and_leaves_no_files():
+    log = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_hold, args=('http://upstream/2026/results.json', log, 0.2))
+               for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+
+    events = sorted((log.get(timeout=1) for _ in range(6)), key=lambda event: event[3])
+    assert all(acquired for _, _, acquired, _ in events)
+    # STRICTLY ONE HOLDER AT A TIME: IN/OUT PAIRS NEVER INTERLEAVE
+    assert [kind for kind, *_ in events] == ['in', 'out'] * 3
+    assert [pid for _, pid, _, _ in events[::2]] == [pid for _, pid, _, _ in events[1::2]]
+    assert os.listdir(Config.SINGLEFLIGHT_LOCK_DIR) == []
+
+
+@_needs_file_locks
+def test_distinct_keys_leave_no_lock_files():
+    for round_number in range(50):
+        with process_lock(f'http://upstream/2026/{round_number}/results.json') as acquired:
+            assert acquired
+    assert os.listdir(Config.SINGLEFLIGHT_LOCK_DIR) == []
+
+
+def test_concurrent_callers_share_one_call():
+    flight, calls, release = SingleFlight(), [], threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {'round': 1}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = [pool.submit(flight.do, 'results/1', fetch) for _ in range(8)]
+        while flight.in_flight() == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)  # LET THE FOLLOWERS QUEUE UP BEHIND THE LEADER
+        release.set()
+        answers = [result.result(5) for result in results]
+
+    assert len(calls) == 1
+    assert all(answer is answers[0] for answer in answers)
+    assert flight.in_flight() == 0
+
+
+def test_the_leaders_error_reaches_every_caller():
+    flight, release = SingleFlight(), threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ValueError('upstream payload out of shape')
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = [pool.submit(flight.do, 'results/1', fetch) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        for result in results:
+            with pytest.raises(ValueError):
+                result.result(5)
+
+
+def test_async_callers_join_a_thread_already_fetching():
+    flight, calls, release = SingleFlight(), [], threading.Event()
+
+    def fetch():
+        calls.append('thread')
+        release.wait(5)
+        return 'from the thread'
+
+    async def fetch_async():
+        calls.append('task')
+        return 'from the task'
+
+    async def join():
+        waiting = asyncio.ensure_future(flight.do_async('results/1', fetch_async))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await waiting
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(flight.do, 'results/1', fetch)
+        while flight.in_flight() == 0:
+            time.sleep(0.01)
+        assert asyncio.run(join()) == 'from the thread'
+        assert leader.result(5) == 'from the thread'
+    assert calls == ['thread']
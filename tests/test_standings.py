@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.services import constructorChamp, driverChamp, warehouse
+from app.services.constructorChamp import constructorStandings
+from app.services.driverChamp import driverStandings
+from config import Config
+
+
+def _broken_warehouse(year):
+    raise OperationalError('SELECT 1', {}, Exception('database is locked'))
+
+
+def _upstream_standings(url, table_key, list_key, child_key):
+    rows = {
+        'DriverStandings': [{'position': '1', 'points': '25', 'Constructors': [{'name': 'Sauber'}],
+                             'Driver': {'driverId': 'hulkenberg', 'givenName': 'Nico', 'familyName': 'Hülkenberg'}},
+                            {'position': '2', 'points': '18', 'Constructors': [], 'Driver': None}],
+        'ConstructorStandings': [{'position': '1', 'points': '25', 'wins': '1', 'Constructor': {'name': 'Sauber'}},
+                                 {'position': '2', 'points': '18', 'Constructor': 'garbled'}],
+    }[child_key]
+    return {'MRData': {table_key: {list_key: [{child_key: rows}]}}}
+
+
+@pytest.fixture
+def broken_warehouse(monkeypatch):
+    monkeypatch.setattr(warehouse, 'is_available', _broken_warehouse)
+    monkeypatch.setattr(driverChamp, '_make_paginated_request', _upstream_standings)
+    monkeypatch.setattr(constructorChamp, '_make_paginated_request', _upstream_standings)
+
+
+def test_warehouse_errors_fall_through_to_upstream(app, broken_warehouse):
+    drivers = driverStandings.get_driver_standings.uncached(2019)
+    constructors = constructorStandings.get_constructor_standings(2019)
+
+    # MALFORMED ROWS ARE SKIPPED, NOT RAISED
+    assert [d['driverId'] for d in drivers] == ['hulkenberg']
+    assert [c['constructor'] for c in constructors] == ['Sauber']
+
+
+def test_standings_page_renders_when_a_table_fails(app, monkeypatch):
+    def fail(year=None):
+        raise RuntimeError('upstream payload out of shape')
+
+    monkeypatch.setattr(Config, 'CONDITIONAL_GET_ENABLED', False)
+    monkeypatch.setitem(app.config, 'LOGIN_DISABLED', True)
+    monkeypatch.setattr(driverStandings, 'get_driver_standings', staticmethod(fail))
+    monkeypatch.setattr(constructorStandings, 'get_constructor_standings', staticmethod(lambda year=None: []))
+    monkeypatch.setattr(driverStandings, 'get_available_seasons', staticmethod(lambda: ['2026']))
+
+    assert app.test_client().get('/standings/?year=2026').status_code == 200
@@ -0,0 +1,88 @@
+import multiprocessing
+import pickle
+
+import pytest
+
+from app.services.tiered_cache import TieredCache, _l1_key
+
+
+class _Exploit:
+    loaded = False
+
+    def __reduce__(self):
+        return (_mark_loaded, ())
+
+
+def _mark_loaded():
+    _Exploit.loaded = True
+    return 'pwned'
+
+
+@pytest.fixture
+def l2_url(tmp_path):
+    return 'sqlite:///' + str(tmp_path / 'l2.db')
+
+
+def test_l2_entries_written_by_another_worker_are_read(l2_url):
+    writer, reader = TieredCache(l2_url), TieredCache(l2_url)
+    writer.set('standings', '2026', {'leader': 'hulkenberg'}, ttl=60, shared=True)
+
+    assert reader.get_entry('standings', '2026', shared=True).value == {'leader': 'hulkenberg'}
+
+
+def test_unsigned_l2_entries_are_never_unpickled(l2_url):
+    cache = TieredCache(l2_url)
+    cache.set('standings', '2026', 'fine', ttl=60, shared=True)
+    # SOMEONE WITH WRITE ACCESS TO THE SHARED FILE PLANTS A PAYLOAD
+    cache.l2.set('standings', '2026', b'\0' * 32 + pickle.dumps(_Exploit()), 0, None)
+
+    assert TieredCache(l2_url).get_entry('standings', '2026', shared=True) is None
+    assert not _Exploit.loaded
+
+
+def _in_another_worker(fn, *args):
+    # SYNC SKIPS THE LOG ROWS OF ITS OWN PROCESS, SO THE WRITER IS A REAL SECOND PROCESS
+    worker = multiprocessing.Process(target=fn, args=args)
+    worker.start()
+    worker.join(10)
+    assert worker.exitcode == 0
+
+
+def _write(l2_url, value):
+    TieredCache(l2_url).set('standings', '2026', value, ttl=60, shared=True)
+
+
+def _delete(l2_url):
+    TieredCache(l2_url).delete('standings', '2026', shared=True)
+
+
+def _clear(l2_url):
+    TieredCache(l2_url).clear('standings', shared=True)
+
+
+def test_other_workers_writes_and_deletes_invalidate_l1(l2_url):
+    reader = TieredCache(l2_url)
+    _write(l2_url, 'after round 1')
+    assert reader.get_entry('standings', '2026', shared=True).value == 'after round 1'
+
+    _in_another_worker(_write, l2_url, 'after round 2')
+    assert reader.l1.get(_l1_key('standings', '2026')).value == 'after round 1'  # UNTIL THE NEXT SYNC
+    reader.sync(force=True)
+    assert reader.get_entry('standings', '2026', shared=True).value == 'after round 2'
+
+    _in_another_worker(_delete, l2_url)
+    reader.sync(force=True)
+    assert reader.get_entry('standings', '2026', shared=True) is None
+
+
+def test_namespace_clears_reach_other_workers(l2_url):
+    reader = TieredCache(l2_url)
+    reader.set('standings', '2025', 'final', ttl=60, shared=True)
+    reader.set('drivers', '2025', 'grid', ttl=60, shared=True)
+    reader.sync(force=True)  # A WORKER FOLLOWS THE LOG FROM ITS FIRST SYNC ON
+
+    _in_another_worker(_clear, l2_url)
+    reader.sync(force=True)
+
+    assert reader.get_entry('standings', '2025', shared=True) is None
+    assert reader.get_entry('drivers', '2025', shared=True).value == 'grid'
@@ -0,0 +1,14 @@
+from config import Config
+
+
+def test_server_timing_is_only_sent_to_traced_requests(app, monkeypatch):
+    monkeypatch.setattr(Config, 'TRACE_HEADER_ENABLED', True)
+    client = app.test_client()
+
+    assert 'Server-Timing' not in client.get('/auth/login').headers
+    assert 'total;dur=' in client.get('/auth/login', headers={'X-Trace': '1'}).headers['Server-Timing']
+
+
+def test_server_timing_on_every_response_when_enabled(app, monkeypatch):
+    monkeypatch.setattr(Config, 'SERVER_TIMING_ENABLED', True)
+    assert 'Server-Timing' in app.test_client().get('/auth/login').headers
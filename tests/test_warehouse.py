@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models.f1 import Circuit, Driver, Race, Result, Season, SyncState
+from app.services import jolpica, warehouse
+
+
+@pytest.fixture
+def season_in_progress(app):
+    """Current season synced just now: round 1 run (with results), round 2 a week away"""
+    year = datetime.now().year
+    next_race = datetime.now() + timedelta(days=7)
+    db.session.add(Season(year=year))
+    db.session.add(Circuit(circuit_id='monza', name='Autodromo Nazionale di Monza', locality='Monza',
+                           country='Italy'))
+    db.session.add(Driver(driver_id='hulkenberg', given_name='Nico', family_name='Hülkenberg', code='HUL'))
+    db.session.add(Race(season=year, round=1, race_name='Opening Grand Prix', circuit_id='monza',
+                        date=(datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'), time='13:00:00Z'))
+    db.session.add(Race(season=year, round=2, race_name='Next Grand Prix', circuit_id='monza',
+                        date=next_race.strftime('%Y-%m-%d'), time='13:00:00Z'))
+    db.session.add(Result(season=year, round=1, driver_id='hulkenberg', position='1', points=25))
+    db.session.add(SyncState(season=year, last_round=1, total_rounds=2, complete=False,
+                             synced_at=datetime.now()))
+    db.session.commit()
+    return year, next_race
+
+
+def _calendar_only(year, next_race):
+    """Upstream as it looks before round 2: no results, the round in the calendar"""
+    race = {'season': str(year), 'round': '2', 'raceName': 'Next Grand Prix',
+            'Circuit': {'circuitId': 'monza', 'circuitName': 'Autodromo Nazionale di Monza',
+                        'Location': {'locality': 'Monza', 'country': 'Italy'}},
+            'date': next_race.strftime('%Y-%m-%d'), 'time': '13:00:00Z'}
+
+    def fetch(url, table_key, list_key, child_key=None):
+        races = [] if '/results' in url else [race]
+        return {'MRData': {'total': str(len(races)), table_key: {list_key: races}}}
+    return fetch
+
+
+def test_future_round_of_current_season_falls_through_to_upcoming_race(season_in_progress, monkeypatch):
+    year, next_race = season_in_progress
+    assert warehouse.is_available(year)
+    assert warehouse.race_results(year, 2) == {}
+
+    monkeypatch.setattr(jolpica, '_make_paginated_request', _calendar_only(year, next_race))
+    race = jolpica.get_race_results(str(year), '2')
+
+    assert race.isFutureRace is True
+    assert race.raceDateTime
+    assert not getattr(race, 'results', None)
+
+
+def test_run_round_of_current_season_is_served_from_the_warehouse(season_in_progress):
+    year, _ = season_in_progress
+    race = warehouse.race_results(year, 1)
+
+    assert race.isFutureRace is False
+    assert [r.position for r in race.results] == ['1']
@@ -0,0 +1,63 @@
+from app.services import driver_index, jolpica, standings_index, warehouse, warmer
+from app.services.constructorChamp import constructorStandings
+from app.services.driverChamp import driverStandings
+
+_CIRCUIT = {'circuitId': 'monza', 'circuitName': 'Autodromo Nazionale di Monza',
+            'Location': {'locality': 'Monza', 'country': 'Italy'}}
+
+
+def _race(year, round_number, results=None):
+    race = {'season': str(year), 'round': str(round_number), 'raceName': f'Round {round_number}',
+            'Circuit': _CIRCUIT, 'date': f'{year}-05-0{round_number}', 'time': '13:00:00Z'}
+    if results is not None:
+        race['Results'] = results
+    return race
+
+
+def _upstream(url, table_key, list_key, child_key=None):
+    """2026 after round 2: hulkenberg won it"""
+    if '/2/results' in url:
+        races = [_race(2026, 2, [{'position': '1', 'points': '25', 'grid': '1', 'laps': '53',
+                                  'status': 'Finished', 'Driver': {'driverId': 'hulkenberg', 'givenName': 'Nico',
+                                                                   'familyName': 'Hülkenberg', 'code': 'HUL'},
+                                  'Constructor': {'constructorId': 'sauber', 'name': 'Sauber'}}])]
+    elif '/results' in url or '/sprint' in url:
+        races = []
+    else:
+        races = [_race(2026, 1), _race(2026, 2)]
+    return {'MRData': {'total': str(len(races)), table_key: {list_key: races}}}
+
+
+def test_warm_season_drops_only_what_the_round_changed(app, monkeypatch):
+    monkeypatch.setattr(jolpica, '_make_paginated_request', _upstream)
+    monkeypatch.setattr(jolpica, 'get_latest_completed_round', lambda year: 2)
+    monkeypatch.setattr(jolpica, 'search_drivers', lambda year, query: [])
+    monkeypatch.setattr(warehouse, 'sync_state', lambda year: None)
+    monkeypatch.setattr(driver_index, 'invalidate', lambda year=None: None)
+    monkeypatch.setattr(standings_index, 'get_standings_index', lambda year: None)
+    monkeypatch.setattr(driverStandings, 'get_points_matrix', staticmethod(lambda year: None))
+    monkeypatch.setattr(constructorStandings, 'get_constructor_standings', staticmethod(lambda year=None: None))
+    for name in ('get_driver_standings', 'get_driver_list'):
+        monkeypatch.setattr(driverStandings.__dict__[name].__func__, 'uncached', lambda *args: None)
+    memoized_deletes = []
+    monkeypatch.setattr(warmer.cache, 'delete_memoized', lambda fn, *args: memoized_deletes.append(args))
+
+    calendars, results, seasons = (jolpica.get_races_by_season.cache, jolpica.get_race_results.cache,
+                                   jolpica.get_driver_results.cache)
+    calendars.set(repr(('2025',)), ['2025 calendar'])
+    calendars.set(repr(('2026',)), ['old 2026 calendar'])
+    results.set(repr(('2026', '1')), 'round 1')
+    results.set(repr(('2026', '2')), 'round 2 before the race')
+    seasons.set(repr(('hulkenberg', '2026')), ['round 1'])
+    seasons.set(repr(('hulkenberg', '2025')), ['2025 season'])
+
+    warmer.warm_season(2026, 2)
+
+    assert calendars.get(repr(('2025',))) == ['2025 calendar']
+    assert [race['round'] for race in calendars.get(repr(('2026',)))] == ['1', '2']
+    assert results.get(repr(('2026', '1'))) == 'round 1'
+    assert [r.driver.id for r in results.get(repr(('2026', '2'))).results] == ['hulkenberg']
+    assert seasons.get(repr(('hulkenberg', '2026'))) is None
+    assert seasons.get(repr(('hulkenberg', '2025'))) == ['2025 season']
+    # NEVER THE WHOLE FUNCTION (THAT RESETS ITS VERSION, DROPPING EVERY SEASON)
+    assert memoized_deletes and all(memoized_deletes)